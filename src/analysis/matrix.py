@@ -1,7 +1,7 @@
 
 import polars as pl
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Union
 
 @dataclass
 class QuadrantDefinition:
@@ -26,66 +26,66 @@ class PerformanceMatrix:
         Takes a DataFrame containing 'Score' and 'Revenue'.
         Computes thresholds and classifies each row.
         """
-        # 1. Compute Thresholds (Averages)
-        mu_eff = results_df["Score"].mean()
-        mu_sales = results_df["Revenue"].mean()
-        
-        print(f"Thresholds: Avg Efficiency = {mu_eff:.4f}, Avg Revenue = {mu_sales:.4f}")
+        # Classify through the lazy plan; its mean thresholds are reported from the same pass
+        report = self.plan(results_df.lazy(), keep_thresholds=True).sort("Score", descending=True).collect()
+        if report.height:
+            print(f"Thresholds: Avg Efficiency = {report['Threshold_Score'][0]:.4f}, "
+                  f"Avg Revenue = {report['Threshold_Revenue'][0]:.4f}")
+        return report.drop("Threshold_Score", "Threshold_Revenue")
 
-        # 2. Define Classification Logic
-        def classify(row):
-            eff = row["Score"]
-            rev = row["Revenue"]
-            
-            is_high_eff = eff >= mu_eff
-            is_high_rev = rev >= mu_sales
-            
-            if is_high_eff and is_high_rev:
-                return "Q1"
-            elif is_high_eff and not is_high_rev:
-                return "Q2"
-            elif not is_high_eff and is_high_rev:
-                return "Q3"
-            else:
-                return "Q4"
+    def _threshold_expr(self, col: str, threshold: Union[str, float], by: Optional[Sequence[str]]) -> pl.Expr:
+        if threshold == "mean":
+            expr = pl.col(col).mean()
+        elif threshold == "median":
+            expr = pl.col(col).median()
+        elif isinstance(threshold, (int, float)) and 0.0 <= threshold <= 1.0:
+            expr = pl.col(col).quantile(float(threshold), interpolation="linear")
+        else:
+            raise ValueError(f"Unknown threshold '{threshold}': use 'mean', 'median' or a quantile in [0, 1]")
+        return expr.over(by) if by else expr
 
-        # 3. Apply Classification
-        # Polars apply/map
-        # We can also use expressions for speed
-        
-        # Using when/then for fully vectorized approach in Polars
-        res = results_df.with_columns([
-            pl.when((pl.col("Score") >= mu_eff) & (pl.col("Revenue") >= mu_sales))
-            .then(pl.lit("Q1"))
-            .when((pl.col("Score") >= mu_eff) & (pl.col("Revenue") < mu_sales))
-            .then(pl.lit("Q2"))
-            .when((pl.col("Score") < mu_eff) & (pl.col("Revenue") >= mu_sales))
-            .then(pl.lit("Q3"))
+    def plan(
+        self,
+        data: Union[pl.DataFrame, pl.LazyFrame],
+        by: Optional[Sequence[str]] = None,
+        threshold: Union[str, float] = "mean",
+        revenue_threshold: Optional[Union[str, float]] = None,
+        keep_thresholds: bool = False,
+    ) -> pl.LazyFrame:
+        """
+        Lazy quadrant classification for large or grouped result sets.
+
+        Thresholds are window expressions, so per-group thresholds (`by`, e.g. team or
+        region) for every group are computed in the same pass that classifies the rows.
+        `threshold` is 'mean', 'median' or a quantile in [0, 1] (applied to 'Score', and
+        to 'Revenue' unless `revenue_threshold` is given). Quadrant names and diagnoses are
+        mapped by expression instead of a join, and no sort is imposed, so the plan can be
+        streamed (see `sink_parquet`).
+        """
+        lf = data.lazy() if isinstance(data, pl.DataFrame) else data
+        by = [by] if isinstance(by, str) else by
+        revenue_threshold = threshold if revenue_threshold is None else revenue_threshold
+
+        high_eff = pl.col("Score") >= pl.col("Threshold_Score")
+        high_rev = pl.col("Revenue") >= pl.col("Threshold_Revenue")
+
+        plan = lf.with_columns(
+            self._threshold_expr("Score", threshold, by).alias("Threshold_Score"),
+            self._threshold_expr("Revenue", revenue_threshold, by).alias("Threshold_Revenue"),
+        ).with_columns(
+            pl.when(high_eff & high_rev).then(pl.lit("Q1"))
+            .when(high_eff & ~high_rev).then(pl.lit("Q2"))
+            .when(~high_eff & high_rev).then(pl.lit("Q3"))
             .otherwise(pl.lit("Q4"))
             .alias("Quadrant_Code")
-        ])
-        
-        # Join definitions (optional, or just map descriptions)
-        # For simplicity, we can just map the description strings based on the code
-        # But creating a mapping dict and map_dict is easy
-        
-        q_names = {k: v.name for k, v in self.quadrants.items()}
-        q_diags = {k: v.diagnosis for k, v in self.quadrants.items()}
-        
-        # map_dict requires strict mapping in recent polars or join
-        # Just use map_elements (lambda) for small datasets or join for large.
-        # Given this is sales teams (usually < 1000), map is fine, but join is idiomatic.
-        
-        # Let's simple use map_dict expression if available or just struct logic meant for "display"
-        # We will iterate for text generation if needed, but for DataFrame we keep codes or add text columns.
-        
-        # Using a left join with a frames dictionary
-        quad_df = pl.DataFrame({
-            "Quadrant_Code": list(self.quadrants.keys()),
-            "Quadrant_Name": [q.name for q in self.quadrants.values()],
-            "Diagnosis": [q.diagnosis for q in self.quadrants.values()],
-        })
-        
-        final_df = res.join(quad_df, on="Quadrant_Code", how="left")
-        
-        return final_df.sort("Score", descending=True)
+        ).with_columns(
+            pl.col("Quadrant_Code").replace_strict({k: v.name for k, v in self.quadrants.items()}, return_dtype=pl.String).alias("Quadrant_Name"),
+            pl.col("Quadrant_Code").replace_strict({k: v.diagnosis for k, v in self.quadrants.items()}, return_dtype=pl.String).alias("Diagnosis"),
+        )
+        if not keep_thresholds:
+            plan = plan.drop("Threshold_Score", "Threshold_Revenue")
+        return plan
+
+    def sink_parquet(self, data: Union[pl.DataFrame, pl.LazyFrame], path: str, **plan_kwargs) -> None:
+        """Stream the classified rows to Parquet without materializing the full report."""
+        self.plan(data, **plan_kwargs).sink_parquet(path)
@@ -1,9 +1,27 @@
-from .evaluator import BoundedRationalityEvaluator
-from .choquet import run_choquet_evaluation
+from importlib import import_module
 
 __version__ = "0.1.0"
 
-__all__ = [
-    "BoundedRationalityEvaluator",
-    "run_choquet_evaluation",
-]
+# Public names are resolved on first access, so `import dea_br` stays cheap and the
+# solver stack (scipy.optimize, PuLP) is only loaded by the code paths that use it.
+_EXPORTS = {
+    "BoundedRationalityEvaluator": ".evaluator",
+    "run_choquet_evaluation": ".choquet",
+    "ResultStore": ".storage",
+    "WeightModel": ".weight_model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,110 @@
+
+import numpy as np
+from scipy import sparse
+from typing import Sequence, Tuple
+
+from .kadditive import Coalition
+
+# A set function over m criteria has 2^m entries
+MAX_CRITERIA = 24
+
+
+def _size(table: np.ndarray) -> int:
+    size = int(len(table)).bit_length() - 1
+    if len(table) != 1 << size:
+        raise ValueError(f"Set function needs 2^m entries, got {len(table)}")
+    return size
+
+
+def mobius_array(singletons: np.ndarray, coalitions: Sequence[Coalition] = (),
+                 weights: Sequence[float] = ()) -> np.ndarray:
+    """
+    Dense Möbius representation, indexed by bitmask (bit t set for criterion t), from the
+    weights the LPs produce: v_1..v_m plus one weight per coalition of 2+ criteria, e.g.
+    `kadditive.interaction_coalitions(m, 2)` with a `storage.pack_upper` vector.
+    """
+    singletons = np.asarray(singletons, dtype=float)
+    size = len(singletons)
+    if size > MAX_CRITERIA:
+        raise ValueError(f"At most {MAX_CRITERIA} criteria, got {size}")
+    if len(coalitions) != len(weights):
+        raise ValueError(f"{len(coalitions)} coalitions but {len(weights)} weights")
+    mobius = np.zeros(1 << size)
+    mobius[1 << np.arange(size)] = singletons
+    for S, w in zip(coalitions, weights):
+        if len(S) < 2 or max(S) >= size:
+            raise ValueError(f"Coalition {S} is not a set of 2+ of the {size} criteria")
+        mobius[sum(1 << t for t in S)] += w
+    return mobius
+
+
+def capacity_from_mobius(mobius: np.ndarray) -> np.ndarray:
+    """Set function mu(A) = sum of m(B) over B within A (zeta transform, m 2^m additions)."""
+    mu = np.array(mobius, dtype=float)
+    for t in range(_size(mu)):
+        halves = mu.reshape(-1, 2, 1 << t)
+        halves[:, 1] += halves[:, 0]
+    return mu
+
+
+def mobius_from_capacity(capacity: np.ndarray) -> np.ndarray:
+    """Möbius transform m(A) = sum of (-1)^|A - B| mu(B) over B within A; inverse of `capacity_from_mobius`."""
+    m = np.array(capacity, dtype=float)
+    for t in range(_size(m)):
+        halves = m.reshape(-1, 2, 1 << t)
+        halves[:, 1] -= halves[:, 0]
+    return m
+
+
+def _sorted_steps(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Increments x_(i) - x_(i-1) of every sorted row and the bitmask of each A_(i)
+    bits = np.int64(1) << np.arange(values.shape[1], dtype=np.int64)
+    order = np.argsort(values, axis=1, kind='stable')
+    steps = np.diff(np.take_along_axis(values, order, axis=1), axis=1, prepend=0.0)
+    masks = np.bitwise_or.accumulate(bits[order][:, ::-1], axis=1)[:, ::-1]
+    return steps, masks
+
+
+def _check(values: np.ndarray, capacity: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    capacity = np.asarray(capacity, dtype=float)
+    size = _size(capacity)
+    if size != values.shape[1]:
+        raise ValueError(f"Capacity over {size} criteria for {values.shape[1]} columns")
+    return values, capacity
+
+
+def choquet_integral(values: np.ndarray, capacity: np.ndarray, chunk_size: int = 1 << 16) -> np.ndarray:
+    """
+    Discrete Choquet integral of every row of `values` with respect to a set function.
+
+    Each row is sorted once: with x_(1) <= ... <= x_(m) and A_(i) the criteria at or
+    above x_(i), the integral is sum_i (x_(i) - x_(i-1)) mu(A_(i)) with x_(0) = 0 (the
+    asymmetric integral for negative values). The A_(i) are suffix ORs of the sorted
+    criterion bits, so every row costs one argsort and m table lookups, for any capacity
+    and not just k-additive ones. Rows are processed in chunks of `chunk_size` to bound
+    the temporaries. `capacity` need not be normalized: the integral is linear in it, so
+    stored LP weights (see `mobius_array`) score new data directly.
+    """
+    values, capacity = _check(values, capacity)
+    out = np.empty(len(values))
+    for start in range(0, len(values), chunk_size):
+        steps, masks = _sorted_steps(values[start:start + chunk_size])
+        out[start:start + len(steps)] = np.einsum('ij,ij->i', steps, capacity[masks])
+    return out
+
+
+def integral_matrix(values: np.ndarray) -> sparse.csr_matrix:
+    """
+    The sorting part of `choquet_integral` as an N x 2^m CSR matrix with m entries per
+    row, so that integral_matrix(values) @ mu equals choquet_integral(values, mu) for
+    every set function mu. One product with a 2^m x n stack of capacities scores every
+    row against n weight vectors at once.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    size = values.shape[1]
+    if size > MAX_CRITERIA:
+        raise ValueError(f"At most {MAX_CRITERIA} criteria, got {size}")
+    steps, masks = _sorted_steps(values)
+    indptr = np.arange(0, steps.size + 1, size)
+    return sparse.csr_matrix((steps.ravel(), masks.ravel(), indptr), shape=(len(values), 1 << size))
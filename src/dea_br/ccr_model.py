@@ -0,0 +1,275 @@
+
+import numpy as np
+from scipy import sparse
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .lp import OPTIMAL, FAILED, _HIGHS_STATUS, SolveStats
+
+
+@dataclass
+class DEAResult:
+    """Classical DEA results for a batch of evaluated DMUs (one row each)."""
+    efficiency: np.ndarray                        # (k,) input-oriented score in (0, 1]
+    lambdas: np.ndarray                           # (k, n) intensity weights on the reference DMUs
+    slack_input: np.ndarray                       # (k, m)
+    slack_output: np.ndarray                      # (k, s)
+    status: np.ndarray                            # (k,) LP status, 1 = optimal
+    weights_input: Optional[np.ndarray] = None    # (k, m) multiplier form only
+    weights_output: Optional[np.ndarray] = None   # (k, s) multiplier form only
+    free_weight: Optional[np.ndarray] = None      # (k,) u0 of the VRS multiplier form
+
+
+def _solve_blocks(blocks: List[dict], stats: Optional[SolveStats], stage: str) -> List[Tuple[int, Optional[np.ndarray], Optional[np.ndarray]]]:
+    """
+    Solve independent LPs of identical shape as one block-diagonal LP.
+
+    Each block is a dict with c, A_ub, b_ub, A_eq, b_eq and bounds ((nv, 2) array).
+    Returns (status, x, marginals of the A_ub rows) per block. If the joint LP is not
+    optimal the blocks are re-solved one by one, so a single bad DMU only costs itself.
+    """
+    from scipy.optimize import linprog
+
+    def run(group):
+        has_ub = group[0]['A_ub'] is not None
+        has_eq = group[0]['A_eq'] is not None
+        res = linprog(
+            np.concatenate([b['c'] for b in group]),
+            A_ub=sparse.block_diag([b['A_ub'] for b in group], format='csr') if has_ub else None,
+            b_ub=np.concatenate([b['b_ub'] for b in group]) if has_ub else None,
+            A_eq=sparse.block_diag([b['A_eq'] for b in group], format='csr') if has_eq else None,
+            b_eq=np.concatenate([b['b_eq'] for b in group]) if has_eq else None,
+            bounds=np.vstack([b['bounds'] for b in group]),
+            method='highs',
+        )
+        return res, _HIGHS_STATUS.get(res.status, FAILED)
+
+    res, status = run(blocks)
+    if status == OPTIMAL:
+        if stats is not None:
+            stats.record(stage, n=len(blocks))
+        n_vars = len(blocks[0]['c'])
+        n_rows = blocks[0]['A_ub'].shape[0] if blocks[0]['A_ub'] is not None else 0
+        out = []
+        for q in range(len(blocks)):
+            marginals = res.ineqlin.marginals[q * n_rows:(q + 1) * n_rows] if n_rows else None
+            out.append((OPTIMAL, res.x[q * n_vars:(q + 1) * n_vars], marginals))
+        return out
+
+    if len(blocks) == 1:
+        if stats is not None:
+            stats.record(stage, status)
+        return [(status, None, None)]
+    return [solved for block in blocks for solved in _solve_blocks([block], stats, stage)]
+
+
+def _chunks(k: int, batch_size: int):
+    batch_size = max(1, batch_size)
+    for start in range(0, k, batch_size):
+        yield range(start, min(start + batch_size, k))
+
+
+def _check(X, Y, X_eval, Y_eval, rts, orientation):
+    if rts not in ('crs', 'vrs'):
+        raise ValueError(f"Unknown returns to scale '{rts}', expected 'crs' or 'vrs'")
+    if orientation not in ('input', 'output'):
+        raise ValueError(f"Unknown orientation '{orientation}', expected 'input' or 'output'")
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    if X.shape[0] != Y.shape[0]:
+        raise ValueError("Size mismatch between input and output matrices")
+    X_eval = X if X_eval is None else np.atleast_2d(np.asarray(X_eval, dtype=float))
+    Y_eval = Y if Y_eval is None else np.atleast_2d(np.asarray(Y_eval, dtype=float))
+    if X_eval.shape[0] != Y_eval.shape[0]:
+        raise ValueError("Size mismatch between evaluated input and output matrices")
+    return X, Y, X_eval, Y_eval
+
+
+def solve_envelopment(
+    X: np.ndarray,
+    Y: np.ndarray,
+    rts: str = 'crs',
+    orientation: str = 'input',
+    X_eval: Optional[np.ndarray] = None,
+    Y_eval: Optional[np.ndarray] = None,
+    slacks: bool = True,
+    stats: Optional[SolveStats] = None,
+    batch_size: int = 32,
+) -> DEAResult:
+    """
+    Envelopment-form CCR (rts='crs') or BCC (rts='vrs') for a whole batch of DMUs.
+
+    The technology matrices [X^T; -Y^T] are assembled once and shared by every LP;
+    per DMU only the column of the radial variable and the right-hand side change.
+    By default the reference set also provides the evaluated DMUs; pass X_eval/Y_eval
+    to score other points (e.g. another period) against the frontier of X, Y.
+    With slacks=True a second stage maximizes the total slack at the optimal radial
+    score. Efficiency is always reported input-oriented style, in (0, 1]:
+    theta for orientation='input' and 1/phi for orientation='output'.
+
+    `batch_size` DMUs are solved together as one block-diagonal LP, which amortizes
+    the per-call solver overhead that dominates these small problems.
+    """
+    X, Y, X_eval, Y_eval = _check(X, Y, X_eval, Y_eval, rts, orientation)
+    n, m = X.shape
+    s = Y.shape[1]
+    k = X_eval.shape[0]
+
+    # Phase 1 variables: [radial, lambda_1..n]
+    A = np.zeros((m + s, n + 1))
+    A[:m, 1:] = X.T
+    A[m:, 1:] = -Y.T
+    A_eq = sparse.csr_matrix(np.hstack([[0.0], np.ones(n)])[None, :]) if rts == 'vrs' else None
+    b_eq = np.ones(1) if rts == 'vrs' else None
+    c = np.zeros(n + 1)
+    c[0] = 1.0 if orientation == 'input' else -1.0
+    bounds = np.array([[-np.inf, np.inf]] + [[0.0, np.inf]] * n)
+
+    # Phase 2 variables: [lambda, s_minus, s_plus], equality rows on inputs and outputs
+    A2 = sparse.csr_matrix(np.block([
+        [X.T, np.eye(m), np.zeros((m, s))],
+        [Y.T, np.zeros((s, m)), -np.eye(s)],
+    ]))
+    if rts == 'vrs':
+        A2 = sparse.vstack([A2, sparse.csr_matrix(np.hstack([np.ones(n), np.zeros(m + s)]))], format="csr")
+    c2 = np.hstack([np.zeros(n), -np.ones(m + s)])
+    bounds2 = np.tile([0.0, np.inf], (n + m + s, 1))
+
+    efficiency = np.zeros(k)
+    lambdas = np.zeros((k, n))
+    slack_in = np.zeros((k, m))
+    slack_out = np.zeros((k, s))
+    status = np.zeros(k, dtype=np.int64)
+
+    for chunk in _chunks(k, batch_size):
+        blocks = []
+        for o in chunk:
+            A_o = A.copy()
+            b_o = np.zeros(m + s)
+            if orientation == 'input':
+                A_o[:m, 0] = -X_eval[o]    # X^T lambda - theta x_o <= 0
+                b_o[m:] = -Y_eval[o]       # -Y^T lambda <= -y_o
+            else:
+                A_o[m:, 0] = Y_eval[o]     # phi y_o - Y^T lambda <= 0
+                b_o[:m] = X_eval[o]        # X^T lambda <= x_o
+            blocks.append({'c': c, 'A_ub': sparse.csr_matrix(A_o), 'b_ub': b_o,
+                           'A_eq': A_eq, 'b_eq': b_eq, 'bounds': bounds})
+
+        phase2 = []
+        for o, (status[o], x, _) in zip(chunk, _solve_blocks(blocks, stats, 'envelopment')):
+            if status[o] != OPTIMAL:
+                continue
+            radial = x[0]
+            efficiency[o] = radial if orientation == 'input' else (1.0 / radial if radial > 0 else 0.0)
+            lambdas[o] = x[1:]
+            if slacks:
+                if orientation == 'input':
+                    rhs = np.hstack([radial * X_eval[o], Y_eval[o]])
+                else:
+                    rhs = np.hstack([X_eval[o], radial * Y_eval[o]])
+                if rts == 'vrs':
+                    rhs = np.hstack([rhs, [1.0]])
+                phase2.append((o, {'c': c2, 'A_ub': None, 'b_ub': None, 'A_eq': A2, 'b_eq': rhs, 'bounds': bounds2}))
+
+        if phase2:
+            solved = _solve_blocks([block for _, block in phase2], stats, 'slacks')
+            for (o, _), (st2, x2, _) in zip(phase2, solved):
+                if st2 == OPTIMAL:
+                    lambdas[o] = x2[:n]
+                    slack_in[o] = x2[n:n + m]
+                    slack_out[o] = x2[n + m:]
+
+    return DEAResult(efficiency, lambdas, slack_in, slack_out, status)
+
+
+def solve_multiplier(
+    X: np.ndarray,
+    Y: np.ndarray,
+    rts: str = 'crs',
+    X_eval: Optional[np.ndarray] = None,
+    Y_eval: Optional[np.ndarray] = None,
+    stats: Optional[SolveStats] = None,
+    batch_size: int = 32,
+    balance: Optional[float] = None,
+    stage: str = 'multiplier',
+) -> DEAResult:
+    """
+    Input-oriented multiplier-form CCR/BCC for a batch of DMUs.
+
+    The frontier rows u.y_j - v.x_j (+ u0) <= 0 are shared by every LP; per DMU only
+    the objective and the normalization row change. Lambdas are read from the duals
+    of the frontier rows, and slacks follow from them, so no extra LPs are needed.
+
+    With balance=rho the weights are restricted like the global importances of the
+    Choquet model: rho * z_I <= v_t <= z_I and rho * z_O <= u_r <= z_O with z in [0, 1].
+    This is the 2-CHCCR model with all interaction weights fixed at zero, so its
+    score is a lower bound on the 2-CHCCR self-efficiency.
+    """
+    X, Y, X_eval, Y_eval = _check(X, Y, X_eval, Y_eval, rts, 'input')
+    n, m = X.shape
+    s = Y.shape[1]
+    k = X_eval.shape[0]
+    n_extra = 0 if balance is None else 2
+
+    # Variables: [v (m), u (s), u0 (, z_I, z_O)]
+    A_ub = np.hstack([-X, Y, np.ones((n, 1)), np.zeros((n, n_extra))])
+    bounds = np.array([[0.0, np.inf]] * (m + s) + ([[-np.inf, np.inf]] if rts == 'vrs' else [[0.0, 0.0]])
+                      + [[0.0, 1.0]] * n_extra)
+    if balance is not None:
+        rows = np.zeros((2 * (m + s), m + s + 1 + n_extra))
+        for z, rng in ((m + s + 1, range(m)), (m + s + 2, range(m, m + s))):
+            for t in rng:
+                rows[2 * t, t] = 1.0            # weight - z <= 0
+                rows[2 * t, z] = -1.0
+                rows[2 * t + 1, t] = -1.0       # rho * z - weight <= 0
+                rows[2 * t + 1, z] = balance
+        A_ub = np.vstack([A_ub, rows])
+    b_ub = np.zeros(A_ub.shape[0])
+    A_ub = sparse.csr_matrix(A_ub)
+
+    result = DEAResult(
+        efficiency=np.zeros(k), lambdas=np.zeros((k, n)),
+        slack_input=np.zeros((k, m)), slack_output=np.zeros((k, s)),
+        status=np.zeros(k, dtype=np.int64),
+        weights_input=np.zeros((k, m)), weights_output=np.zeros((k, s)), free_weight=np.zeros(k),
+    )
+    for chunk in _chunks(k, batch_size):
+        blocks = [{
+            'c': -np.hstack([np.zeros(m), Y_eval[o], [1.0], np.zeros(n_extra)]),
+            'A_ub': A_ub, 'b_ub': b_ub,
+            'A_eq': sparse.csr_matrix(np.hstack([X_eval[o], np.zeros(s + 1 + n_extra)])[None, :]), 'b_eq': np.ones(1),
+            'bounds': bounds,
+        } for o in chunk]
+        for o, (result.status[o], x, marginals) in zip(chunk, _solve_blocks(blocks, stats, stage)):
+            if result.status[o] != OPTIMAL:
+                continue
+            result.efficiency[o] = Y_eval[o] @ x[m:m + s] + x[m + s]
+            result.weights_input[o] = x[:m]
+            result.weights_output[o] = x[m:m + s]
+            result.free_weight[o] = x[m + s]
+            lam = np.maximum(-marginals[:n], 0.0)
+            result.lambdas[o] = lam
+            result.slack_input[o] = np.maximum(result.efficiency[o] * X_eval[o] - lam @ X, 0.0)
+            result.slack_output[o] = np.maximum(lam @ Y - Y_eval[o], 0.0)
+    return result
+
+
+def solve_ccr(X: np.ndarray, Y: np.ndarray, dmu_index: int, orientation: str = 'input') -> Tuple[float, np.ndarray]:
+    """Classic CCR score and lambdas of a single DMU (envelopment form)."""
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    res = solve_envelopment(X, Y, 'crs', orientation, X[[dmu_index]], Y[[dmu_index]], slacks=False)
+    return float(res.efficiency[0]), res.lambdas[0]
+
+
+def solve_bcc(X: np.ndarray, Y: np.ndarray, dmu_index: int, orientation: str = 'input') -> Tuple[float, np.ndarray]:
+    """Classic BCC score and lambdas of a single DMU (envelopment form)."""
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    res = solve_envelopment(X, Y, 'vrs', orientation, X[[dmu_index]], Y[[dmu_index]], slacks=False)
+    return float(res.efficiency[0]), res.lambdas[0]
+
+
+def ccr_efficiency(X: np.ndarray, Y: np.ndarray, stats: Optional[SolveStats] = None) -> np.ndarray:
+    """CCR scores of all DMUs, e.g. as a fast pre-screen or the `efficiency_ccr` seed."""
+    return solve_multiplier(X, Y, 'crs', stats=stats).efficiency
@@ -1,12 +1,23 @@
 
 import numpy as np
-import pandas as pd
-from pulp import *
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import warnings
+from .storage import ResultStore, n_pairs
+from .lp import (FAILED, OPTIMAL, PRECISIONS, VERIFY_TOL, ChoquetLP, LPCache, SolveStats, WarmStart, choquet_features,
+                 solve_lp)
+from .ccr_model import solve_multiplier
+from .dedup import unique_dmus, weighted_cross_efficiency
+from .kadditive import interaction_coalitions, shapley_matrix
 warnings.filterwarnings('ignore')
 
+BACKENDS = ('pulp', 'highs')
+PRINCIPLES = ('fairness', 'utilitarianism', 'equity')
+TARGET_TOL = 1e-7
+# The fairness search returns a level k / 2^SATISFACTION_STEPS, as a plain bisection of
+# [0, 1] with this many halvings would
+SATISFACTION_STEPS = 12
+
 @dataclass
 class DMU:
     """Decision-Making Unit"""
@@ -19,6 +30,7 @@ class DMU:
     weights_interactions_input: np.ndarray = None
     weights_interactions_output: np.ndarray = None
     satisfaction: float = None
+    lambdas: np.ndarray = None      # duals of the frontier rows in the self-evaluation (see `peers`)
 
 def normalize_data(dmus: List[DMU], method='divide_max') -> List[DMU]:
     """Normalize data to [0,1] for numerical stability"""
@@ -46,9 +58,14 @@ def normalize_data(dmus: List[DMU], method='divide_max') -> List[DMU]:
     
     return dmus
 
-def estimate_choquet_interactions(dmus: List[DMU], indicator_type='output', method='correlation') -> np.ndarray:
+def estimate_choquet_interactions(dmus: List[DMU], indicator_type='output', method='correlation',
+                                  efficiencies: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Estimate 2-additive Choquet interaction indices I_ij
+
+    `efficiencies` is the efficiency signal the pair minima are correlated with
+    (e.g. classic CCR scores from `ccr_model.solve_multiplier`); by default the DMUs' `efficiency_ccr`
+    or, failing that, a sum(outputs)/sum(inputs) proxy is used.
     """
     if not dmus:
         return np.zeros((0,0))
@@ -67,11 +84,13 @@ def estimate_choquet_interactions(dmus: List[DMU], indicator_type='output', meth
         data_matrix = np.array(all_values)
         
         # Proxy efficiency if not available
-        efficiencies = np.array([d.efficiency_ccr if d.efficiency_ccr is not None else 0.5 for d in dmus])
-        if np.all(efficiencies == 0.5):
-             sums_in = np.array([np.sum(d.inputs) for d in dmus])
-             sums_out = np.array([np.sum(d.outputs) for d in dmus])
-             efficiencies = sums_out / (sums_in + 1e-10)
+        if efficiencies is None:
+            efficiencies = np.array([d.efficiency_ccr if d.efficiency_ccr is not None else 0.5 for d in dmus])
+            if np.all(efficiencies == 0.5):
+                 sums_in = np.array([np.sum(d.inputs) for d in dmus])
+                 sums_out = np.array([np.sum(d.outputs) for d in dmus])
+                 efficiencies = sums_out / (sums_in + 1e-10)
+        efficiencies = np.asarray(efficiencies, dtype=float)
 
         for i in range(n_criteria):
             for j in range(i+1, n_criteria):
@@ -84,45 +103,111 @@ def estimate_choquet_interactions(dmus: List[DMU], indicator_type='output', meth
     
     return I
 
+# CBC counterparts of the HiGHS settings of each precision tier (see `lp.PRECISIONS`)
+_CBC_OPTIONS = {
+    'default': {},
+    'fast': {'options': ['primalT 1e-5', 'dualT 1e-5']},
+    'verified': {},
+}
+_CBC_TIGHT = {'presolve': False, 'options': ['primalT 1e-10', 'dualT 1e-10']}
+
+def _check_pulp(prob) -> Tuple[float, float]:
+    """
+    Accuracy of a CBC solution, as `lp.check_solution`: the largest constraint or bound
+    violation, and the duality gap left by the row duals and reduced costs
+    (complementary slackness), relative to 1 + |objective|.
+    """
+    import pulp
+
+    residual, gap = 0.0, 0.0
+    for c in prob.constraints.values():
+        lhs = c.value()
+        if c.sense == pulp.LpConstraintLE:
+            residual = max(residual, lhs)
+        elif c.sense == pulp.LpConstraintGE:
+            residual = max(residual, -lhs)
+        else:
+            residual = max(residual, abs(lhs))
+        gap += abs((c.pi or 0.0) * lhs)
+    for var in prob.variables():
+        x = var.varValue or 0.0
+        lower = -np.inf if var.lowBound is None else var.lowBound
+        upper = np.inf if var.upBound is None else var.upBound
+        residual = max(residual, lower - x, x - upper)
+        distance = min(x - lower, upper - x)
+        if var.dj and np.isfinite(distance):
+            gap += abs(var.dj * distance)
+    objective = pulp.value(prob.objective) if prob.objective is not None else 0.0
+    return residual, gap / (1.0 + abs(objective or 0.0))
+
+def _solve_cbc(prob, precision='default', stats: Optional[SolveStats] = None, stage='lp') -> int:
+    """
+    Solve a PuLP model with CBC at one of the `lp.PRECISIONS` and return its status.
+    Verified precision re-solves failed or unverified solutions, as `lp.solve_lp`.
+    """
+    import pulp
+
+    prob.solve(pulp.PULP_CBC_CMD(msg=0, **_CBC_OPTIONS[precision]))
+    if precision == 'verified' and prob.status not in (pulp.LpStatusInfeasible, pulp.LpStatusUnbounded):
+        if prob.status != pulp.LpStatusOptimal or max(_check_pulp(prob)) > VERIFY_TOL:
+            first = prob.status, [(var, var.varValue) for var in prob.variables()]
+            prob.solve(pulp.PULP_CBC_CMD(msg=0, **_CBC_TIGHT))
+            verified = prob.status in (pulp.LpStatusInfeasible, pulp.LpStatusUnbounded) or (
+                prob.status == pulp.LpStatusOptimal and max(_check_pulp(prob)) <= VERIFY_TOL)
+            if first[0] == pulp.LpStatusOptimal and prob.status != pulp.LpStatusOptimal:
+                # Keep the optimal answer of the first solve, counted as unverified
+                prob.status, verified = first[0], False
+                for var, x in first[1]:
+                    var.varValue = x
+            if stats is not None:
+                stats.resolve(stage, verified)
+    return prob.status
+
 def _create_lp_variables(n_inputs, n_outputs):
-    v = [LpVariable(f"v_{t}", lowBound=0) for t in range(n_inputs)]
-    u = [LpVariable(f"u_{r}", lowBound=0) for r in range(n_outputs)]
+    import pulp
+
+    v = [pulp.LpVariable(f"v_{t}", lowBound=0) for t in range(n_inputs)]
+    u = [pulp.LpVariable(f"u_{r}", lowBound=0) for r in range(n_outputs)]
     
     v_int = [[None]*n_inputs for _ in range(n_inputs)]
     for t in range(n_inputs):
         for p in range(t+1, n_inputs):
-            v_int[t][p] = LpVariable(f"v_int_{t}_{p}", lowBound=-1, upBound=1)
+            v_int[t][p] = pulp.LpVariable(f"v_int_{t}_{p}", lowBound=-1, upBound=1)
             
     u_int = [[None]*n_outputs for _ in range(n_outputs)]
     for r in range(n_outputs):
         for q in range(r+1, n_outputs):
-            u_int[r][q] = LpVariable(f"u_int_{r}_{q}", lowBound=-1, upBound=1)
+            u_int[r][q] = pulp.LpVariable(f"u_int_{r}_{q}", lowBound=-1, upBound=1)
             
-    I_in = [LpVariable(f"I_in_{t}", lowBound=0) for t in range(n_inputs)]
-    I_out = [LpVariable(f"I_out_{r}", lowBound=0) for r in range(n_outputs)]
-    z_I = LpVariable("z_I", lowBound=0, upBound=1)
-    z_O = LpVariable("z_O", lowBound=0, upBound=1)
+    I_in = [pulp.LpVariable(f"I_in_{t}", lowBound=0) for t in range(n_inputs)]
+    I_out = [pulp.LpVariable(f"I_out_{r}", lowBound=0) for r in range(n_outputs)]
+    z_I = pulp.LpVariable("z_I", lowBound=0, upBound=1)
+    z_O = pulp.LpVariable("z_O", lowBound=0, upBound=1)
     
     return v, u, v_int, u_int, I_in, I_out, z_I, z_O
 
 def _calc_choquet(dmu, v, u, v_int, u_int, n_inputs, n_outputs):
+    import pulp
+
     # Output Aggregation
     terms_y = [u[r] * dmu.outputs[r] for r in range(n_outputs)]
     for r in range(n_outputs):
         for q in range(r+1, n_outputs):
             terms_y.append(u_int[r][q] * min(dmu.outputs[r], dmu.outputs[q]))
-    y = lpSum(terms_y)
+    y = pulp.lpSum(terms_y)
     
     # Input Aggregation
     terms_x = [v[t] * dmu.inputs[t] for t in range(n_inputs)]
     for t in range(n_inputs):
         for p in range(t+1, n_inputs):
             terms_x.append(v_int[t][p] * min(dmu.inputs[t], dmu.inputs[p]))
-    x = lpSum(terms_x)
+    x = pulp.lpSum(terms_x)
     
     return y, x
 
 def _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v, u, v_int, u_int, z_I, z_O, rho):
+    import pulp
+
     for t in range(n_inputs):
         interaction_sum_terms = []
         for p in range(n_inputs):
@@ -132,7 +217,7 @@ def _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v
             else:
                  interaction_sum_terms.append(v_int[p][t])
         
-        prob += I_in[t] == v[t] + 0.5 * lpSum(interaction_sum_terms)
+        prob += I_in[t] == v[t] + 0.5 * pulp.lpSum(interaction_sum_terms)
         prob += I_in[t] >= rho * z_I
         prob += I_in[t] <= z_I
     
@@ -145,14 +230,23 @@ def _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v
             else:
                 interaction_sum_terms.append(u_int[q][r])
 
-        prob += I_out[r] == u[r] + 0.5 * lpSum(interaction_sum_terms)
+        prob += I_out[r] == u[r] + 0.5 * pulp.lpSum(interaction_sum_terms)
         prob += I_out[r] >= rho * z_O
         prob += I_out[r] <= z_O
 
-def solve_2chccr_model(dmu_index: int, dmus: List[DMU], I_outputs: np.ndarray, I_inputs: np.ndarray, rho=0.5):
-    """Solve 2-CHCCR model (Model 11) for a single DMU."""
-    solver = PULP_CBC_CMD(msg=0)
-    prob = LpProblem(f"2CHCCR_DMU_{dmu_index}", LpMaximize)
+def solve_2chccr_model(dmu_index: int, dmus: List[DMU], I_outputs: np.ndarray, I_inputs: np.ndarray, rho=0.5, packed=False,
+                       precision='default', stats: Optional[SolveStats] = None, lambdas: Optional[list] = None):
+    """
+    Solve 2-CHCCR model (Model 11) for a single DMU.
+
+    With packed=True the interaction weights are returned as packed upper-triangle
+    vectors (see `storage.pack_upper`) instead of dense m x m / s x s matrices.
+    `precision` and `stats` are passed to `_solve_cbc`. If a `lambdas` list is given, the
+    duals of the frontier rows of an optimal solve are appended to it (see `peers`).
+    """
+    import pulp
+
+    prob = pulp.LpProblem(f"2CHCCR_DMU_{dmu_index}", pulp.LpMaximize)
     
     dmu_eval = dmus[dmu_index]
     n_inputs = len(dmu_eval.inputs)
@@ -167,31 +261,41 @@ def solve_2chccr_model(dmu_index: int, dmus: List[DMU], I_outputs: np.ndarray, I
     
     for j, dmu_j in enumerate(dmus):
         cy_j, cx_j = _calc_choquet(dmu_j, v, u, v_int, u_int, n_inputs, n_outputs)
-        prob += cy_j - cx_j <= 0
+        prob += cy_j - cx_j <= 0, f"Frontier_{j}"
     
     _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v, u, v_int, u_int, z_I, z_O, rho)
     
-    prob.solve(solver)
-    
-    if prob.status != 1:
+    if _solve_cbc(prob, precision, stats, 'self') != 1:
+        if packed:
+            return 0, np.zeros(n_inputs), np.zeros(n_outputs), np.zeros(n_pairs(n_inputs)), np.zeros(n_pairs(n_outputs))
         return 0, np.zeros(n_inputs), np.zeros(n_outputs), np.zeros((n_inputs, n_inputs)), np.zeros((n_outputs, n_outputs))
 
+    if lambdas is not None:
+        lambdas.append(np.maximum([prob.constraints[f"Frontier_{j}"].pi or 0.0 for j in range(len(dmus))], 0.0))
+
+    if packed:
+        w_int_in = np.array([pulp.value(v_int[t][p]) for t in range(n_inputs) for p in range(t+1, n_inputs)])
+        w_int_out = np.array([pulp.value(u_int[r][q]) for r in range(n_outputs) for q in range(r+1, n_outputs)])
+        return pulp.value(cy_eval), np.array([pulp.value(v[t]) for t in range(n_inputs)]), np.array([pulp.value(u[r]) for r in range(n_outputs)]), w_int_in, w_int_out
+
     w_int_in = np.zeros((n_inputs, n_inputs))
     for t in range(n_inputs):
         for p in range(t+1, n_inputs):
-            w_int_in[t, p] = value(v_int[t][p])
+            w_int_in[t, p] = pulp.value(v_int[t][p])
             
     w_int_out = np.zeros((n_outputs, n_outputs))
     for r in range(n_outputs):
         for q in range(r+1, n_outputs):
-            w_int_out[r, q] = value(u_int[r][q])
+            w_int_out[r, q] = pulp.value(u_int[r][q])
             
-    return value(cy_eval), np.array([value(v[t]) for t in range(n_inputs)]), np.array([value(u[r]) for r in range(n_outputs)]), w_int_in, w_int_out
+    return pulp.value(cy_eval), np.array([pulp.value(v[t]) for t in range(n_inputs)]), np.array([pulp.value(u[r]) for r in range(n_outputs)]), w_int_in, w_int_out
 
-def solve_ideal_noniideal_targets(dmu_eval_idx, dmu_target_idx, dmus, I_outputs, I_inputs, objective='max', rho=0.5):
+def solve_ideal_noniideal_targets(dmu_eval_idx, dmu_target_idx, dmus, I_outputs, I_inputs, objective='max', rho=0.5,
+                                  precision='default', stats: Optional[SolveStats] = None):
     """Solve Model 12: Compute E^max_dj or E^min_dj"""
-    solver = PULP_CBC_CMD(msg=0)
-    prob = LpProblem(f"Targets_{objective}", LpMaximize if objective == 'max' else LpMinimize)
+    import pulp
+
+    prob = pulp.LpProblem(f"Targets_{objective}", pulp.LpMaximize if objective == 'max' else pulp.LpMinimize)
     
     dmu_eval = dmus[dmu_eval_idx]
     dmu_target = dmus[dmu_target_idx]
@@ -218,15 +322,22 @@ def solve_ideal_noniideal_targets(dmu_eval_idx, dmu_target_idx, dmus, I_outputs,
         
     _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v, u, v_int, u_int, z_I, z_O, rho)
     
-    prob.solve(solver)
-    if prob.status != 1:
+    if _solve_cbc(prob, precision, stats, 'targets') != 1:
         return E_d_opt
-    return value(prob.objective)
+    return pulp.value(prob.objective)
+
+def check_satisfaction_feasibility(dmu_eval_idx, dmus, alpha, E_max, E_min, rho,
+                                   precision='default', stats: Optional[SolveStats] = None,
+                                   solutions: Optional[list] = None):
+    """
+    Check if satisfaction level alpha is feasible for Fairness principle.
 
-def check_satisfaction_feasibility(dmu_eval_idx, dmus, alpha, E_max, E_min, rho):
-    """Check if satisfaction level alpha is feasible for Fairness principle."""
-    solver = PULP_CBC_CMD(msg=0)
-    prob = LpProblem("FeasibilityCheck", LpMaximize) # Objective doesn't matter
+    If a `solutions` list is given, a feasible point is appended to it as the input and
+    output weight vectors [v, packed v_int] and [u, packed u_int].
+    """
+    import pulp
+
+    prob = pulp.LpProblem("FeasibilityCheck", pulp.LpMaximize) # Objective doesn't matter
     
     dmu_eval = dmus[dmu_eval_idx]
     n_inputs = len(dmu_eval.inputs)
@@ -260,54 +371,632 @@ def check_satisfaction_feasibility(dmu_eval_idx, dmus, alpha, E_max, E_min, rho)
 
     _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v, u, v_int, u_int, z_I, z_O, rho)
     
-    prob.solve(solver)
-    return prob.status == 1
+    feasible = _solve_cbc(prob, precision, stats, 'satisfaction') == 1
+    if feasible and solutions is not None:
+        solutions.append((
+            np.array([pulp.value(v[t]) or 0.0 for t in range(n_inputs)]
+                     + [pulp.value(v_int[t][p]) or 0.0 for t in range(n_inputs) for p in range(t+1, n_inputs)]),
+            np.array([pulp.value(u[r]) or 0.0 for r in range(n_outputs)]
+                     + [pulp.value(u_int[r][q]) or 0.0 for r in range(n_outputs) for q in range(r+1, n_outputs)]),
+        ))
+    return feasible
+
+def screen_dmus(dmus: List[DMU], rho=0.5, stats: Optional[SolveStats] = None):
+    """
+    Screening stage: one batched linear multiplier-CCR run over all DMUs.
+
+    Returns the `ccr_model.DEAResult` of the linear sub-capacity model (2-CHCCR with
+    all interactions fixed at zero, same rho balance). Its scores are lower bounds on
+    the 2-CHCCR self-efficiency, and its weights are feasible for Model 11.
+    """
+    if stats is None:
+        stats = SolveStats()
+    X = np.array([d.inputs for d in dmus], dtype=float)
+    Y = np.array([d.outputs for d in dmus], dtype=float)
+    return solve_multiplier(X, Y, 'crs', stats=stats, balance=rho, stage='screening')
+
+def solve_principle_model(dmu_eval_idx, dmus, E_max, E_min, principle='utilitarianism', rho=0.5,
+                          weights=None, tol=TARGET_TOL, precision='default', stats: Optional[SolveStats] = None):
+    """
+    Utilitarianism / equity: one LP choosing the evaluating DMU's weights for the rated DMUs.
+
+    Maximizes the sum (utilitarianism) or the minimum (equity) of the satisfaction surplus
+    (cy_j - E_min * cx_j) / (E_max - E_min) while D keeps E_d; see `lp.ChoquetLP.principle`.
+    `weights` multiplies each DMU's surplus in the sum (multiplicities of deduplicated DMUs).
+    E_d comes out of CBC rounded, so an infeasible answer is retried once with D allowed
+    to fall `tol` below it. Returns the efficiencies cy_j / cx_j of every DMU under the
+    chosen weights, or None.
+    """
+    efficiencies = _solve_principle_pulp(dmu_eval_idx, dmus, E_max, E_min, principle, rho, weights, 0.0, precision, stats)
+    if efficiencies is None:
+        efficiencies = _solve_principle_pulp(dmu_eval_idx, dmus, E_max, E_min, principle, rho, weights, tol,
+                                             precision, stats)
+    return efficiencies
+
+def _solve_principle_pulp(dmu_eval_idx, dmus, E_max, E_min, principle, rho, weights, slack, precision, stats):
+    import pulp
+
+    prob = pulp.LpProblem(f"Principle_{principle}", pulp.LpMaximize)
+    
+    dmu_eval = dmus[dmu_eval_idx]
+    n_inputs = len(dmu_eval.inputs)
+    n_outputs = len(dmu_eval.outputs)
+    
+    v, u, v_int, u_int, I_in, I_out, z_I, z_O = _create_lp_variables(n_inputs, n_outputs)
+    
+    cy_eval, cx_eval = _calc_choquet(dmu_eval, v, u, v_int, u_int, n_inputs, n_outputs)
+    prob += cx_eval == 1
+    
+    E_d_opt = dmu_eval.efficiency_ccr if dmu_eval.efficiency_ccr else 1.0
+    if slack:
+        prob += cy_eval - (E_d_opt - slack) * cx_eval >= 0
+    else:
+        prob += cy_eval - E_d_opt * cx_eval == 0
+    
+    aggregates = []
+    surplus = []
+    for j, dmu_j in enumerate(dmus):
+        cy_j, cx_j = _calc_choquet(dmu_j, v, u, v_int, u_int, n_inputs, n_outputs)
+        aggregates.append((cy_j, cx_j))
+        prob += cy_j - cx_j <= 0
+        
+        e_max = E_max[dmu_eval_idx, j]
+        e_min = E_min[dmu_eval_idx, j]
+        if j != dmu_eval_idx and e_max > e_min + 1e-6:
+            weight = 1.0 if weights is None else float(weights[j])
+            surplus.append((cy_j - e_min * cx_j) * (weight / (e_max - e_min)))
+    
+    if principle == 'equity':
+        t = pulp.LpVariable("t")
+        prob += t
+        for k, s_j in enumerate(surplus):
+            prob += t - s_j <= 0, f"Equity_{k}"
+    else:
+        prob += pulp.lpSum(surplus)
+    
+    _add_global_importance_constraints(prob, n_inputs, n_outputs, I_in, I_out, v, u, v_int, u_int, z_I, z_O, rho)
+    
+    if _solve_cbc(prob, precision, stats, 'satisfaction') != 1:
+        return None
+    cx = np.array([pulp.value(cx_j) for _, cx_j in aggregates], dtype=float)
+    cy = np.array([pulp.value(cy_j) for cy_j, _ in aggregates], dtype=float)
+    return np.where(cx > 1e-12, cy / np.where(cx > 1e-12, cx, 1.0), np.nan)
+
+def _rated(i, E_max, E_min):
+    """DMUs whose satisfaction DMU i can change: j != i with a non-degenerate target range."""
+    mask = E_max[i] > E_min[i] + 1e-6
+    mask[i] = False
+    return mask
+
+def _principle_outcome(i, efficiencies, E_max, E_min, principle, weights=None):
+    """
+    Ex-post satisfaction of DMU i and its cross-efficiency row under the chosen weights;
+    the utilitarian mean weights every rated DMU by `weights` when given.
+    """
+    e_max, e_min = E_max[i], E_min[i]
+    mask = _rated(i, E_max, E_min)
+    if not mask.any():
+        # Nobody to satisfy: every rated DMU sits at its (single) target
+        return 1.0, e_min.copy()
+    if efficiencies is None:
+        # No weights found: every rated DMU stays at its non-ideal point
+        warnings.warn(f"No {principle} weights found for DMU {i}; using its non-ideal targets")
+        return 0.0, e_min.copy()
+    row = np.where(np.isnan(efficiencies), e_min, efficiencies)
+    sd = np.clip((row[mask] - e_min[mask]) / (e_max[mask] - e_min[mask]), 0.0, 1.0)
+    if principle == 'equity':
+        return float(sd.min()), row
+    return float(np.average(sd, weights=None if weights is None else weights[mask])), row
+
+class _WeightPool:
+    """
+    Weight vectors found so far in a run: the self-evaluation weights and the feasible
+    fairness-check solutions of every DMU, kept as their input and output aggregates
+    cx, cy over all DMUs.
+
+    The frontier and importance rows are homogeneous, so a pooled vector with
+    cy_d = E_d cx_d is, rescaled to cx_d = 1, a feasible point of d's fairness check as
+    long as the rescaling keeps the interactions within [-1, 1] and the importances
+    within z <= 1, i.e. cx_d >= `floor`.
+    """
+
+    def __init__(self, Fx: np.ndarray, Fy: np.ndarray, input_coalitions, output_coalitions):
+        self.Fx, self.Fy = Fx, Fy
+        self._sizes = (Fx.shape[1] - len(input_coalitions), Fy.shape[1] - len(output_coalitions))
+        self._G = (shapley_matrix(self._sizes[0], input_coalitions), shapley_matrix(self._sizes[1], output_coalitions))
+        self._cx: List[np.ndarray] = []
+        self._cy: List[np.ndarray] = []
+        self._floor: List[float] = []
+
+    def add(self, w_in: np.ndarray, w_out: np.ndarray):
+        floor = 0.0
+        for w, size, G in zip((w_in, w_out), self._sizes, self._G):
+            floor = max(floor, np.abs(w[size:]).max(initial=0.0), (G @ w).max(initial=0.0))
+        self._cx.append(self.Fx @ w_in)
+        self._cy.append(self.Fy @ w_out)
+        self._floor.append(floor)
+
+    def certified_level(self, d: int, E_max: np.ndarray, E_min: np.ndarray, e_d: float, grid: int) -> int:
+        """
+        Highest level k < grid at which d's fairness check is known to pass: the best
+        realized satisfaction min_j (E_dj - E_min_dj) / (E_max_dj - E_min_dj) of a pooled
+        vector usable for d, rounded down. 0 (the bisection's fallback) if none is usable.
+        """
+        if not self._cx:
+            return 0
+        cx, cy, floor = np.column_stack(self._cx), np.column_stack(self._cy), np.array(self._floor)
+        usable = (cx[d] > 1e-12) & (cx[d] >= floor * (1 - 1e-9)) & (cy[d] >= (e_d - TARGET_TOL) * cx[d])
+        # Solutions of loose-tolerance solves may overshoot the frontier; they certify nothing
+        usable &= (cy <= cx + TARGET_TOL * np.maximum(cx[d], 1.0)).all(axis=0)
+        if not usable.any():
+            return 0
+        js = np.flatnonzero(_rated(d, E_max, E_min))
+        if not len(js):
+            return grid - 1
+        cx, cy = cx[np.ix_(js, usable)], cy[np.ix_(js, usable)]
+        e_min, width = E_min[d, js][:, None], (E_max[d, js] - E_min[d, js])[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            satisfaction = np.where(cx > 1e-12, (cy / cx - e_min) / width, -np.inf)
+        level = np.floor((satisfaction.min(axis=0).max() - TARGET_TOL) * grid)
+        return int(np.clip(level, 0, grid - 1))
+
+
+class _FairnessSearch:
+    """
+    Fairness levels of the DMUs on the grid k / `grid`, with few feasibility checks.
+
+    For each DMU d, d's check is known to pass at `low[d]` and to fail at `high[d]` (or
+    `high[d]` is `grid`); d is settled when they are adjacent, and `low[d]` is then the
+    level a bisection of [0, 1] ends on. `low` starts at the level the weight pool
+    certifies without an LP. A passing probe lifts `low[d]` to the level its own
+    solution realizes, which is often well above the probe; the next probe then tries
+    the level right above (a secant step on the realized satisfaction) and halving
+    resumes only if that one passes too.
+    """
+
+    def __init__(self, E_max: np.ndarray, E_min: np.ndarray, dmus: List[DMU], pool: _WeightPool, probe,
+                 grid: int, weights: Optional[np.ndarray] = None):
+        n = len(dmus)
+        self.E_max, self.E_min = E_max, E_min
+        self.e = np.array([d.efficiency_ccr if d.efficiency_ccr else 1.0 for d in dmus])
+        self.pool, self.probe, self.grid = pool, probe, grid
+        self.low = np.zeros(n, dtype=np.int64)
+        self.high = np.full(n, grid, dtype=np.int64)
+        self._secant = np.zeros(n, dtype=bool)
+        self._weights = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+
+    def _lift(self, d: int, level: int) -> bool:
+        certified = self.pool.certified_level(d, self.E_max, self.E_min, self.e[d], self.grid)
+        self.low[d] = max(self.low[d], level, certified)
+        return self.low[d] > level
+
+    def start(self, d: int):
+        self._secant[d] = self._lift(d, 0)
+
+    def settled(self, d: int) -> bool:
+        return self.high[d] - self.low[d] <= 1
+
+    def step(self, d: int):
+        """One feasibility check for d."""
+        secant = self._secant[d]
+        level = self.low[d] + 1 if secant else (self.low[d] + self.high[d]) // 2
+        if self.probe(d, level):
+            self._secant[d] = self._lift(d, level) and not secant
+        else:
+            self.high[d] = level
+            self._secant[d] = False
+
+    def resolve(self, d: int):
+        self.start(d)
+        while not self.settled(d):
+            self.step(d)
+
+    def separate(self, indices: List[int]):
+        """
+        Refine only until the final scores are ordered the same for every level left in
+        each DMU's bracket: ranks, and the rank categories of the evaluator, are then
+        final. The widest bracket among overlapping ones is probed first.
+        """
+        idx = np.asarray(indices)
+        for d in idx:
+            self.start(d)
+        # Final score of d: the (weighted) mean of its cross row, offset + slope * alpha_d
+        w = self._weights / self._weights.sum()
+        offset, slope = (self.E_min @ w)[idx], ((self.E_max - self.E_min) @ w)[idx]
+        while True:
+            top = np.maximum(self.high[idx] - 1, self.low[idx])
+            lo = offset + slope * self.low[idx] / self.grid
+            hi = offset + slope * top / self.grid
+            order = np.argsort(lo, kind='stable')
+            lo_sorted, hi_sorted = lo[order], hi[order]
+            overlap = np.zeros(len(idx), dtype=bool)
+            overlap[:-1] = hi_sorted[:-1] >= lo_sorted[1:]
+            overlap[1:] |= np.maximum.accumulate(hi_sorted)[:-1] >= lo_sorted[1:]
+            open_ = np.zeros(len(idx), dtype=bool)
+            open_[order] = overlap
+            open_ &= self.high[idx] - self.low[idx] > 1
+            if not open_.any():
+                return
+            self.step(idx[np.flatnonzero(open_)[np.argmax((hi - lo)[open_])]])
+
+
+def _solve(lp, stats: SolveStats, stage: str, cache: Optional[LPCache] = None, recorder=None, precision='default'):
+    if cache is not None:
+        result = cache.solve(lp, stats, stage, precision)
+    else:
+        result = solve_lp(lp, stats, stage, precision)
+    if recorder is not None:
+        recorder.record(lp, result, stage)
+    return result
+
+def _solve_matrix_lp(model: ChoquetLP, lp, key, rho, warm: Optional[WarmStart], stats: SolveStats, stage: str,
+                     cache: Optional[LPCache] = None, recorder=None, precision='default'):
+    if warm is not None:
+        hit = warm.lookup(key, rho, lp, model)
+        if hit is not None:
+            stats.avoid(stage)
+            return hit
+    result = _solve(lp, stats, stage, cache, recorder, precision)
+    if warm is not None:
+        warm.store(key, rho, result)
+    return result
+
+def _solve_self_matrix(model: ChoquetLP, i, rho, warm, stats, cache=None, recorder=None, solutions=None,
+                       precision='default'):
+    """Matrix-backend counterpart of `solve_2chccr_model` (packed interaction weights)."""
+    res = _solve_matrix_lp(model, model.self_efficiency(i, rho), ('self', i), rho, warm, stats, 'self', cache, recorder,
+                           precision)
+    if solutions is not None and res.optimal:
+        solutions.append(res)
+    if not res.optimal:
+        return 0, np.zeros(model.n_inputs), np.zeros(model.n_outputs), np.zeros(model.k_in - model.n_inputs), np.zeros(model.k_out - model.n_outputs)
+    v, u, vint, uint = model.split(res.x)
+    return res.objective, v, u, vint, uint
+
+def _solve_target_matrix(model: ChoquetLP, i, j, e_d, objective, rho, warm, stats, cache=None, recorder=None,
+                         solutions=None, precision='default'):
+    """Matrix-backend counterpart of `solve_ideal_noniideal_targets`."""
+    lp = model.target(i, j, e_d, rho, objective)
+    res = _solve_matrix_lp(model, lp, ('targets', objective, i, j, e_d), rho, warm, stats, 'targets', cache, recorder,
+                           precision)
+    if solutions is not None and res.optimal:
+        solutions.append(res.x)
+    return res.objective if res.optimal else e_d
+
+def run_choquet_evaluation(dmus: List[DMU], rho=0.5, store: Optional[ResultStore] = None,
+                           backend: str = 'pulp', stats: Optional[SolveStats] = None,
+                           model: Optional[ChoquetLP] = None, warm: Optional[WarmStart] = None,
+                           screening: bool = False, screen_tol: float = 1e-7, k: int = 2,
+                           dedup: bool = False, cache: Optional[LPCache] = None, recorder=None,
+                           principle: str = 'fairness', prune_targets: bool = False, precision: str = 'default',
+                           stop_at_rank: bool = False):
+    """
+    Run the three-step Choquet cross-efficiency pipeline.
+
+    If a `ResultStore` is given, the self-evaluation weights (including the packed
+    interaction weights, which are otherwise discarded) and the satisfaction level of
+    every DMU are written into it.
+
+    backend='pulp' builds every LP with PuLP and solves it with CBC (reference path).
+    backend='highs' solves the same LPs in matrix form with HiGHS, sharing the frontier
+    constraint block across all LPs of the run (see `lp.ChoquetLP`); `model` may be
+    passed in to reuse it across runs on the same data, and `warm` reuses optimal
+    solutions across increasing values of rho (see `sweep.rho_sweep`).
+    LP counts and wall time per stage are accumulated into `stats` when given.
+
+    With screening=True a batched linear CCR pass (`screen_dmus`) runs first. Every
+    DMU already efficient under the linear sub-capacity (score >= 1 - screen_tol) is
+    2-CHCCR efficient too: the Model 11 solve is skipped and counted as avoided.
+
+    k > 2 replaces the 2-additive capacities by k-additive ones (highs backend only,
+    see `lp.ChoquetLP`); a `ResultStore` only holds 2-additive weights.
+
+    With dedup=True DMUs with identical (normalized) data are collapsed to one
+    representative first. Duplicates only add redundant frontier rows and repeat the
+    same self, target and fairness LPs, so the pipeline runs on the distinct DMUs, the
+    cross-efficiency means weight every distinct DMU by its multiplicity, and all
+    results are expanded back to the input order. `model` and `warm` then refer to the
+    distinct DMUs. On the highs backend, `cache` (an `lp.LPCache`) answers LP
+    instances repeated within the run without solving them again.
+
+    `recorder` (an `export.LPBatch`, highs backend) receives every LP handed to the
+    solver, with its optimal objective, for offline replay.
+
+    principle selects how the satisfaction step picks each DMU's cross weights, after
+    the shared target sweep: 'fairness' finds the highest common satisfaction level on
+    the grid of a 12-step bisection (see `_FairnessSearch`: bounds certified by weights
+    already found for any DMU, then secant and halving probes, usually well under 12
+    feasibility LPs per DMU); 'utilitarianism' and 'equity' solve one LP per DMU
+    maximizing the sum or the minimum of the linearized satisfactions (see
+    `solve_principle_model`), and report the mean or minimum actual satisfaction.
+
+    With prune_targets=True target LPs whose optimum is known without solving are
+    skipped: E_max[d, d] = E_min[d, d] = E_d always, and on the highs backend E_max[d, j]
+    is settled when a weight vector already found for d (its self weights or an earlier
+    target solution, rescaled to cx_j = 1) reaches E_j, which bounds E_max[d, j] from
+    above. Skipped LPs are counted as avoided under 'targets';
+    `stats.avoided_fraction('targets')` gives the share eliminated.
+
+    precision picks the accuracy tier of every LP (see `lp.PRECISIONS`): 'fast' loosens
+    the solver tolerances, 'verified' checks each solution's primal residuals and
+    duality gap and re-solves the failing LPs at tight tolerances, counting them in
+    `stats.resolved` and `stats.unverified`.
+
+    With stop_at_rank=True the fairness search stops as soon as the order of the final
+    scores can no longer change, which fixes the ranks and categories of
+    `BoundedRationalityEvaluator`; satisfactions and scores are then the lower ends of
+    their remaining brackets rather than the grid optimum.
+    """
+    _check_options(backend, principle, k, store, recorder, precision)
+    if stats is None:
+        stats = SolveStats()
+    stats.tick()
+
+    options = dict(rho=rho, backend=backend, stats=stats, model=model, warm=warm, screening=screening,
+                   screen_tol=screen_tol, k=k, cache=cache, recorder=recorder, principle=principle,
+                   prune_targets=prune_targets, precision=precision, stop_at_rank=stop_at_rank)
+
+    if dedup:
+        reps, inverse, counts = unique_dmus(dmus)
+        if len(reps) < len(dmus):
+            sub_store = ResultStore(len(reps), store.n_inputs, store.n_outputs, store.data.dtype) if store is not None else None
+            cross, E_max, E_min = _evaluate(reps, sub_store, weights=counts, **options)
+            stats.avoid('dedup', len(dmus) - len(reps))
+            final_cross_effs = weighted_cross_efficiency(cross, counts)
+            # Duplicates are interchangeable peers: each group's lambda goes to its first member
+            first = np.unique(inverse, return_index=True)[1]
+            lambdas = []
+            for rep_dmu in reps:
+                lam = None
+                if rep_dmu.lambdas is not None:
+                    lam = np.zeros(len(dmus))
+                    lam[first] = rep_dmu.lambdas
+                lambdas.append(lam)
+            for i, d in enumerate(dmus):
+                rep_dmu = reps[inverse[i]]
+                d.lambdas = lambdas[inverse[i]]
+                d.efficiency_ccr = rep_dmu.efficiency_ccr
+                d.weights_input = rep_dmu.weights_input
+                d.weights_output = rep_dmu.weights_output
+                d.weights_interactions_input = rep_dmu.weights_interactions_input
+                d.weights_interactions_output = rep_dmu.weights_interactions_output
+                d.satisfaction = rep_dmu.satisfaction
+            if store is not None:
+                store.data[:] = sub_store.data[inverse]
+            return final_cross_effs[inverse], E_max[np.ix_(inverse, inverse)], E_min[np.ix_(inverse, inverse)]
+
+    cross, E_max, E_min = _evaluate(dmus, store, **options)
+    return cross.mean(axis=1), E_max, E_min
+
+def iter_choquet_evaluation(dmus: List[DMU], rho=0.5, store: Optional[ResultStore] = None,
+                            backend: str = 'pulp', stats: Optional[SolveStats] = None,
+                            model: Optional[ChoquetLP] = None, warm: Optional[WarmStart] = None,
+                            screening: bool = False, screen_tol: float = 1e-7, k: int = 2,
+                            cache: Optional[LPCache] = None, recorder=None, principle: str = 'fairness',
+                            prune_targets: bool = False, precision: str = 'default',
+                            stop_at_rank: bool = False, rows: Optional[List[int]] = None) -> Iterator[Tuple[int, float]]:
+    """
+    Streaming form of `run_choquet_evaluation` (same options, without dedup): yields
+    (i, cross-efficiency of DMU i) as soon as DMU i's results are final.
+
+    After the self-efficiency stage the targets and the satisfaction are computed one
+    rating DMU at a time, so DMUs come out in input order, each one once its own
+    target row is done. Its efficiency_ccr, weights, satisfaction and lambdas are set
+    before it is yielded and cross-efficiency rows are not kept, so a consumer can
+    write each record and drop it. The E_max / E_min matrices (2 n^2 floats) are still
+    held, as every DMU's fairness check reads them. With stop_at_rank=True nothing is
+    final before all target rows are, and every DMU comes out at the end. Options are
+    checked on the call; the LPs run as the iterator is consumed.
+
+    `rows` restricts the run to those rating DMUs, in that order: their self-efficiency,
+    target rows and satisfaction; the other DMUs only enter as peers and keep unset
+    results. A DMU's results only depend on its own LPs, so disjoint `rows` can run in
+    separate processes (see `scheduler`). Not combinable with stop_at_rank, which
+    compares all DMUs.
+    """
+    _check_options(backend, principle, k, store, recorder, precision)
+    if rows is not None:
+        if stop_at_rank:
+            raise ValueError("stop_at_rank needs every DMU, it cannot run on a subset of rows")
+        rows = [int(i) for i in rows]
+        if any(not 0 <= i < len(dmus) for i in rows) or len(set(rows)) < len(rows):
+            raise ValueError("rows must be distinct DMU indices")
+    if stats is None:
+        stats = SolveStats()
+    stats.tick()
+    results = _evaluate_rows(dmus, store, rho=rho, backend=backend, stats=stats, model=model, warm=warm,
+                             screening=screening, screen_tol=screen_tol, k=k, cache=cache, recorder=recorder,
+                             principle=principle, prune_targets=prune_targets, precision=precision,
+                             stop_at_rank=stop_at_rank, rows=rows)
+    return ((i, float(row.mean())) for i, row in results)
+
+
+def _check_options(backend, principle, k, store, recorder, precision):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    if principle not in PRINCIPLES:
+        raise ValueError(f"Unknown principle '{principle}', expected one of {PRINCIPLES}")
+    if k != 2 and backend != 'highs':
+        raise ValueError("k-additive capacities with k != 2 require backend='highs'")
+    if k != 2 and store is not None:
+        raise ValueError("ResultStore holds 2-additive weights only")
+    if recorder is not None and backend != 'highs':
+        raise ValueError("Recording LPs requires backend='highs'")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISIONS}")
+
+def _evaluate(dmus: List[DMU], store, weights=None, **options):
+    """Pipeline body of `run_choquet_evaluation`; returns the n x n cross-efficiency matrix."""
+    cross = np.zeros((len(dmus), len(dmus)))
+    rows = _evaluate_rows(dmus, store, weights=weights, **options)
+    while True:
+        try:
+            i, row = next(rows)
+        except StopIteration as done:
+            E_max, E_min = done.value
+            return cross, E_max, E_min
+        cross[i] = row
+
+def _evaluate_rows(dmus: List[DMU], store, rho, backend, stats, model, warm, screening, screen_tol, k,
+                   cache, recorder, principle, prune_targets, precision, stop_at_rank, weights=None, rows=None):
+    """
+    Generator form of `_evaluate`: yields (i, cross-efficiency row of i) as soon as DMU
+    i's results are final, and returns (E_max, E_min). With `rows`, only those DMUs are
+    evaluated (see `iter_choquet_evaluation`).
+    """
+    if backend == 'highs' and model is None:
+        model = ChoquetLP.from_dmus(dmus, k=k)
+    stats.tick('setup')
+
+    # 0. Screening
+    bound = screen_dmus(dmus, rho, stats) if screening else None
+    if screening:
+        stats.tick('screening')
 
-def run_choquet_evaluation(dmus: List[DMU], rho=0.5):
     # 1. Interactions
     I_out = estimate_choquet_interactions(dmus, 'output')
     I_in = estimate_choquet_interactions(dmus, 'input')
+    stats.tick('interactions')
     
     # 2. Self Efficiency
-    for i in range(len(dmus)):
-        eff, v, u, vint, uint = solve_2chccr_model(i, dmus, I_out, I_in, rho)
+    self_x = {}
+    if backend == 'highs':
+        pool = _WeightPool(model.Fx, model.Fy, model.input_coalitions, model.output_coalitions)
+    else:
+        X, Y = np.array([d.inputs for d in dmus]), np.array([d.outputs for d in dmus])
+        pool = _WeightPool(choquet_features(X), choquet_features(Y),
+                           interaction_coalitions(X.shape[1], 2), interaction_coalitions(Y.shape[1], 2))
+    rows = range(len(dmus)) if rows is None else rows
+    for i in rows:
+        if bound is not None and bound.status[i] == 1 and bound.efficiency[i] >= 1 - screen_tol:
+            eff, v, u = 1.0, bound.weights_input[i], bound.weights_output[i]
+            dmus[i].lambdas = bound.lambdas[i]
+            vint, uint = np.zeros(n_pairs(len(v))), np.zeros(n_pairs(len(u)))
+            if model is not None:
+                vint, uint = np.zeros(model.k_in - model.n_inputs), np.zeros(model.k_out - model.n_outputs)
+            stats.avoid('self')
+        elif backend == 'pulp':
+            found = []
+            eff, v, u, vint, uint = solve_2chccr_model(i, dmus, I_out, I_in, rho, packed=True,
+                                                       precision=precision, stats=stats, lambdas=found)
+            dmus[i].lambdas = found[0] if found else None
+            stats.record('self')
+        else:
+            found = []
+            eff, v, u, vint, uint = _solve_self_matrix(model, i, rho, warm, stats, cache, recorder, found, precision)
+            dmus[i].lambdas = None
+            if found:
+                self_x[i] = found[0].x
+                # The frontier block comes first in every ChoquetLP program
+                dmus[i].lambdas = np.maximum(found[0].duals[:len(dmus)], 0.0)
         dmus[i].efficiency_ccr = eff
         dmus[i].weights_input = v
         dmus[i].weights_output = u
+        if k == 2:
+            dmus[i].weights_interactions_input = vint
+            dmus[i].weights_interactions_output = uint
+        pool.add(np.concatenate([v, vint]), np.concatenate([u, uint]))
+        if store is not None:
+            store.record(i, eff, v, u, vint, uint)
+    stats.tick('self')
         
-    # 3. Targets (E_max, E_min)
+    # 3-4. Targets (E_max, E_min) and satisfaction, one rating DMU at a time: DMU i's
+    # satisfaction only reads row i of the targets, so its results are final once its
+    # row is. Only stop_at_rank compares DMUs and needs every row first.
     n = len(dmus)
     E_max = np.zeros((n,n))
     E_min = np.zeros((n,n))
-    for i in range(n):
-        for j in range(n):
-            E_max[i,j] = solve_ideal_noniideal_targets(i, j, dmus, I_out, I_in, 'max', rho)
-            E_min[i,j] = solve_ideal_noniideal_targets(i, j, dmus, I_out, I_in, 'min', rho)
-            
-    # 4. Satisfaction (Fairness Bisection)
-    final_cross_effs = np.zeros(n)
-    
-    for i in range(n):
-        # Bisection for max alpha
-        low, high = 0.0, 1.0
-        best_alpha = 0.0
-        
-        # 10 iterations -> epsilon ~ 0.001
-        for _ in range(12):
-            mid = (low + high) / 2
-            if check_satisfaction_feasibility(i, dmus, mid, E_max, E_min, rho):
-                best_alpha = mid
-                low = mid
-            else:
-                high = mid
-                
+
+    def probe(i, level):
+        alpha = level / grid
+        found = []
+        if backend == 'pulp':
+            feasible = check_satisfaction_feasibility(i, dmus, alpha, E_max, E_min, rho, precision, stats, found)
+            stats.record('satisfaction')
+        else:
+            e_d = dmus[i].efficiency_ccr if dmus[i].efficiency_ccr else 1.0
+            res = _solve(model.feasibility(i, alpha, E_max, E_min, e_d, rho), stats, 'satisfaction', cache,
+                         recorder, precision)
+            feasible = res.optimal
+            if feasible:
+                found.append((res.x[model.in_slice], res.x[model.out_slice]))
+        for w_in, w_out in found:
+            pool.add(w_in, w_out)
+        return feasible
+
+    def settle(i):
+        best_alpha = search.low[i] / grid
         dmus[i].satisfaction = best_alpha
-        
-        # Compute Cross Efficiencies based on this alpha
-        row_effs = []
+        if store is not None:
+            store.satisfaction[i] = best_alpha
+        return E_min[i] + best_alpha * (E_max[i] - E_min[i])
+
+    grid = 1 << SATISFACTION_STEPS
+    search = _FairnessSearch(E_max, E_min, dmus, pool, probe, grid, weights)
+    stop_at_rank = stop_at_rank and principle == 'fairness'
+    for i in rows:
+        e_d = dmus[i].efficiency_ccr if dmus[i].efficiency_ccr else 1.0
+        # Best ratio of each j reachable by weights already found for i (lower bound on E_max)
+        reached = np.full(n, -np.inf)
+        if prune_targets and i in self_x:
+            reached = model.best_target_bounds(i, e_d, rho, self_x[i])
         for j in range(n):
-            val = E_min[i,j] + best_alpha * (E_max[i,j] - E_min[i,j])
-            row_effs.append(val)
-        final_cross_effs[i] = np.mean(row_effs)
-        
-    return final_cross_effs, E_max, E_min
+            if prune_targets and i == j:
+                # cx_d = 1 and cy_d = E_d cx_d fix the objective
+                E_max[i,j] = E_min[i,j] = e_d
+                stats.avoid('targets', 2)
+            elif backend == 'pulp':
+                E_max[i,j] = solve_ideal_noniideal_targets(i, j, dmus, I_out, I_in, 'max', rho, precision, stats)
+                E_min[i,j] = solve_ideal_noniideal_targets(i, j, dmus, I_out, I_in, 'min', rho, precision, stats)
+                stats.record('targets', n=2)
+            else:
+                found = [] if prune_targets else None
+                e_j = dmus[j].efficiency_ccr
+                if prune_targets and e_j and reached[j] >= e_j - TARGET_TOL:
+                    # Model 12 restricts j's Model 11, so E_max[i, j] <= E_j is attained
+                    E_max[i,j] = e_j
+                    stats.avoid('targets')
+                else:
+                    E_max[i,j] = _solve_target_matrix(model, i, j, e_d, 'max', rho, warm, stats, cache, recorder,
+                                                      found, precision)
+                E_min[i,j] = _solve_target_matrix(model, i, j, e_d, 'min', rho, warm, stats, cache, recorder,
+                                                  found, precision)
+                for x in found or ():
+                    reached = np.maximum(reached, model.best_target_bounds(i, e_d, rho, x))
+        stats.tick('targets')
+        if stop_at_rank:
+            continue
+
+        if principle != 'fairness':
+            if not _rated(i, E_max, E_min).any():
+                # No LP: the satisfaction is 1 whatever the weights
+                efficiencies = None
+                stats.avoid('satisfaction')
+            elif backend == 'pulp':
+                efficiencies = solve_principle_model(i, dmus, E_max, E_min, principle, rho, weights,
+                                                     precision=precision, stats=stats)
+                stats.record('satisfaction', OPTIMAL if efficiencies is not None else FAILED)
+            else:
+                res = _solve(model.principle(i, E_max, E_min, e_d, rho, principle, weights),
+                             stats, 'satisfaction', cache, recorder, precision)
+                efficiencies = None
+                if res.optimal:
+                    cx, cy = model.ratios(res.x[:model.n_vars])
+                    efficiencies = np.where(cx > 1e-12, cy / np.where(cx > 1e-12, cx, 1.0), np.nan)
+            satisfaction, row = _principle_outcome(i, efficiencies, E_max, E_min, principle, weights)
+            dmus[i].satisfaction = satisfaction
+            if store is not None:
+                store.satisfaction[i] = satisfaction
+        else:
+            search.resolve(i)
+            row = settle(i)
+        stats.tick('satisfaction')
+        yield i, row
+
+    if stop_at_rank:
+        search.separate(list(range(n)))
+        final = [settle(i) for i in range(n)]
+        stats.tick('satisfaction')
+        for i in range(n):
+            yield i, final[i]
+    return E_max, E_min
@@ -0,0 +1,227 @@
+
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from .choquet import BACKENDS, PRINCIPLES
+from .evaluator import BoundedRationalityEvaluator
+from .lp import PRECISIONS, SolveStats
+
+FORMATS = ('parquet', 'csv')
+
+_READERS = {
+    '.csv': pl.read_csv,
+    '.parquet': pl.read_parquet,
+    '.xlsx': pl.read_excel,
+}
+
+
+def load_spec(path: str) -> Dict[str, object]:
+    """
+    Read a variable spec: a JSON object with the DMU identifier column and the input
+    and output columns, e.g. {"id": "Salesperson", "inputs": ["Hours", "Visits"],
+    "outputs": ["Orders"]}.
+    """
+    with open(path) as f:
+        spec = json.load(f)
+    if not isinstance(spec.get('id'), str):
+        raise ValueError("Spec needs an 'id' column name")
+    for key in ('inputs', 'outputs'):
+        if not spec.get(key) or not all(isinstance(c, str) for c in spec[key]):
+            raise ValueError(f"Spec needs a non-empty list of '{key}' column names")
+    return {'id': spec['id'], 'inputs': list(spec['inputs']), 'outputs': list(spec['outputs'])}
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[str]:
+    """Input files from paths and glob patterns, in order and without repeats."""
+    paths: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        matches = [p for p in matches if os.path.isfile(p)]
+        if not matches:
+            raise ValueError(f"No input file matches '{pattern}'")
+        paths.extend(p for p in matches if p not in paths)
+    for p in paths:
+        if os.path.splitext(p)[1].lower() not in _READERS:
+            raise ValueError(f"Unsupported input '{p}', expected one of {tuple(_READERS)}")
+    return paths
+
+
+def read_table(path: str) -> pl.DataFrame:
+    return _READERS[os.path.splitext(path)[1].lower()](path)
+
+
+def cache_key(path: str, spec: Dict[str, object], options: Dict[str, object]) -> str:
+    """Digest of the file contents, the spec and the evaluation options."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(json.dumps([spec, options], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def evaluate_file(path: str, spec: Dict[str, object], options: Dict[str, object],
+                  cache_dir: Optional[str] = None) -> Tuple[pl.DataFrame, Dict[str, object]]:
+    """
+    Evaluate the DMUs of one file. Returns the report (one row per DMU, tagged with the
+    source file) and its profile: seconds spent reading and evaluating, per pipeline
+    stage, and the LP counts. With `cache_dir`, reports are reused across runs for
+    unchanged files, spec and options.
+    """
+    profile: Dict[str, object] = {'file': path, 'cached': False}
+    start = perf_counter()
+    cached = None
+    if cache_dir is not None:
+        cached = os.path.join(cache_dir, cache_key(path, spec, options) + '.parquet')
+        if os.path.exists(cached):
+            report = pl.read_parquet(cached)
+            profile.update(cached=True, rows=report.height, read=perf_counter() - start)
+            return report, profile
+
+    frame = read_table(path)
+    missing = [c for c in (spec['id'], *spec['inputs'], *spec['outputs']) if c not in frame.columns]
+    if missing:
+        raise ValueError(f"{path}: missing columns {missing}")
+    profile['read'] = perf_counter() - start
+
+    start = perf_counter()
+    stats = SolveStats()
+    evaluator = BoundedRationalityEvaluator(rho=options['rho'], ethical_principle=options['principle'],
+                                            backend=options['backend'], precision=options['precision'])
+    report = evaluator.evaluate(
+        frame[spec['id']].to_list(),
+        frame.select(spec['inputs']).to_numpy().astype(float),
+        frame.select(spec['outputs']).to_numpy().astype(float),
+        output='polars',
+        stats=stats,
+    )
+    report = report.with_columns(pl.col('id').cast(pl.String), pl.lit(os.path.basename(path)).alias('source'))
+    profile.update(rows=report.height, evaluate=perf_counter() - start, stages=dict(stats.seconds),
+                   solved=dict(stats.solved), avoided=dict(stats.avoided), failed=dict(stats.failed),
+                   resolved=dict(stats.resolved), unverified=dict(stats.unverified))
+
+    if cached is not None:
+        # Write-then-rename so concurrent runs never read a partial file
+        partial = f"{cached}.{os.getpid()}.tmp"
+        report.write_parquet(partial)
+        os.replace(partial, cached)
+    return report, profile
+
+
+def _output_path(output_dir: str, path: str, fmt: str, taken: set) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name, k = stem, 1
+    while name in taken:
+        name, k = f"{stem}-{k}", k + 1
+    taken.add(name)
+    return os.path.join(output_dir, f"{name}.{fmt}")
+
+
+def run(paths: Sequence[str], spec: Dict[str, object], output_dir: str, fmt: str = 'parquet',
+        options: Optional[Dict[str, object]] = None, workers: int = 1,
+        cache_dir: Optional[str] = None) -> List[Dict[str, object]]:
+    """
+    Evaluate every file and write one report per input into `output_dir`.
+
+    Files are independent tasks spread over `workers` processes; each report is written
+    as soon as its file is done, so memory holds one report at a time. Returns the
+    per-file profiles in completion order, each with its 'output' path and 'write' time.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    options = {'rho': 0.5, 'principle': 'fairness', 'backend': 'pulp', 'precision': 'default', **(options or {})}
+    os.makedirs(output_dir, exist_ok=True)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    taken: set = set()
+    targets = {p: _output_path(output_dir, p, fmt, taken) for p in paths}
+
+    def write(report: pl.DataFrame, profile: Dict[str, object]) -> Dict[str, object]:
+        start = perf_counter()
+        target = targets[profile['file']]
+        if fmt == 'parquet':
+            report.write_parquet(target)
+        else:
+            report.write_csv(target)
+        profile.update(output=target, write=perf_counter() - start)
+        return profile
+
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        return [write(*evaluate_file(p, spec, options, cache_dir)) for p in paths]
+    # Spawn, not fork: a forked child inherits polars' thread pool and can hang reading files
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(evaluate_file, p, spec, options, cache_dir) for p in paths]
+        return [write(*f.result()) for f in as_completed(futures)]
+
+
+def _summary(profiles: List[Dict[str, object]]) -> str:
+    stages: Dict[str, float] = {}
+    for profile in profiles:
+        for stage, seconds in profile.get('stages', {}).items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    lines = [f"{'stage':<14}{'seconds':>10}"]
+    lines += [f"{stage:<14}{seconds:>10.3f}" for stage, seconds in stages.items()]
+    for key in ('read', 'write'):
+        lines.append(f"{key:<14}{sum(p.get(key, 0.0) for p in profiles):>10.3f}")
+    cached = sum(bool(p['cached']) for p in profiles)
+    lines.append(f"{len(profiles)} file(s), {cached} from cache")
+    resolved, unverified = (sum(sum(p.get(key, {}).values()) for p in profiles) for key in ('resolved', 'unverified'))
+    if resolved:
+        lines.append(f"{resolved} LP(s) re-solved at tight tolerances, {unverified} still unverified")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='dea-br',
+        description="Evaluate DMU files with the Choquet cross-efficiency pipeline.",
+    )
+    parser.add_argument('spec', help="JSON variable spec with 'id', 'inputs' and 'outputs' columns")
+    parser.add_argument('inputs', nargs='+', help="input files or glob patterns (.csv, .parquet, .xlsx)")
+    parser.add_argument('-o', '--output-dir', required=True, help="directory for the reports")
+    parser.add_argument('--format', choices=FORMATS, default='parquet', help="report format")
+    parser.add_argument('--backend', choices=BACKENDS, default='pulp', help="LP backend")
+    parser.add_argument('--precision', choices=PRECISIONS, default='default',
+                        help="LP accuracy tier: looser tolerances ('fast') or checked and re-solved ('verified')")
+    parser.add_argument('--rho', type=float, default=0.5, help="weight balance parameter")
+    parser.add_argument('--principle', choices=PRINCIPLES, default='fairness', help="ethical principle")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="worker processes")
+    parser.add_argument('--cache-dir', help="reuse reports of unchanged files from this directory")
+    parser.add_argument('--profile', action='store_true',
+                        help="write profile.json with per-file, per-stage timings and print a summary")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        spec = load_spec(args.spec)
+        paths = expand_inputs(args.inputs)
+        profiles = run(paths, spec, args.output_dir, args.format,
+                       {'rho': args.rho, 'principle': args.principle, 'backend': args.backend,
+                        'precision': args.precision},
+                       args.workers, args.cache_dir)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    if args.profile:
+        with open(os.path.join(args.output_dir, 'profile.json'), 'w') as f:
+            json.dump(profiles, f, indent=2)
+        print(_summary(profiles), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def unique_rows(matrix: np.ndarray, decimals: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Distinct rows of a matrix in order of first occurrence.
+
+    Returns (index, inverse, counts): matrix[index] are the representatives,
+    matrix[index][inverse] reproduces matrix and counts[k] is the multiplicity of
+    representative k. With `decimals`, rows equal after rounding are merged.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    keyed = np.round(matrix, decimals) if decimals is not None else matrix
+    _, first, inverse, counts = np.unique(keyed, axis=0, return_index=True, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    # np.unique sorts lexicographically; renumber by first occurrence to keep input order
+    order = np.argsort(first, kind='stable')
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+    return first[order], position[inverse], counts[order]
+
+
+def unique_dmus(dmus: List, decimals: Optional[int] = None) -> Tuple[List, np.ndarray, np.ndarray]:
+    """
+    Collapse DMUs with identical (normalized) input/output vectors.
+
+    Returns (representatives, inverse, counts); the representatives are the first DMU
+    object of every group, so results written to them can be copied back with `inverse`.
+    """
+    if not dmus:
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    data = np.array([np.concatenate([d.inputs, d.outputs]) for d in dmus], dtype=float)
+    index, inverse, counts = unique_rows(data, decimals)
+    return [dmus[k] for k in index], inverse, counts
+
+
+def weighted_cross_efficiency(cross: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Cross-efficiency of every representative over the full population: the row means of
+    the distinct DMUs' cross-efficiency matrix, each column weighted by its multiplicity.
+    """
+    return np.asarray(cross, dtype=float) @ counts / counts.sum()
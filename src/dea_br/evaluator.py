@@ -1,12 +1,29 @@
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union, TYPE_CHECKING
 from .choquet import DMU, run_choquet_evaluation, normalize_data
+from .lp import SolveStats
+
+if TYPE_CHECKING:
+    import polars as pl
+
+def rank_categories(rank: np.ndarray) -> np.ndarray:
+    """Percentile-based category of each rank (1 = best) among len(rank) DMUs."""
+    percentile = rank / len(rank) * 100
+    return np.select(
+        [percentile <= 5, percentile <= 25, percentile <= 75, percentile <= 95],
+        ['Exceptional', 'Above Target', 'Meets Target', 'Below Target'],
+        default='Critical'
+    ).astype(object)
+
 
 class BoundedRationalityEvaluator:
     def __init__(
         self,
         rho: float = 0.5,
         ethical_principle: str = 'fairness',
+        backend: str = 'pulp',
+        precision: str = 'default',
+        stop_at_rank: bool = False,
         # Deprecated/Ignored params kept for compatibility
         theta_oo: float = 0.7,
         mu: float = 0.6,
@@ -20,10 +37,17 @@ class BoundedRationalityEvaluator:
         Args:
             rho: Weight balance parameter (0, 1].
             ethical_principle: 'fairness', 'utilitarianism', or 'equity'.
+            backend: LP backend of the pipeline, 'pulp' (CBC) or 'highs'.
+            precision: LP accuracy tier, 'default', 'fast' or 'verified' (see `lp.PRECISIONS`).
+            stop_at_rank: Stop the fairness search once ranks and categories are settled;
+                          satisfactions and scores are then bracket lower ends.
             theta_oo, mu, alpha, beta, lambda_: Ignored (Legacy params).
         """
         self.rho = rho
         self.ethical_principle = ethical_principle
+        self.backend = backend
+        self.precision = precision
+        self.stop_at_rank = stop_at_rank
         # Legacy
         self.theta_oo = theta_oo 
         
@@ -32,8 +56,11 @@ class BoundedRationalityEvaluator:
         dmu_ids: List[Any],
         inputs: np.ndarray,
         outputs: np.ndarray,
-        personal_objectives: Optional[Dict[Any, float]] = None
-    ) -> Dict[Any, Dict[str, Any]]:
+        personal_objectives: Optional[Dict[Any, float]] = None,
+        output: str = 'dict',
+        include_targets: bool = False,
+        stats: Optional[SolveStats] = None
+    ) -> Union[Dict[Any, Dict[str, Any]], Dict[str, np.ndarray], "pl.DataFrame"]:
         """
         Run the Choquet DEA evaluation pipeline.
         
@@ -43,10 +70,18 @@ class BoundedRationalityEvaluator:
             outputs: N x S array.
             personal_objectives: Ignored in this methodology (kept for API compat).
                                  Choquet methodology focuses on Satisfaction/Fairness.
+            output: 'dict' (one record per DMU, in rank order), 'columns' (dict of
+                    NumPy arrays in input order) or 'polars' (DataFrame in input order).
+            include_targets: For columnar output, also return the N x N 'E_max' and
+                             'E_min' target matrices.
+            stats: Accumulates LP counts and per-stage wall time of the run.
                                  
         Returns:
-            Dict mapping dmu_id to result dict.
+            Dict mapping dmu_id to result dict, or the columnar equivalent.
         """
+        if output not in ('dict', 'columns', 'polars'):
+            raise ValueError(f"Unknown output format '{output}'")
+
         # Validate data
         if len(dmu_ids) != inputs.shape[0] or len(dmu_ids) != outputs.shape[0]:
             raise ValueError("Size mismatch between DMU IDs and Data matrices")
@@ -67,48 +102,74 @@ class BoundedRationalityEvaluator:
         data_dmus = normalize_data(data_dmus)
         
         # 3. Run Pipeline
-        final_scores, E_max, E_min = run_choquet_evaluation(data_dmus, rho=self.rho)
-        
-        # 4. Prepare Results & Ranking
-        results = {}
-        
-        # Combine into list for sorting
-        ranked_list = []
-        for i, d_id in enumerate(dmu_ids):
-            rec = {
-                'id': d_id,
-                'ccr_efficiency': float(data_dmus[i].efficiency_ccr if data_dmus[i].efficiency_ccr else 0.0),
-                'cross_efficiency': float(final_scores[i]),
-                'composite_score': float(final_scores[i]), 
-                'satisfaction': float(data_dmus[i].satisfaction if data_dmus[i].satisfaction else 0.0),
-                'theta_co': 0.0 # Legacy field
-            }
-            ranked_list.append(rec)
-            
-        # Sort descending by score
-        ranked_list.sort(key=lambda x: x['cross_efficiency'], reverse=True)
+        final_scores, E_max, E_min = run_choquet_evaluation(data_dmus, rho=self.rho, backend=self.backend, stats=stats,
+                                                        principle=self.ethical_principle, precision=self.precision,
+                                                        stop_at_rank=self.stop_at_rank)
         
-        # Assign Ranks and Categories
-        n = len(ranked_list)
-        for rank, item in enumerate(ranked_list, 1):
-            item['rank'] = rank
-            
-            # Percentile-based categorization
-            percentile = (rank / n) * 100
-            if percentile <= 5:
-                category = 'Exceptional'
-            elif percentile <= 25:
-                category = 'Above Target'
-            elif percentile <= 75:
-                category = 'Meets Target'
-            elif percentile <= 95:
-                category = 'Below Target'
-            else:
-                category = 'Critical'
-                
-            item['category'] = category
-            
-            # Store in result dict
-            results[item['id']] = item
-            
-        return results
+        # 4. Ranking & Categories, vectorized
+        columns = self._rank_columns(dmu_ids, data_dmus, final_scores)
+
+        if output == 'dict':
+            results = {}
+            for i in np.argsort(columns['rank'], kind='stable'):
+                results[dmu_ids[i]] = {
+                    'id': dmu_ids[i],
+                    'ccr_efficiency': float(columns['ccr_efficiency'][i]),
+                    'cross_efficiency': float(columns['cross_efficiency'][i]),
+                    'composite_score': float(columns['composite_score'][i]),
+                    'satisfaction': float(columns['satisfaction'][i]),
+                    'theta_co': 0.0, # Legacy field
+                    'rank': int(columns['rank'][i]),
+                    'category': columns['category'][i],
+                }
+            return results
+
+        if include_targets:
+            columns['E_max'] = E_max
+            columns['E_min'] = E_min
+        if output == 'polars':
+            import polars as pl
+            columns['id'] = list(dmu_ids)
+            return pl.DataFrame(columns)
+        return columns
+
+    def iter_records(self, dmu_ids: List[Any], inputs: np.ndarray, outputs: np.ndarray,
+                     stats: Optional[SolveStats] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming counterpart of `evaluate`: one record per DMU in input order, yielded
+        as soon as it is final, without rank and category (see `stream.iter_records`).
+        """
+        from .stream import iter_records
+
+        return iter_records(dmu_ids, inputs, outputs, rho=self.rho, backend=self.backend, stats=stats,
+                            principle=self.ethical_principle, precision=self.precision)
+
+    def write_records(self, dmu_ids: List[Any], inputs: np.ndarray, outputs: np.ndarray, path: str,
+                      fmt: str = 'parquet', batch_size: int = 1024, stats: Optional[SolveStats] = None) -> int:
+        """Write `iter_records` to a Parquet or Arrow IPC file in batches; returns the row count."""
+        from .stream import write_records
+
+        return write_records(self.iter_records(dmu_ids, inputs, outputs, stats), path, fmt, batch_size)
+
+    @staticmethod
+    def _rank_columns(dmu_ids: List[Any], data_dmus: List[DMU], final_scores: np.ndarray) -> Dict[str, np.ndarray]:
+        n = len(dmu_ids)
+        scores = np.asarray(final_scores, dtype=float)
+
+        # Descending by score; the stable sort keeps ties in input order like list.sort
+        order = np.argsort(-scores, kind='stable')
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(1, n + 1)
+
+        category = rank_categories(rank)
+
+        return {
+            'id': np.asarray(dmu_ids, dtype=object),
+            'ccr_efficiency': np.array([d.efficiency_ccr if d.efficiency_ccr else 0.0 for d in data_dmus], dtype=float),
+            'cross_efficiency': scores,
+            'composite_score': scores.copy(),
+            'satisfaction': np.array([d.satisfaction if d.satisfaction else 0.0 for d in data_dmus], dtype=float),
+            'theta_co': np.zeros(n),  # Legacy field
+            'rank': rank,
+            'category': category,
+        }
@@ -0,0 +1,236 @@
+
+import os
+import numpy as np
+import polars as pl
+from scipy import sparse
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .lp import OPTIMAL, LinearProgram, LPResult, solve_lp
+
+_SENSE_LE, _SENSE_EQ, _SENSE_GE = -1, 0, 1
+
+
+class LPBatch:
+    """
+    A compact record of every LP of a run, for offline solving and solver benchmarks.
+
+    Constraint rows are pooled: each distinct row (e.g. a frontier row shared by every
+    LP of the run) is kept once, and an LP is its list of pooled row indices plus its
+    own objective, right-hand sides and bounds. `save` writes the pool as one CSR matrix
+    with the per-LP arrays concatenated behind offset pointers in a single npz archive;
+    `load` reads it back and `replay` re-solves it.
+
+    Pass an instance as `recorder` to `choquet.run_choquet_evaluation` (highs backend) or
+    to `ChoquetDEASolver` to fill it.
+    """
+
+    def __init__(self):
+        self._row_ids: Dict[Tuple[bytes, bytes], int] = {}
+        self._rows: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._lps: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._lps)
+
+    @property
+    def n_pool_rows(self) -> int:
+        return len(self._rows)
+
+    def _pool(self, A: sparse.csr_matrix) -> np.ndarray:
+        A = sparse.csr_matrix(A)
+        A.sort_indices()
+        ids = np.empty(A.shape[0], dtype=np.int64)
+        for r in range(A.shape[0]):
+            lo, hi = A.indptr[r], A.indptr[r + 1]
+            indices, data = A.indices[lo:hi].astype(np.int64), A.data[lo:hi].astype(float)
+            key = (indices.tobytes(), data.tobytes())
+            row_id = self._row_ids.get(key)
+            if row_id is None:
+                row_id = len(self._rows)
+                self._row_ids[key] = row_id
+                self._rows.append((indices, data))
+            ids[r] = row_id
+        return ids
+
+    def add(self, lp: LinearProgram, stage: str = "lp", objective: float = np.nan):
+        """Record an LP, with the objective value it was solved to if known."""
+        self._lps.append({
+            'ub': self._pool(lp.A_ub), 'eq': self._pool(lp.A_eq),
+            'b_ub': np.asarray(lp.b_ub, dtype=float), 'b_eq': np.asarray(lp.b_eq, dtype=float),
+            'c': np.asarray(lp.c, dtype=float), 'bounds': np.asarray(lp.bounds, dtype=float),
+            'maximize': bool(lp.maximize), 'objective': float(objective),
+            'stage': stage, 'name': lp.name,
+        })
+
+    def record(self, lp: LinearProgram, result: LPResult, stage: str = "lp"):
+        self.add(lp, stage, result.objective if result.status == OPTIMAL else np.nan)
+
+    def _matrix(self, ids: np.ndarray, n_vars: int) -> sparse.csr_matrix:
+        lengths = [len(self._rows[r][0]) for r in ids]
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        indices = np.concatenate([self._rows[r][0] for r in ids]) if len(ids) else np.zeros(0, dtype=np.int64)
+        data = np.concatenate([self._rows[r][1] for r in ids]) if len(ids) else np.zeros(0)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(ids), n_vars))
+
+    def program(self, k: int) -> LinearProgram:
+        entry = self._lps[k]
+        n_vars = len(entry['c'])
+        return LinearProgram(
+            c=entry['c'], A_ub=self._matrix(entry['ub'], n_vars), b_ub=entry['b_ub'],
+            A_eq=self._matrix(entry['eq'], n_vars), b_eq=entry['b_eq'],
+            bounds=entry['bounds'], maximize=entry['maximize'], name=entry['name'],
+        )
+
+    def __iter__(self) -> Iterator[Tuple[LinearProgram, str, float]]:
+        for k, entry in enumerate(self._lps):
+            yield self.program(k), entry['stage'], entry['objective']
+
+    def save(self, path: str, mps_dir: Optional[str] = None):
+        """
+        Write the batch to an npz archive; with `mps_dir`, also one MPS file per LP
+        (through PuLP, so any MPS-reading solver can replay them).
+        """
+        width = max((len(e['c']) for e in self._lps), default=0)
+        pool = self._matrix(np.arange(len(self._rows)), width)
+
+        def concat(key, dtype=float):
+            parts = [np.asarray(e[key], dtype=dtype).reshape(-1) for e in self._lps]
+            pointer = np.concatenate([[0], np.cumsum([len(p) for p in parts])]).astype(np.int64)
+            return (np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)), pointer
+
+        arrays = {}
+        for key, dtype in (('ub', np.int64), ('eq', np.int64), ('b_ub', float), ('b_eq', float), ('c', float)):
+            arrays[key], arrays[f'{key}_ptr'] = concat(key, dtype)
+        arrays['bounds'] = np.vstack([e['bounds'] for e in self._lps]) if self._lps else np.zeros((0, 2))
+        np.savez_compressed(
+            path,
+            pool_data=pool.data, pool_indices=pool.indices, pool_indptr=pool.indptr,
+            pool_shape=np.asarray(pool.shape, dtype=np.int64),
+            maximize=np.array([e['maximize'] for e in self._lps], dtype=bool),
+            objective=np.array([e['objective'] for e in self._lps], dtype=float),
+            stage=np.array([e['stage'] for e in self._lps], dtype=str),
+            name=np.array([e['name'] for e in self._lps], dtype=str),
+            **arrays,
+        )
+        if mps_dir is not None:
+            os.makedirs(mps_dir, exist_ok=True)
+            for k, (lp, stage, _) in enumerate(self):
+                to_pulp(lp).writeMPS(os.path.join(mps_dir, f"lp_{k:06d}_{stage}.mps"))
+
+    @classmethod
+    def load(cls, path: str) -> "LPBatch":
+        batch = cls()
+        with np.load(path) as f:
+            pool = sparse.csr_matrix((f['pool_data'], f['pool_indices'], f['pool_indptr']),
+                                     shape=tuple(f['pool_shape']))
+            for r in range(pool.shape[0]):
+                lo, hi = pool.indptr[r], pool.indptr[r + 1]
+                batch._rows.append((pool.indices[lo:hi].astype(np.int64), pool.data[lo:hi]))
+            n_vars = np.diff(f['c_ptr'])
+            bounds_ptr = np.concatenate([[0], np.cumsum(n_vars)])
+            for k in range(len(f['maximize'])):
+                part = {key: f[key][f[f'{key}_ptr'][k]:f[f'{key}_ptr'][k + 1]] for key in ('ub', 'eq', 'b_ub', 'b_eq', 'c')}
+                batch._lps.append({
+                    **part,
+                    'bounds': f['bounds'][bounds_ptr[k]:bounds_ptr[k + 1]],
+                    'maximize': bool(f['maximize'][k]), 'objective': float(f['objective'][k]),
+                    'stage': str(f['stage'][k]), 'name': str(f['name'][k]),
+                })
+        return batch
+
+
+def to_pulp(lp: LinearProgram):
+    """Build the equivalent PuLP problem (variables x_0..x_{n-1})."""
+    import pulp
+
+    prob = pulp.LpProblem(lp.name or "lp", pulp.LpMaximize if lp.maximize else pulp.LpMinimize)
+    x = [pulp.LpVariable(f"x_{i}",
+                         lowBound=None if np.isinf(lo) else float(lo),
+                         upBound=None if np.isinf(hi) else float(hi))
+         for i, (lo, hi) in enumerate(lp.bounds)]
+    prob += pulp.lpSum(float(c) * x[i] for i, c in enumerate(lp.c) if c != 0)
+    for A, b, sense, label in ((lp.A_ub, lp.b_ub, _SENSE_LE, "ub"), (lp.A_eq, lp.b_eq, _SENSE_EQ, "eq")):
+        for r in range(A.shape[0]):
+            lo, hi = A.indptr[r], A.indptr[r + 1]
+            expr = pulp.lpSum(float(v) * x[i] for i, v in zip(A.indices[lo:hi], A.data[lo:hi]))
+            prob += pulp.LpConstraint(expr, sense=sense, rhs=float(b[r]), name=f"{label}_{r}")
+    return prob
+
+
+def from_pulp(prob) -> LinearProgram:
+    """
+    Matrix form of a PuLP problem, e.g. one of `ChoquetDEASolver.build_self_evaluation`.
+    Variables are ordered as in `prob.variables()`; constant terms of the objective are dropped.
+    """
+    import pulp
+
+    variables = prob.variables()
+    position = {v.name: i for i, v in enumerate(variables)}
+    n = len(variables)
+
+    c = np.zeros(n)
+    for var, coef in prob.objective.items():
+        c[position[var.name]] = coef
+
+    rows = {'ub': ([], [], [], []), 'eq': ([], [], [], [])}
+    for constraint in prob.constraints.values():
+        kind = 'eq' if constraint.sense == _SENSE_EQ else 'ub'
+        sign = -1.0 if constraint.sense == _SENSE_GE else 1.0
+        r_idx, c_idx, vals, rhs = rows[kind]
+        r = len(rhs)
+        for var, coef in constraint.items():
+            r_idx.append(r)
+            c_idx.append(position[var.name])
+            vals.append(sign * coef)
+        rhs.append(-sign * constraint.constant)
+
+    def matrix(kind):
+        r_idx, c_idx, vals, rhs = rows[kind]
+        return sparse.csr_matrix((vals, (r_idx, c_idx)), shape=(len(rhs), n)), np.asarray(rhs, dtype=float)
+
+    A_ub, b_ub = matrix('ub')
+    A_eq, b_eq = matrix('eq')
+    bounds = np.array([[-np.inf if v.lowBound is None else v.lowBound,
+                        np.inf if v.upBound is None else v.upBound] for v in variables], dtype=float).reshape(n, 2)
+    return LinearProgram(c, A_ub, b_ub, A_eq, b_eq, bounds, maximize=prob.sense == pulp.LpMaximize, name=prob.name)
+
+
+def _solve_pulp(lp: LinearProgram) -> LPResult:
+    import pulp
+
+    prob = to_pulp(lp)
+    prob.solve(pulp.PULP_CBC_CMD(msg=0))
+    if prob.status != 1:
+        return LPResult(prob.status)
+    return LPResult(OPTIMAL, float(pulp.value(prob.objective) or 0.0))
+
+
+def replay(batch, backend: str = 'highs', tol: float = 1e-6) -> pl.DataFrame:
+    """
+    Re-solve a recorded batch (an `LPBatch` or the path of a saved one) and compare
+    objectives with the recorded ones.
+
+    Returns one row per LP: index, stage, name, recorded, replayed, status, abs_diff,
+    match (recorded and replayed agree within `tol`, or both are missing) and seconds.
+    """
+    if backend not in ('highs', 'pulp'):
+        raise ValueError(f"Unknown backend '{backend}', expected 'highs' or 'pulp'")
+    if isinstance(batch, (str, os.PathLike)):
+        batch = LPBatch.load(batch)
+
+    records = []
+    for k, (lp, stage, recorded) in enumerate(batch):
+        start = perf_counter()
+        result = solve_lp(lp) if backend == 'highs' else _solve_pulp(lp)
+        seconds = perf_counter() - start
+        replayed = result.objective if result.status == OPTIMAL else np.nan
+        diff = abs(replayed - recorded)
+        records.append({
+            'index': k, 'stage': stage, 'name': lp.name,
+            'recorded': recorded, 'replayed': replayed, 'status': result.status,
+            'abs_diff': diff,
+            'match': bool(diff <= tol or (np.isnan(recorded) and np.isnan(replayed))),
+            'seconds': seconds,
+        })
+    return pl.DataFrame(records)
@@ -0,0 +1,114 @@
+
+import numpy as np
+from scipy import sparse
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Coalition = Tuple[int, ...]
+
+
+def interaction_coalitions(size: int, k: int) -> List[Coalition]:
+    """
+    Coalitions of 2..k criteria carrying a Möbius interaction weight, by size and then
+    lexicographically. For k=2 this is the pair order of `storage.pack_upper`.
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+    return [S for order in range(2, min(k, size) + 1) for S in combinations(range(size), order)]
+
+
+def mobius_features(values: np.ndarray, k: int = 2, coalitions: Optional[Sequence[Coalition]] = None,
+                    prune: bool = True, tol: float = 1e-12) -> Tuple[sparse.csr_matrix, List[Coalition]]:
+    """
+    k-additive Möbius features of each row: [x_1..x_m, min_{t in S} x_t for every coalition S].
+
+    Minima are built incrementally (min over S from the min over S without its last
+    member), so every column costs one vectorized np.minimum. With prune=True the
+    coalitions whose minimum does not vary across rows are not materialized, i.e.
+    their Möbius weight is fixed at zero; singletons are always kept.
+
+    Returns the features as a CSR matrix (zero minima are common in sales data) and
+    the coalitions that were kept, in column order.
+    """
+    values = np.asarray(values, dtype=float)
+    if coalitions is None:
+        coalitions = interaction_coalitions(values.shape[1], k)
+
+    minima: Dict[Coalition, np.ndarray] = {(t,): values[:, t] for t in range(values.shape[1])}
+    columns = [values]
+    kept = []
+    for S in coalitions:
+        prefix = S[:-1]
+        if prefix not in minima:
+            minima[prefix] = values[:, list(prefix)].min(axis=1)
+        column = np.minimum(minima[prefix], values[:, S[-1]])
+        minima[S] = column
+        if prune and np.ptp(column) <= tol:
+            continue
+        columns.append(column[:, None])
+        kept.append(S)
+    return sparse.csr_matrix(np.hstack(columns)), kept
+
+
+def shapley_matrix(size: int, coalitions: Sequence[Coalition]) -> sparse.csr_matrix:
+    """
+    Rows give the Shapley importance of each criterion in Möbius terms,
+    phi_t = v_t + sum over coalitions S containing t of v_S / |S|.
+    For pairs this is the I_t = v_t + 0.5 * sum of interactions of the 2-additive model.
+    """
+    rows, cols, vals = list(range(size)), list(range(size)), [1.0] * size
+    for c, S in enumerate(coalitions):
+        for t in S:
+            rows.append(t)
+            cols.append(size + c)
+            vals.append(1.0 / len(S))
+    return sparse.csr_matrix((vals, (rows, cols)), shape=(size, size + len(coalitions)))
+
+
+def monotonicity_rows(size: int, coalitions: Sequence[Coalition]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """
+    Sparse monotonicity constraints over [v_1..v_m, v_S...] and auxiliary variables n_S >= 0.
+
+    Monotonicity of a capacity requires every marginal contribution of criterion t to be
+    non-negative: v_t + sum over S containing t, S within T + {t}, of v_S >= 0 for all T.
+    The smallest such sum takes every negative v_S, so
+
+        v_t - sum over S containing t of n_S >= 0,   n_S >= -v_S,   n_S >= 0
+
+    is sufficient. It is exact for 2-additive capacities (each pair can be picked
+    independently) and conservative for k >= 3. Only m + |coalitions| rows are needed,
+    with one non-zero per (criterion, coalition) membership, instead of one row per subset.
+
+    Returns (A_weights, A_aux) such that A_weights @ w + A_aux @ n <= 0.
+    """
+    K = len(coalitions)
+    w_rows, w_cols, w_vals = [], [], []
+    a_rows, a_cols, a_vals = [], [], []
+    # -v_t + sum of n_S over S containing t <= 0
+    w_rows.extend(range(size))
+    w_cols.extend(range(size))
+    w_vals.extend([-1.0] * size)
+    for c, S in enumerate(coalitions):
+        a_rows.extend(S)
+        a_cols.extend([c] * len(S))
+        a_vals.extend([1.0] * len(S))
+        # -v_S - n_S <= 0
+        w_rows.append(size + c)
+        w_cols.append(size + c)
+        w_vals.append(-1.0)
+        a_rows.append(size + c)
+        a_cols.append(c)
+        a_vals.append(-1.0)
+    A_weights = sparse.csr_matrix((w_vals, (w_rows, w_cols)), shape=(size + K, size + K))
+    A_aux = sparse.csr_matrix((a_vals, (a_rows, a_cols)), shape=(size + K, K))
+    return A_weights, A_aux
+
+
+def capacity(weights: np.ndarray, size: int, coalitions: Sequence[Coalition], subset: Sequence[int]) -> float:
+    """Capacity of `subset` from Möbius weights [v_1..v_m, v_S...]: sum of v_B over B within subset."""
+    members = set(subset)
+    total = sum(weights[t] for t in members)
+    for c, S in enumerate(coalitions):
+        if members.issuperset(S):
+            total += weights[size + c]
+    return float(total)
@@ -0,0 +1,558 @@
+
+import hashlib
+import numpy as np
+from time import perf_counter
+from scipy import sparse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Any
+
+from .storage import n_pairs
+from .kadditive import interaction_coalitions, mobius_features, monotonicity_rows, shapley_matrix
+
+# LP status codes, aligned with PuLP's (1 = optimal) so both backends read the same.
+OPTIMAL = 1
+NOT_SOLVED = 0
+INFEASIBLE = -1
+UNBOUNDED = -2
+FAILED = -3
+
+_HIGHS_STATUS = {0: OPTIMAL, 1: FAILED, 2: INFEASIBLE, 3: UNBOUNDED, 4: FAILED}
+
+# Accuracy tiers. 'fast' loosens the solver tolerances for throughput; 'verified' solves
+# at the defaults, checks every optimal solution (see `check_solution`) and re-solves
+# the LPs that fail the check, or that ended in a solver failure, at tight tolerances.
+PRECISIONS = ('default', 'fast', 'verified')
+VERIFY_TOL = 1e-6
+
+_HIGHS_OPTIONS = {
+    'default': {},
+    'fast': {'presolve': True, 'primal_feasibility_tolerance': 1e-5, 'dual_feasibility_tolerance': 1e-5},
+    'verified': {},
+}
+_HIGHS_TIGHT = {'presolve': False, 'primal_feasibility_tolerance': 1e-10, 'dual_feasibility_tolerance': 1e-10}
+
+
+@dataclass
+class LinearProgram:
+    """
+    An LP in matrix form: optimize c @ x  s.t.  A_ub x <= b_ub,  A_eq x == b_eq,
+    bounds[:, 0] <= x <= bounds[:, 1] (use +-inf for free variables).
+    """
+    c: np.ndarray
+    A_ub: sparse.csr_matrix
+    b_ub: np.ndarray
+    A_eq: sparse.csr_matrix
+    b_eq: np.ndarray
+    bounds: np.ndarray
+    maximize: bool = False
+    name: str = ""
+
+
+@dataclass
+class LPResult:
+    status: int
+    objective: float = 0.0
+    x: Optional[np.ndarray] = None
+    duals: Optional[np.ndarray] = None    # shadow prices of the A_ub rows, d objective / d b_ub
+
+    @property
+    def optimal(self) -> bool:
+        return self.status == OPTIMAL
+
+
+@dataclass
+class SolveStats:
+    """
+    LP counters for one run, keyed by pipeline stage ('self', 'targets', 'satisfaction', ...).
+
+    `failed` counts LPs that did not finish optimal; for feasibility checks
+    (the 'satisfaction' stage) infeasible is an expected answer. `seconds` holds the
+    wall time charged to each stage with `tick`. In verified precision, `resolved`
+    counts the LPs solved a second time at tight tolerances and `unverified` those
+    whose solution still failed the checks afterwards.
+    """
+    solved: Dict[str, int] = field(default_factory=dict)
+    avoided: Dict[str, int] = field(default_factory=dict)
+    failed: Dict[str, int] = field(default_factory=dict)
+    resolved: Dict[str, int] = field(default_factory=dict)
+    unverified: Dict[str, int] = field(default_factory=dict)
+    seconds: Dict[str, float] = field(default_factory=dict)
+    _clock: Optional[float] = field(default=None, repr=False, compare=False)
+
+    def tick(self, stage: Optional[str] = None):
+        """Charge the time since the previous tick to `stage`; without a stage, just restart the clock."""
+        now = perf_counter()
+        if stage is not None and self._clock is not None:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + now - self._clock
+        self._clock = now
+
+    def record(self, stage: str, status: int = OPTIMAL, n: int = 1):
+        self.solved[stage] = self.solved.get(stage, 0) + n
+        if status != OPTIMAL:
+            self.failed[stage] = self.failed.get(stage, 0) + n
+
+    def avoid(self, stage: str, n: int = 1):
+        self.avoided[stage] = self.avoided.get(stage, 0) + n
+
+    def resolve(self, stage: str, verified: bool = True):
+        self.resolved[stage] = self.resolved.get(stage, 0) + 1
+        if not verified:
+            self.unverified[stage] = self.unverified.get(stage, 0) + 1
+
+    @property
+    def total_solved(self) -> int:
+        return sum(self.solved.values())
+
+    @property
+    def total_avoided(self) -> int:
+        return sum(self.avoided.values())
+
+    def avoided_fraction(self, stage: str) -> float:
+        """Share of the stage's LPs that were answered without solving."""
+        total = self.solved.get(stage, 0) + self.avoided.get(stage, 0)
+        return self.avoided.get(stage, 0) / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"solved": dict(self.solved), "avoided": dict(self.avoided), "failed": dict(self.failed),
+                "resolved": dict(self.resolved), "unverified": dict(self.unverified), "seconds": dict(self.seconds)}
+
+
+def _finite_sum(values: np.ndarray, weights: np.ndarray) -> float:
+    # Infinite bounds carry no multiplier
+    finite = np.isfinite(values)
+    return float(values[finite] @ weights[finite])
+
+
+def check_solution(lp: LinearProgram, res) -> Tuple[float, float]:
+    """
+    Accuracy of a HiGHS solution of `lp`: the largest primal residual (row or bound
+    violation, which covers the frontier rows built from the Choquet feature matrices)
+    and the duality gap between the objective and the dual objective of the row and
+    bound multipliers, relative to 1 + |objective|.
+    """
+    x = res.x
+    residual = 0.0
+    if lp.A_ub.shape[0]:
+        residual = max(residual, float(np.max(lp.A_ub @ x - lp.b_ub)))
+    if lp.A_eq.shape[0]:
+        residual = max(residual, float(np.max(np.abs(lp.A_eq @ x - lp.b_eq))))
+    residual = max(residual, float(np.max(lp.bounds[:, 0] - x)), float(np.max(x - lp.bounds[:, 1])))
+
+    dual = _finite_sum(lp.bounds[:, 0], res.lower.marginals) + _finite_sum(lp.bounds[:, 1], res.upper.marginals)
+    if lp.A_ub.shape[0]:
+        dual += float(lp.b_ub @ res.ineqlin.marginals)
+    if lp.A_eq.shape[0]:
+        dual += float(lp.b_eq @ res.eqlin.marginals)
+    return residual, abs(res.fun - dual) / (1.0 + abs(res.fun))
+
+
+def _linprog(lp: LinearProgram, options: Dict[str, Any]):
+    from scipy.optimize import linprog
+
+    return linprog(
+        -lp.c if lp.maximize else lp.c,
+        A_ub=lp.A_ub if lp.A_ub.shape[0] else None,
+        b_ub=lp.b_ub if lp.A_ub.shape[0] else None,
+        A_eq=lp.A_eq if lp.A_eq.shape[0] else None,
+        b_eq=lp.b_eq if lp.A_eq.shape[0] else None,
+        bounds=lp.bounds,
+        method="highs",
+        options=options,
+    )
+
+
+def _verified(lp: LinearProgram, res) -> bool:
+    return max(check_solution(lp, res)) <= VERIFY_TOL
+
+
+def solve_lp(lp: LinearProgram, stats: Optional[SolveStats] = None, stage: str = "lp",
+             precision: str = "default") -> LPResult:
+    """
+    Solve a `LinearProgram` with HiGHS through scipy, at one of the `PRECISIONS`.
+
+    In 'verified' precision an optimal solution that fails `check_solution` by more than
+    `VERIFY_TOL`, or a solver failure, is solved again at tight tolerances without
+    presolve; infeasible and unbounded answers are kept. Re-solves and solutions that
+    still fail the checks are counted in `stats`.
+    """
+    res = _linprog(lp, _HIGHS_OPTIONS[precision])
+    status = _HIGHS_STATUS.get(res.status, FAILED)
+    if precision == "verified" and (status == FAILED or (status == OPTIMAL and not _verified(lp, res))):
+        tight = _linprog(lp, _HIGHS_TIGHT)
+        tight_status = _HIGHS_STATUS.get(tight.status, FAILED)
+        verified = tight_status == OPTIMAL and _verified(lp, tight)
+        # An optimal answer is not traded for a non-optimal re-solve; it stays, counted as unverified
+        if tight_status == OPTIMAL or status != OPTIMAL:
+            res, status = tight, tight_status
+            verified = verified or status in (INFEASIBLE, UNBOUNDED)
+        if stats is not None:
+            stats.resolve(stage, verified)
+    if stats is not None:
+        stats.record(stage, status)
+    if status != OPTIMAL:
+        return LPResult(status)
+    objective = -res.fun if lp.maximize else res.fun
+    duals = None
+    if lp.A_ub.shape[0]:
+        duals = -res.ineqlin.marginals if lp.maximize else res.ineqlin.marginals
+    return LPResult(status, float(objective), res.x, duals)
+
+
+class LPCache:
+    """
+    LP results of a run keyed by a hash of the whole instance (objective, constraint
+    matrices, right-hand sides, bounds and sense). Repeated instances, e.g. a fairness
+    check without any rated DMU left to constrain, are answered from the cache and
+    counted as avoided.
+    """
+
+    def __init__(self):
+        self._results: Dict[bytes, LPResult] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def fingerprint(lp: LinearProgram) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(b"max" if lp.maximize else b"min")
+        for A in (lp.A_ub, lp.A_eq):
+            h.update(np.asarray(A.shape, dtype=np.int64).tobytes())
+            for part in (A.indptr, A.indices, A.data):
+                h.update(np.ascontiguousarray(part).tobytes())
+        for vector in (lp.c, lp.b_ub, lp.b_eq, lp.bounds):
+            h.update(np.ascontiguousarray(vector, dtype=float).tobytes())
+        return h.digest()
+
+    def solve(self, lp: LinearProgram, stats: Optional[SolveStats] = None, stage: str = "lp",
+              precision: str = "default") -> LPResult:
+        key = self.fingerprint(lp)
+        result = self._results.get(key)
+        if result is not None:
+            if stats is not None:
+                stats.avoid(stage)
+            return result
+        result = solve_lp(lp, stats, stage, precision)
+        self._results[key] = result
+        return result
+
+
+def choquet_features(values: np.ndarray) -> np.ndarray:
+    """
+    2-additive Möbius features of each row: [x_1..x_k, min(x_t, x_p) for t < p].
+    The pair order matches `storage.pack_upper`.
+    """
+    values = np.asarray(values, dtype=float)
+    t, p = np.triu_indices(values.shape[1], 1)
+    return np.hstack([values, np.minimum(values[:, t], values[:, p])])
+
+
+def importance_matrix(size: int) -> np.ndarray:
+    """Rows give the global importance I_t = v_t + 0.5 * sum of interactions involving t."""
+    G = np.zeros((size, size + n_pairs(size)))
+    G[:, :size] = np.eye(size)
+    for k, (t, p) in enumerate(zip(*np.triu_indices(size, 1))):
+        G[t, size + k] = 0.5
+        G[p, size + k] = 0.5
+    return G
+
+
+class ChoquetLP:
+    """
+    Constraint templates for the 2-CHCCR family (Models 11-13) over a fixed DMU set.
+
+    Variables are laid out as x = [v, v_int | u, u_int | z_I, z_O]; the global importance
+    variables of the PuLP formulation are substituted out. The frontier block
+    (cy_j - cx_j <= 0 for every DMU) is built once and shared by every LP of a run;
+    only the objective, the equality rows and the rho-dependent importance rows change.
+
+    k > 2 uses k-additive capacities: v_int / u_int then hold one Möbius weight per
+    coalition of 2..k criteria whose minimum varies across DMUs (see
+    `kadditive.mobius_features`; the kept coalitions are in `input_coalitions` and
+    `output_coalitions`), and the importances are the Shapley values. With monotone=True
+    the sparse monotonicity rows of `kadditive.monotonicity_rows` are added, with their
+    auxiliary variables appended after z_O.
+    """
+
+    def __init__(self, inputs: np.ndarray, outputs: np.ndarray,
+                 input_features: Optional[np.ndarray] = None, output_features: Optional[np.ndarray] = None,
+                 k: int = 2, monotone: bool = False):
+        self.k = k
+        self.monotone = monotone
+        self.n_inputs = np.shape(inputs)[1]
+        self.n_outputs = np.shape(outputs)[1]
+        # Precomputed feature matrices may be passed in when only one side of the data changes
+        if k == 2:
+            self.input_coalitions = interaction_coalitions(self.n_inputs, 2)
+            self.output_coalitions = interaction_coalitions(self.n_outputs, 2)
+            self.Fx = choquet_features(inputs) if input_features is None else input_features
+            self.Fy = choquet_features(outputs) if output_features is None else output_features
+        else:
+            if input_features is not None or output_features is not None:
+                raise ValueError("Precomputed features are only supported for k=2")
+            Fx, self.input_coalitions = mobius_features(inputs, k)
+            Fy, self.output_coalitions = mobius_features(outputs, k)
+            self.Fx, self.Fy = Fx.toarray(), Fy.toarray()
+        self.n_dmus = self.Fx.shape[0]
+
+        self.k_in = self.Fx.shape[1]
+        self.k_out = self.Fy.shape[1]
+        self.in_slice = slice(0, self.k_in)
+        self.out_slice = slice(self.k_in, self.k_in + self.k_out)
+        self.z_in = self.k_in + self.k_out
+        self.z_out = self.z_in + 1
+        n_aux = (self.k_in - self.n_inputs) + (self.k_out - self.n_outputs) if monotone else 0
+        self.n_vars = self.z_out + 1 + n_aux
+
+        self.frontier = sparse.csr_matrix(
+            np.hstack([-self.Fx, self.Fy, np.zeros((self.n_dmus, self.n_vars - self.z_in))])
+        )
+
+        lb = np.zeros(self.n_vars)
+        ub = np.full(self.n_vars, np.inf)
+        for start, size, width in ((0, self.n_inputs, self.k_in), (self.k_in, self.n_outputs, self.k_out)):
+            inter = slice(start + size, start + width)
+            lb[inter] = -1.0
+            ub[inter] = 1.0
+        ub[[self.z_in, self.z_out]] = 1.0
+        self.bounds = np.column_stack([lb, ub])
+
+        self._G_in = shapley_matrix(self.n_inputs, self.input_coalitions).toarray()
+        self._G_out = shapley_matrix(self.n_outputs, self.output_coalitions).toarray()
+        self._importance_cache: Dict[float, sparse.csr_matrix] = {}
+        self.monotonicity = self._monotonicity_block() if monotone else None
+
+    def _monotonicity_block(self) -> sparse.csr_matrix:
+        blocks = []
+        aux_start = self.z_out + 1
+        for start, size, coalitions in ((0, self.n_inputs, self.input_coalitions),
+                                        (self.k_in, self.n_outputs, self.output_coalitions)):
+            A_w, A_n = monotonicity_rows(size, coalitions)
+            K = len(coalitions)
+            blocks.append(sparse.hstack([
+                sparse.csr_matrix((A_w.shape[0], start)), A_w,
+                sparse.csr_matrix((A_w.shape[0], aux_start - start - A_w.shape[1])), A_n,
+                sparse.csr_matrix((A_w.shape[0], self.n_vars - aux_start - K)),
+            ], format="csr"))
+            aux_start += K
+        return sparse.vstack(blocks, format="csr")
+
+    @classmethod
+    def from_dmus(cls, dmus: List, k: int = 2, monotone: bool = False) -> "ChoquetLP":
+        return cls(np.array([d.inputs for d in dmus]), np.array([d.outputs for d in dmus]), k=k, monotone=monotone)
+
+    def importance_rows(self, rho: float) -> sparse.csr_matrix:
+        """rho*z - I <= 0 and I - z <= 0 for every input and output (right-hand side is zero)."""
+        A = self._importance_cache.get(rho)
+        if A is None:
+            m, s = self.n_inputs, self.n_outputs
+            dense = np.zeros((2 * (m + s), self.n_vars))
+            dense[:m, self.in_slice] = -self._G_in
+            dense[:m, self.z_in] = rho
+            dense[m:2 * m, self.in_slice] = self._G_in
+            dense[m:2 * m, self.z_in] = -1.0
+            dense[2 * m:2 * m + s, self.out_slice] = -self._G_out
+            dense[2 * m:2 * m + s, self.z_out] = rho
+            dense[2 * m + s:, self.out_slice] = self._G_out
+            dense[2 * m + s:, self.z_out] = -1.0
+            A = sparse.csr_matrix(dense)
+            self._importance_cache[rho] = A
+        return A
+
+    def input_row(self, j: int) -> np.ndarray:
+        """cx_j as a row over the variable vector."""
+        row = np.zeros(self.n_vars)
+        row[self.in_slice] = self.Fx[j]
+        return row
+
+    def output_row(self, j: int) -> np.ndarray:
+        """cy_j as a row over the variable vector."""
+        row = np.zeros(self.n_vars)
+        row[self.out_slice] = self.Fy[j]
+        return row
+
+    def _program(self, c, eq_rows, b_eq, rho, extra_ub=None, maximize=True, name=""):
+        blocks = [self.frontier, self.importance_rows(rho)]
+        if self.monotonicity is not None:
+            blocks.append(self.monotonicity)
+        if extra_ub is not None and extra_ub.shape[0]:
+            blocks.append(sparse.csr_matrix(extra_ub))
+        A_ub = sparse.vstack(blocks, format="csr")
+        return LinearProgram(
+            c=c,
+            A_ub=A_ub,
+            b_ub=np.zeros(A_ub.shape[0]),
+            A_eq=sparse.csr_matrix(np.atleast_2d(eq_rows)),
+            b_eq=np.asarray(b_eq, dtype=float),
+            bounds=self.bounds,
+            maximize=maximize,
+            name=name,
+        )
+
+    def self_efficiency(self, d: int, rho: float) -> LinearProgram:
+        """Model 11: max cy_d  s.t.  cx_d = 1, frontier, weight balance."""
+        return self._program(self.output_row(d), self.input_row(d), [1.0], rho,
+                             name=f"2CHCCR_DMU_{d}")
+
+    def point_efficiency(self, fx: np.ndarray, fy: np.ndarray, rho: float) -> LinearProgram:
+        """
+        Model 11 for a point outside the DMU set, given by its feature rows: max cy_o s.t. cx_o = 1,
+        frontier, weight balance. The score may exceed 1 when the point lies beyond this frontier.
+        """
+        c = np.zeros(self.n_vars)
+        c[self.out_slice] = fy
+        eq = np.zeros(self.n_vars)
+        eq[self.in_slice] = fx
+        return self._program(c, eq, [1.0], rho, name="2CHCCR_point")
+
+    def target(self, d: int, j: int, e_d: float, rho: float, objective: str = "max") -> LinearProgram:
+        """Model 12: max/min cy_j  s.t.  cx_j = 1, cy_d - E_d cx_d = 0, frontier, weight balance."""
+        eq = np.vstack([self.input_row(j), self.output_row(d) - e_d * self.input_row(d)])
+        return self._program(self.output_row(j), eq, [1.0, 0.0], rho,
+                             maximize=(objective == "max"), name=f"Targets_{objective}_{d}_{j}")
+
+    def feasibility(self, d: int, alpha: float, E_max: np.ndarray, E_min: np.ndarray,
+                    e_d: float, rho: float) -> LinearProgram:
+        """Fairness check: can every j reach E_min + alpha * (E_max - E_min) while d keeps E_d?"""
+        e_max, e_min = E_max[d], E_min[d]
+        mask = e_max > e_min + 1e-6
+        mask[d] = False
+        js = np.flatnonzero(mask)
+        target = e_min[js] + alpha * (e_max[js] - e_min[js])
+
+        # -(cy_j - target_j * cx_j) <= 0
+        extra = np.zeros((len(js), self.n_vars))
+        extra[:, self.in_slice] = target[:, None] * self.Fx[js]
+        extra[:, self.out_slice] = -self.Fy[js]
+
+        eq = np.vstack([self.input_row(d), self.output_row(d)])
+        return self._program(np.zeros(self.n_vars), eq, [1.0, e_d], rho, extra_ub=extra,
+                             name="FeasibilityCheck")
+
+    def principle(self, d: int, E_max: np.ndarray, E_min: np.ndarray, e_d: float, rho: float,
+                  principle: str = "utilitarianism", weights: Optional[np.ndarray] = None) -> LinearProgram:
+        """
+        One LP choosing d's weights for the satisfaction of the rated DMUs, with d keeping E_d.
+
+        Satisfaction (E_dj - E_min) / (E_max - E_min) is a ratio, so the LP uses the
+        surplus s_j = (cy_j - E_min_dj * cx_j) / (E_max_dj - E_min_dj), i.e. satisfaction
+        times cx_j. 'utilitarianism' maximizes sum_j s_j; 'equity' maximizes t with
+        t <= s_j for every j, using one extra variable t appended after the weights.
+        Only DMUs j != d with a non-degenerate range take part; `weights` multiplies each
+        s_j in the utilitarian sum (multiplicities of deduplicated DMUs).
+        """
+        e_max, e_min = E_max[d], E_min[d]
+        mask = e_max > e_min + 1e-6
+        mask[d] = False
+        js = np.flatnonzero(mask)
+        width = (e_max[js] - e_min[js])[:, None]
+        surplus = np.zeros((len(js), self.n_vars))
+        surplus[:, self.in_slice] = -e_min[js][:, None] * self.Fx[js] / width
+        surplus[:, self.out_slice] = self.Fy[js] / width
+
+        eq = np.vstack([self.input_row(d), self.output_row(d)])
+        if principle == "utilitarianism":
+            w = np.ones(len(js)) if weights is None else np.asarray(weights, dtype=float)[js]
+            return self._program(w @ surplus, eq, [1.0, e_d], rho, name=f"Utilitarianism_{d}")
+        if principle != "equity":
+            raise ValueError(f"Unknown principle '{principle}', expected 'utilitarianism' or 'equity'")
+
+        base = self._program(np.zeros(self.n_vars), eq, [1.0, e_d], rho)
+        # t - s_j <= 0
+        rows = sparse.csr_matrix(np.hstack([-surplus, np.ones((len(js), 1))]))
+        c = np.zeros(self.n_vars + 1)
+        c[-1] = 1.0
+        return LinearProgram(
+            c=c,
+            A_ub=sparse.vstack([sparse.hstack([base.A_ub, sparse.csr_matrix((base.A_ub.shape[0], 1))]), rows], format="csr"),
+            b_ub=np.zeros(base.A_ub.shape[0] + len(js)),
+            A_eq=sparse.hstack([base.A_eq, sparse.csr_matrix((2, 1))], format="csr"),
+            b_eq=base.b_eq,
+            bounds=np.vstack([self.bounds, [[-np.inf, np.inf]]]),
+            maximize=True,
+            name=f"Equity_{d}",
+        )
+
+    def ratios(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Aggregated inputs and outputs (cx_j, cy_j) of every DMU under the weights in x."""
+        return self.Fx @ x[self.in_slice], self.Fy @ x[self.out_slice]
+
+    def best_target_bounds(self, d: int, e_d: float, rho: float, pool: np.ndarray,
+                           tol: float = 1e-7) -> np.ndarray:
+        """
+        Lower bounds on E_max[d, j] for every j from known solutions of d's LPs.
+
+        Every row of `pool` satisfies cy_d = E_d cx_d (d's self weights or the solution of
+        one of d's target LPs). The frontier, importance and monotonicity rows are
+        homogeneous, so x / cx_j stays feasible for the target LP of j as long as the
+        rescaled point is within the variable bounds, i.e. cx_j >= floor(x). Its ratio
+        cy_j / cx_j is then attainable, so E_max[d, j] is at least the best such ratio
+        (-inf where no pooled point qualifies).
+        """
+        pool = np.atleast_2d(pool)[:, :self.n_vars]
+        A = sparse.vstack([self.frontier, self.importance_rows(rho)]
+                          + ([self.monotonicity] if self.monotonicity is not None else []), format="csr")
+        scale = np.maximum(np.abs(pool).max(axis=1), 1.0)
+        ok = (np.asarray(A @ pool.T) <= tol * scale).all(axis=0)
+        ok &= np.abs(pool @ (self.output_row(d) - e_d * self.input_row(d))) <= tol * scale
+        pool = pool[ok]
+        if not len(pool):
+            return np.full(self.n_dmus, -np.inf)
+
+        lb, ub = self.bounds[:, 0], self.bounds[:, 1]
+        floor = np.zeros(len(pool))
+        upper = np.isfinite(ub) & (ub > 0)
+        lower = np.isfinite(lb) & (lb < 0)
+        if upper.any():
+            floor = np.maximum(floor, (pool[:, upper] / ub[upper]).max(axis=1))
+        if lower.any():
+            floor = np.maximum(floor, (pool[:, lower] / lb[lower]).max(axis=1))
+
+        cx = self.Fx @ pool[:, self.in_slice].T      # (n, p)
+        cy = self.Fy @ pool[:, self.out_slice].T
+        valid = (cx > 1e-12) & (cx >= floor[None, :] * (1 - 1e-9))
+        ratios = np.where(valid, cy / np.where(valid, cx, 1.0), -np.inf)
+        return ratios.max(axis=1)
+
+    def is_feasible(self, lp: LinearProgram, x: np.ndarray, tol: float = 1e-7) -> bool:
+        """Primal feasibility of x for lp, within an absolute tolerance."""
+        if np.any(x < lp.bounds[:, 0] - tol) or np.any(x > lp.bounds[:, 1] + tol):
+            return False
+        if lp.A_ub.shape[0] and np.any(lp.A_ub @ x - lp.b_ub > tol):
+            return False
+        if lp.A_eq.shape[0] and np.any(np.abs(lp.A_eq @ x - lp.b_eq) > tol):
+            return False
+        return True
+
+    def split(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Weights (v, u, packed v_int, packed u_int) from a solution vector."""
+        m, s = self.n_inputs, self.n_outputs
+        x_in, x_out = x[self.in_slice], x[self.out_slice]
+        return x_in[:m], x_out[:s], x_in[m:], x_out[s:]
+
+
+class WarmStart:
+    """
+    Optimal solutions kept across a sweep of the weight balance parameter rho.
+
+    Raising rho only tightens rho*z <= I, so the feasible set of an LP at a larger rho is
+    contained in the one at a smaller rho. An optimum found at the smaller rho that is
+    still feasible is therefore still optimal, and the LP need not be solved again.
+    Keys must identify the LP up to rho (e.g. stage, DMU indices and E_d).
+    """
+
+    def __init__(self):
+        self._solutions: Dict[Any, Tuple[float, LPResult]] = {}
+
+    def lookup(self, key, rho: float, lp: LinearProgram, model: ChoquetLP) -> Optional[LPResult]:
+        entry = self._solutions.get(key)
+        if entry is None:
+            return None
+        prev_rho, result = entry
+        if rho < prev_rho or result.x is None or not model.is_feasible(lp, result.x):
+            return None
+        return result
+
+    def store(self, key, rho: float, result: LPResult):
+        if result.optimal:
+            self._solutions[key] = (rho, result)
@@ -0,0 +1,197 @@
+
+import multiprocessing
+import numpy as np
+import polars as pl
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+from .ccr_model import solve_envelopment
+from .evaluator import BoundedRationalityEvaluator, rank_categories
+from .lp import ChoquetLP, solve_lp
+from .shared import SharedDataset, SharedHandle
+
+
+def _frontier_scores(data: SharedDataset, frontier: np.ndarray, points: Dict[int, np.ndarray],
+                     rho: float) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Scores of the DMUs of several periods against the frontier of one period.
+
+    `frontier` and `points` hold row indices into the shared panel. The CCR technology
+    matrices and the Choquet constraint templates of the frontier period are built once
+    and shared by every evaluated point. Returns, per evaluated period, (CCR distance,
+    Choquet distance); both exceed 1 for points beyond the frontier.
+    """
+    X, Y = data['inputs'], data['outputs']
+    Fx, Fy = data['input_features'], data['output_features']
+    model = ChoquetLP(X[frontier], Y[frontier], input_features=Fx[frontier], output_features=Fy[frontier])
+    scores = {}
+    for t, rows in points.items():
+        ccr = solve_envelopment(X[frontier], Y[frontier], 'crs', 'input', X[rows], Y[rows], slacks=False)
+        ccr_scores = np.where(ccr.status == 1, ccr.efficiency, np.nan)
+        choquet = np.full(len(rows), np.nan)
+        for o, (fx, fy) in enumerate(zip(Fx[rows], Fy[rows])):
+            res = solve_lp(model.point_efficiency(fx, fy, rho))
+            if res.optimal:
+                choquet[o] = res.objective
+        scores[t] = (ccr_scores, choquet)
+    return scores
+
+
+def _period_task(handle: SharedHandle, s: int):
+    """
+    All the work of period s, written into the shared panel: the Malmquist distances of
+    periods s-1..s+1 against its frontier (buffer row s - t + 1 for the points of period
+    t, so row 0 of a period holds its distances to the previous frontier and row 2 to
+    the next), and the cross-efficiency report of its own DMUs, identical to evaluating
+    the month alone.
+    """
+    data = SharedDataset.attach(handle)
+    try:
+        offsets = data['offsets']
+        rows = [data['rows'][a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+        neighbours = [t for t in (s - 1, s, s + 1) if 0 <= t < len(rows)]
+        scores = _frontier_scores(data, rows[s], {t: rows[t] for t in neighbours}, data.meta['rho'])
+        for t, (ccr, choquet) in scores.items():
+            data['ccr'][s - t + 1, rows[t]] = ccr
+            data['choquet'][s - t + 1, rows[t]] = choquet
+
+        evaluator = BoundedRationalityEvaluator(rho=data.meta['rho'], ethical_principle=data.meta['principle'],
+                                                backend=data.meta['backend'])
+        own = rows[s]
+        report = evaluator.evaluate(list(range(len(own))), data['raw_inputs'][own], data['raw_outputs'][own],
+                                    output='columns')
+        for name in ('cross_efficiency', 'satisfaction', 'rank'):
+            data[name][own] = report[name]
+    finally:
+        data.close()
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def _malmquist(own_prev, cross_prev_now, cross_now_prev, own_now):
+    """
+    Malmquist index and its decomposition from the four distances
+    D^t(t), D^t(t+1), D^{t+1}(t), D^{t+1}(t+1) (Färe et al. 1994).
+    """
+    index = np.sqrt(_ratio(cross_prev_now, own_prev) * _ratio(own_now, cross_now_prev))
+    efficiency_change = _ratio(own_now, own_prev)
+    return index, efficiency_change, _ratio(index, efficiency_change)
+
+
+def panel_evaluation(
+    data: pl.DataFrame,
+    id_col: str,
+    period_col: str,
+    input_cols: Sequence[str],
+    output_cols: Sequence[str],
+    rho: float = 0.5,
+    principle: str = 'fairness',
+    backend: str = 'pulp',
+    n_jobs: int = 1,
+) -> pl.DataFrame:
+    """
+    Evaluate a panel (one row per DMU and period) with Malmquist productivity indices.
+
+    Every period's DMUs are scored against the frontier of their own period and of the
+    adjacent periods, both with classic CCR and with the 2-additive Choquet model
+    (Model 11 on points outside the DMU set). Data are normalized once over the whole
+    panel so that Choquet scores of different periods are comparable. Each frontier
+    period is an independent task, spread over `n_jobs` worker processes that attach to
+    the panel through a `shared.SharedDataset` and write their results in place.
+
+    Each period also gets the cross-efficiency report of `BoundedRationalityEvaluator`
+    with the given `principle` and `backend`, on that period's raw data, so one call
+    replaces a monthly loop of `evaluate` calls.
+
+    Between consecutive periods t and t+1, a DMU observed in both gets
+        malmquist = sqrt(D^t(t+1) / D^t(t) * D^{t+1}(t+1) / D^{t+1}(t))
+    split into efficiency_change = D^{t+1}(t+1) / D^t(t) and technical_change =
+    malmquist / efficiency_change, and the same three with the Choquet distances.
+    Values above 1 mean productivity growth. Unlike CCR, the Choquet distances are not
+    homogeneous in the data (the importance scale is capped at 1), so a uniform output
+    growth need not show up as pure technical change.
+
+    Returns:
+        Frame with id, period, ccr_efficiency, choquet_efficiency, cross_efficiency,
+        satisfaction, rank, category (within the period), malmquist,
+        efficiency_change, technical_change, choquet_malmquist,
+        choquet_efficiency_change and choquet_technical_change. Indices are null in a
+        DMU's first period and when a distance is undefined.
+    """
+    missing = [c for c in (id_col, period_col, *input_cols, *output_cols) if c not in data.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+    if data.select([id_col, period_col]).is_duplicated().any():
+        raise ValueError(f"Each ({id_col}, {period_col}) pair must appear once")
+
+    X_raw = data.select(input_cols).to_numpy().astype(float)
+    Y_raw = data.select(output_cols).to_numpy().astype(float)
+    X_all, Y_all = X_raw.copy(), Y_raw.copy()
+    # Common normalization over all periods (Choquet features are not scale invariant)
+    for M in (X_all, Y_all):
+        scale = M.max(axis=0)
+        M /= np.where(scale < 1e-10, 1.0, scale)
+
+    periods = sorted(data[period_col].unique().to_list())
+    period_values = data[period_col].to_numpy()
+    ids_all = data[id_col].to_list()
+    rows: List[np.ndarray] = [np.flatnonzero(period_values == q) for q in periods]
+    offsets = np.concatenate([[0], np.cumsum([len(idx) for idx in rows])])
+    n = len(ids_all)
+
+    n_jobs = max(1, min(n_jobs, len(periods)))
+    meta = {'rho': rho, 'principle': principle, 'backend': backend}
+    buffers = {'ccr': (3, n), 'choquet': (3, n), 'cross_efficiency': (n,), 'satisfaction': (n,), 'rank': (n,)}
+    with SharedDataset.create(X_all, Y_all, buffers=buffers, meta=meta, raw_inputs=X_raw, raw_outputs=Y_raw,
+                              rows=np.concatenate(rows), offsets=offsets) as shared:
+        if n_jobs == 1:
+            for s in range(len(periods)):
+                _period_task(shared.handle, s)
+        else:
+            # Spawn, not fork: a forked child inherits polars' thread pool and can hang
+            with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn')) as pool:
+                for f in [pool.submit(_period_task, shared.handle, s) for s in range(len(periods))]:
+                    f.result()
+        # Distances of period t's points against the frontiers of t-1, t and t+1
+        ccr, choquet = shared['ccr'].copy(), shared['choquet'].copy()
+        report = {name: shared[name].copy() for name in ('cross_efficiency', 'satisfaction', 'rank')}
+
+    frames = []
+    names = ('malmquist', 'efficiency_change', 'technical_change',
+             'choquet_malmquist', 'choquet_efficiency_change', 'choquet_technical_change')
+    for t, idx in enumerate(rows):
+        ids = [ids_all[i] for i in idx]
+        rank = report['rank'][idx].astype(np.int64)
+        columns = {
+            'id': ids,
+            'period': [periods[t]] * len(ids),
+            'ccr_efficiency': ccr[1, idx],
+            'choquet_efficiency': choquet[1, idx],
+            'cross_efficiency': report['cross_efficiency'][idx],
+            'satisfaction': report['satisfaction'][idx],
+            'rank': rank,
+            'category': rank_categories(rank).tolist(),
+        }
+        for name in names:
+            columns[name] = np.full(len(ids), np.nan)
+        if t > 0:
+            prev = rows[t - 1]
+            prev_pos = {ids_all[i]: k for k, i in enumerate(prev)}
+            here = np.array([k for k, d_id in enumerate(ids) if d_id in prev_pos], dtype=np.int64)
+            there = np.array([prev_pos[ids[k]] for k in here], dtype=np.int64)
+            if len(here):
+                for offset, buf in ((0, ccr), (3, choquet)):
+                    indices = _malmquist(
+                        buf[1, prev[there]],      # D^{t-1}(t-1)
+                        buf[0, idx[here]],        # D^{t-1}(t)
+                        buf[2, prev[there]],      # D^t(t-1)
+                        buf[1, idx[here]],        # D^t(t)
+                    )
+                    for name, values in zip(names[offset:offset + 3], indices):
+                        columns[name][here] = values
+        frames.append(pl.DataFrame(columns))
+
+    return pl.concat(frames).fill_nan(None)
@@ -0,0 +1,68 @@
+
+import numpy as np
+from scipy import sparse
+from typing import Any, List, Optional, Sequence, Tuple
+
+PEER_TOL = 1e-9
+
+
+def peer_matrix(lambdas: Sequence[Optional[np.ndarray]], tol: float = PEER_TOL) -> sparse.csr_matrix:
+    """
+    n x n peer-weight matrix from the self-evaluation duals, in CSR form.
+
+    Row d holds lambda_dj, the dual of DMU j's frontier row (cy_j - cx_j <= 0) in DMU d's
+    Model 11, i.e. the intensity of j in the envelopment form. A positive lambda_dj
+    means j's frontier row binds under d's optimal weights: j is one of d's peers.
+    Every self-efficiency solve already returns these duals (`DMU.lambdas`, filled by
+    `run_choquet_evaluation`, or the 'lambdas' of `ChoquetDEASolver.solve_self_evaluation`),
+    so no LP is added. Rows without a solution (None) are empty; values up to `tol` are
+    dropped as solver noise.
+    """
+    n = len(lambdas)
+    rows, cols, vals = [], [], []
+    for d, lam in enumerate(lambdas):
+        if lam is None:
+            continue
+        lam = np.asarray(lam, dtype=float)
+        if lam.shape != (n,):
+            raise ValueError(f"Row {d} has {lam.size} lambdas, expected {n}")
+        (j,) = np.nonzero(lam > tol)
+        rows.append(np.full(len(j), d))
+        cols.append(j)
+        vals.append(lam[j])
+    if not rows:
+        return sparse.csr_matrix((n, n))
+    return sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n))
+
+
+def from_dmus(dmus: List, tol: float = PEER_TOL) -> sparse.csr_matrix:
+    """Peer-weight matrix of DMUs evaluated by `run_choquet_evaluation`."""
+    return peer_matrix([d.lambdas for d in dmus], tol)
+
+
+def reference_sets(peers: sparse.csr_matrix, names: Optional[Sequence[Any]] = None) -> List[List[Any]]:
+    """Peers of every DMU, by decreasing weight; indices unless `names` are given."""
+    sets = []
+    for d in range(peers.shape[0]):
+        start, end = peers.indptr[d], peers.indptr[d + 1]
+        order = np.argsort(-peers.data[start:end], kind='stable')
+        members = peers.indices[start:end][order]
+        sets.append([names[j] for j in members] if names is not None else members.tolist())
+    return sets
+
+
+def peer_counts(peers: sparse.csr_matrix) -> np.ndarray:
+    """How many DMUs benchmark against each DMU (column counts of the peer matrix)."""
+    return np.bincount(peers.indices, minlength=peers.shape[1])
+
+
+def projections(peers: sparse.csr_matrix, inputs: np.ndarray, outputs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Projection targets: the lambda-weighted inputs and outputs of every DMU's peers.
+
+    For a linear (CCR) model these are the frontier targets theta * x_d - s- and
+    y_d + s+. With Choquet aggregation the duals also price the weight balance rows, so
+    the composite is the benchmark that d's peers span rather than an exact radial
+    projection.
+    """
+    return peers @ np.asarray(inputs, dtype=float), peers @ np.asarray(outputs, dtype=float)
@@ -0,0 +1,290 @@
+
+import heapq
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .choquet import DMU, iter_choquet_evaluation, normalize_data
+from .evaluator import BoundedRationalityEvaluator
+from .lp import SolveStats
+from .shared import SharedDataset, SharedHandle
+from .storage import n_pairs
+
+# Pipeline stages the cost model counts LPs for, with the power of n their count grows
+# with per evaluated DMU: one Model 11, 2n Model 12 targets, a few fairness checks
+COUNTED_STAGES = {'self': 1, 'targets': 2, 'satisfaction': 1}
+
+_RESULTS = ('cross_efficiency', 'ccr_efficiency', 'satisfaction')
+
+
+def lp_size(n: int, m: int, s: int) -> int:
+    """
+    Rows times columns of a pipeline LP on n DMUs with m inputs and s outputs: the n
+    frontier rows plus about one bound or importance row per 2-additive weight.
+    """
+    k = m + n_pairs(m) + s + n_pairs(s)
+    return (n + k) * k
+
+
+@dataclass
+class Job:
+    """One evaluation: the arguments of `BoundedRationalityEvaluator.evaluate`."""
+    name: str
+    dmu_ids: List[Any]
+    inputs: np.ndarray
+    outputs: np.ndarray
+
+    def __post_init__(self):
+        self.inputs = np.asarray(self.inputs, dtype=float)
+        self.outputs = np.asarray(self.outputs, dtype=float)
+        if len(self.dmu_ids) != len(self.inputs) or len(self.dmu_ids) != len(self.outputs):
+            raise ValueError(f"Job '{self.name}': size mismatch between DMU IDs and Data matrices")
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.dmu_ids), self.inputs.shape[1], self.outputs.shape[1]
+
+
+@dataclass
+class Task:
+    """
+    Rating DMUs start..stop-1 of a job; the whole job when they are all of them. After
+    a run, `seconds` is the wall time the worker spent on it and `stats` its LP counts.
+    """
+    job: str
+    start: int
+    stop: int
+    n: int
+    m: int
+    s: int
+    predicted: float = 0.0
+    seconds: float = 0.0
+    stats: Optional[SolveStats] = None
+
+    @property
+    def rows(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def whole(self) -> bool:
+        return self.rows == self.n
+
+
+@dataclass
+class CostModel:
+    """
+    Predicted wall time of evaluating `rows` DMUs of an n x (m, s) job.
+
+    Per counted stage, the LP count is counts[stage] * rows * n^(p - 1) (p from
+    `COUNTED_STAGES`) and each LP takes per_lp[stage] + per_size[stage] * `lp_size`
+    seconds; `overhead` covers the rest of a task (model setup, interactions, process
+    hand-off). The defaults are HiGHS timings of a plain laptop; only ratios matter for
+    packing, but `fit` them to the tasks of an earlier run (the instrumentation in
+    `Task.stats`) for realistic makespans, and for the pulp backend.
+    """
+    counts: Dict[str, float] = field(default_factory=lambda: {'self': 1.0, 'targets': 2.0, 'satisfaction': 7.5})
+    per_lp: Dict[str, float] = field(default_factory=lambda: {'self': 2.5e-3, 'targets': 2.7e-3,
+                                                              'satisfaction': 3e-3})
+    per_size: Dict[str, float] = field(default_factory=lambda: {'self': 1e-6, 'targets': 1e-6,
+                                                                'satisfaction': 1e-6})
+    overhead: float = 0.01
+
+    def lps(self, n: int, rows: Optional[int] = None) -> Dict[str, float]:
+        rows = n if rows is None else rows
+        return {stage: self.counts.get(stage, 0.0) * rows * n ** (p - 1) for stage, p in COUNTED_STAGES.items()}
+
+    def predict(self, n: int, m: int, s: int, rows: Optional[int] = None) -> float:
+        size = lp_size(n, m, s)
+        return self.overhead + sum(count * (self.per_lp.get(stage, 0.0) + self.per_size.get(stage, 0.0) * size)
+                                   for stage, count in self.lps(n, rows).items())
+
+    @classmethod
+    def fit(cls, tasks: Iterable[Task]) -> "CostModel":
+        """
+        Least-squares fit (non-negative) to measured tasks: LP counts from their
+        `stats.solved`, per-LP times from their `stats.seconds` per stage, and the
+        overhead from the rest of their wall time.
+        """
+        from scipy.optimize import nnls
+
+        tasks = [t for t in tasks if t.stats is not None]
+        if not tasks:
+            raise ValueError("Fitting a cost model needs tasks with stats")
+        model = cls(counts={}, per_lp={}, per_size={}, overhead=0.0)
+        for stage, p in COUNTED_STAGES.items():
+            solved = np.array([t.stats.solved.get(stage, 0) for t in tasks], dtype=float)
+            model.counts[stage] = float(solved.sum() / sum(t.rows * t.n ** (p - 1) for t in tasks))
+            A = np.column_stack([solved, solved * [lp_size(t.n, t.m, t.s) for t in tasks]])
+            seconds = np.array([t.stats.seconds.get(stage, 0.0) for t in tasks])
+            coef = nnls(A, seconds)[0] if solved.any() else np.zeros(2)
+            model.per_lp[stage], model.per_size[stage] = float(coef[0]), float(coef[1])
+        counted = np.array([sum(t.stats.seconds.get(stage, 0.0) for stage in COUNTED_STAGES) for t in tasks])
+        model.overhead = float(np.maximum(np.array([t.seconds for t in tasks]) - counted, 0.0).mean())
+        return model
+
+
+def _pack(costs: Sequence[float], workers: int) -> float:
+    """Makespan of longest-processing-time-first list scheduling of `costs` on `workers`."""
+    loads = [0.0] * workers
+    for cost in sorted(costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+def plan(jobs: Sequence[Job], workers: int = 1, model: Optional[CostModel] = None,
+         split: Optional[float] = None) -> List[Task]:
+    """
+    Tasks for `jobs`, longest predicted first.
+
+    A job predicted to take more than `split` seconds is cut into chunks of consecutive
+    rating DMUs of at most about `split` each; the default is half the mean load of a
+    worker, so that no job holds one worker while the others run out of work. With one
+    worker nothing is split by default.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    names = [job.name for job in jobs]
+    if len(set(names)) < len(names):
+        raise ValueError("Job names must be unique")
+    model = model or CostModel()
+    costs = [model.predict(*job.shape) for job in jobs]
+    if split is None:
+        split = sum(costs) / (2 * workers) if workers > 1 else np.inf
+
+    tasks = []
+    for job, cost in zip(jobs, costs):
+        n, m, s = job.shape
+        chunks = 1
+        per_row = (cost - model.overhead) / n if n else 0.0
+        if cost > split and n > 1 and per_row > 0:
+            chunks = min(n, -(-n // max(1, int((split - model.overhead) / per_row))))
+        bounds = np.linspace(0, n, chunks + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            rows = int(stop - start)
+            tasks.append(Task(job.name, int(start), int(stop), n, m, s,
+                              predicted=cost if rows == n else model.predict(n, m, s, rows)))
+    return sorted(tasks, key=lambda t: t.predicted, reverse=True)
+
+
+def _job_task(job: Job, options: Dict[str, Any]) -> Tuple[Dict[str, np.ndarray], SolveStats, float]:
+    start = perf_counter()
+    stats = SolveStats()
+    evaluator = BoundedRationalityEvaluator(rho=options['rho'], ethical_principle=options['principle'],
+                                            backend=options['backend'], precision=options['precision'])
+    columns = evaluator.evaluate(job.dmu_ids, job.inputs, job.outputs, output='columns', stats=stats)
+    return columns, stats, perf_counter() - start
+
+
+def _rows_task(handle: SharedHandle, start: int, stop: int) -> Tuple[None, SolveStats, float]:
+    """Rating DMUs start..stop-1 of a shared (normalized) job, written into its result buffers."""
+    began = perf_counter()
+    data = SharedDataset.attach(handle)
+    try:
+        options, stats = data.meta, SolveStats()
+        dmus = [DMU(str(i), data['inputs'][i].copy(), data['outputs'][i].copy()) for i in range(len(data))]
+        for i, score in iter_choquet_evaluation(dmus, rho=options['rho'], backend=options['backend'], stats=stats,
+                                                principle=options['principle'], precision=options['precision'],
+                                                rows=range(start, stop)):
+            data['cross_efficiency'][i] = score
+            data['ccr_efficiency'][i] = dmus[i].efficiency_ccr or 0.0
+            data['satisfaction'][i] = dmus[i].satisfaction or 0.0
+    finally:
+        data.close()
+    return None, stats, perf_counter() - began
+
+
+@dataclass
+class ScheduleReport:
+    """
+    Results of `run`: the columnar output of `BoundedRationalityEvaluator.evaluate` per
+    job name, the tasks in submission order with their measured time and LP counts,
+    and the run's makespan (wall seconds from pool start to the last result).
+    """
+    results: Dict[str, Dict[str, np.ndarray]]
+    tasks: List[Task]
+    workers: int
+    makespan: float
+    predicted_makespan: float
+
+    @property
+    def busy(self) -> float:
+        return sum(t.seconds for t in self.tasks)
+
+    @property
+    def utilization(self) -> float:
+        """Share of the workers' time spent in tasks."""
+        return self.busy / (self.workers * self.makespan) if self.makespan > 0 else 0.0
+
+    def summary(self) -> str:
+        split = len({t.job for t in self.tasks if not t.whole})
+        return (f"{len(self.results)} job(s), {len(self.tasks)} task(s) ({split} job(s) split) on "
+                f"{self.workers} worker(s): makespan {self.makespan:.3f}s "
+                f"(predicted {self.predicted_makespan:.3f}s), utilization {self.utilization:.1%}")
+
+
+def run(jobs: Sequence[Job], workers: int = 1, model: Optional[CostModel] = None,
+        options: Optional[Dict[str, Any]] = None, split: Optional[float] = None) -> ScheduleReport:
+    """
+    Evaluate every job over `workers` processes, packed by predicted cost.
+
+    Tasks come from `plan` and are submitted longest first, so the pool's idle workers
+    always pick the longest remaining task (LPT list scheduling). Whole jobs run
+    `BoundedRationalityEvaluator.evaluate`; chunks of a split job run its rating DMUs
+    only (`choquet.iter_choquet_evaluation` with `rows`) on the job's normalized data
+    in a `shared.SharedDataset`, and the job's ranks are computed once all its chunks
+    are in. Results equal those of evaluating each job on its own. `options` are the
+    evaluator settings of `cli.run` (rho, principle, backend, precision).
+    """
+    options = {'rho': 0.5, 'principle': 'fairness', 'backend': 'pulp', 'precision': 'default', **(options or {})}
+    model = model or CostModel()
+    tasks = plan(jobs, workers, model, split)
+    by_name = {job.name: job for job in jobs}
+    workers = max(1, min(workers, len(tasks))) if tasks else 1
+    results: Dict[str, Dict[str, np.ndarray]] = {}
+
+    with ExitStack() as stack:
+        shared: Dict[str, SharedDataset] = {}
+        for name in dict.fromkeys(t.job for t in tasks if not t.whole):
+            job = by_name[name]
+            dmus = normalize_data([DMU(str(d), job.inputs[i].copy(), job.outputs[i].copy())
+                                   for i, d in enumerate(job.dmu_ids)])
+            shared[name] = stack.enter_context(SharedDataset.create(
+                np.array([d.inputs for d in dmus]), np.array([d.outputs for d in dmus]), features=False,
+                buffers={key: (len(dmus),) for key in _RESULTS}, meta=options))
+
+        def arguments(task: Task):
+            if task.whole:
+                return _job_task, by_name[task.job], options
+            return _rows_task, shared[task.job].handle, task.start, task.stop
+
+        def collect(task: Task, result):
+            columns, task.stats, task.seconds = result
+            if columns is not None:
+                results[task.job] = columns
+
+        start = perf_counter()
+        if workers == 1:
+            for task in tasks:
+                fn, *args = arguments(task)
+                collect(task, fn(*args))
+        else:
+            # Spawn, not fork: a forked child inherits polars' thread pool and can hang
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {pool.submit(*arguments(task)): task for task in tasks}
+                for future in as_completed(futures):
+                    collect(futures[future], future.result())
+        makespan = perf_counter() - start
+
+        for name, data in shared.items():
+            job = by_name[name]
+            dmus = [DMU(str(d), job.inputs[i], job.outputs[i], efficiency_ccr=float(data['ccr_efficiency'][i]),
+                        satisfaction=float(data['satisfaction'][i])) for i, d in enumerate(job.dmu_ids)]
+            results[name] = BoundedRationalityEvaluator._rank_columns(job.dmu_ids, dmus,
+                                                                      data['cross_efficiency'].copy())
+
+    return ScheduleReport({job.name: results[job.name] for job in jobs}, tasks, workers, makespan,
+                          _pack([t.predicted for t in tasks], workers))
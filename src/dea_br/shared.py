@@ -0,0 +1,104 @@
+
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+from .lp import choquet_features
+
+_ALIGN = 64
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """Picklable reference to a `SharedDataset`: block name, array layout and metadata."""
+    name: str
+    layout: Tuple[Tuple[str, str, Tuple[int, ...], int], ...]    # (key, dtype, shape, byte offset)
+    meta: Tuple[Tuple[str, Any], ...] = ()
+
+
+class SharedDataset:
+    """
+    The arrays of one evaluation in a single shared-memory block.
+
+    `create` copies the normalized inputs and outputs, their 2-additive Choquet features
+    ('input_features', 'output_features') and any extra arrays into one contiguous
+    block, and zero-fills the requested result buffers. Worker processes `attach` with
+    the small `handle` and get views on the same memory, so a task only carries the
+    handle and the index range it works on, and writes its results into the buffers in
+    place. The creating process owns the block and frees it on `close`; use it as a
+    context manager around the worker pool.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, handle: SharedHandle, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.handle = handle
+        self.meta: Dict[str, Any] = dict(handle.meta)
+        self.arrays: Dict[str, np.ndarray] = {
+            key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for key, dtype, shape, offset in handle.layout
+        }
+
+    @classmethod
+    def create(cls, inputs: np.ndarray, outputs: np.ndarray, features: bool = True,
+               buffers: Optional[Dict[str, Tuple[int, ...]]] = None, meta: Optional[Dict[str, Any]] = None,
+               **extra: np.ndarray) -> "SharedDataset":
+        """
+        Copy the data into a new block. `buffers` maps result names to float64 shapes;
+        `meta` holds small picklable values (sizes, options) passed along with the handle.
+        """
+        arrays = {'inputs': np.asarray(inputs, dtype=float), 'outputs': np.asarray(outputs, dtype=float)}
+        if len(arrays['inputs']) != len(arrays['outputs']):
+            raise ValueError("Inputs and outputs must have one row per DMU")
+        if features:
+            arrays['input_features'] = choquet_features(arrays['inputs'])
+            arrays['output_features'] = choquet_features(arrays['outputs'])
+        for key, value in extra.items():
+            arrays[key] = np.asarray(value)
+            if arrays[key].dtype == object:
+                raise ValueError(f"Array '{key}' must have a numeric dtype")
+        buffers = buffers or {}
+        overlap = set(arrays) & set(buffers)
+        if overlap:
+            raise ValueError(f"Names used for both data and buffers: {sorted(overlap)}")
+
+        layout, offset = [], 0
+        specs = [(k, a.dtype, a.shape) for k, a in arrays.items()]
+        specs += [(k, np.dtype(float), tuple(shape)) for k, shape in buffers.items()]
+        for key, dtype, shape in specs:
+            layout.append((key, dtype.str, tuple(int(d) for d in shape), offset))
+            size = int(np.prod(shape)) * dtype.itemsize
+            offset += -(-size // _ALIGN) * _ALIGN
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        handle = SharedHandle(shm.name, tuple(layout), tuple((meta or {}).items()))
+        dataset = cls(shm, handle, owner=True)
+        for key, value in arrays.items():
+            dataset.arrays[key][...] = value
+        for key in buffers:
+            dataset.arrays[key].fill(0.0)
+        return dataset
+
+    @classmethod
+    def attach(cls, handle: SharedHandle) -> "SharedDataset":
+        """Views on a block created by another process; `close` detaches without freeing."""
+        return cls(shared_memory.SharedMemory(name=handle.name), handle, owner=False)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.arrays[key]
+
+    def __len__(self) -> int:
+        return len(self.arrays['inputs'])
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self.arrays = {}
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
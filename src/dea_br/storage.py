@@ -0,0 +1,118 @@
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def n_pairs(size: int) -> int:
+    """Number of strictly upper-triangular entries of a size x size matrix."""
+    return size * (size - 1) // 2
+
+
+def pack_upper(matrix: np.ndarray) -> np.ndarray:
+    """Pack the strict upper triangle of an interaction matrix (row-major, t < p)."""
+    matrix = np.asarray(matrix)
+    return matrix[np.triu_indices(matrix.shape[0], 1)]
+
+
+def unpack_upper(packed: np.ndarray, size: int, dtype=np.float64) -> np.ndarray:
+    """Inverse of `pack_upper`: dense size x size matrix with zeros outside the strict upper triangle."""
+    dense = np.zeros((size, size), dtype=dtype)
+    dense[np.triu_indices(size, 1)] = packed
+    return dense
+
+
+class ResultStore:
+    """
+    Per-DMU results of a Choquet run held in one contiguous array.
+
+    Every DMU occupies one row of `data`, laid out as
+    [efficiency | weights_input (m) | weights_output (s) |
+     interactions_input (m(m-1)/2) | interactions_output (s(s-1)/2) | satisfaction].
+    Interaction weights are stored packed (strict upper triangle only), which is
+    all the 2-additive model uses, so a run needs n * (1 + m + s + C(m,2) + C(s,2) + 1)
+    values instead of n dense m x m and s x s matrices plus separate small arrays.
+    Use dtype=np.float32 to halve the footprint again.
+    """
+
+    def __init__(self, n_dmus: int, n_inputs: int, n_outputs: int, dtype=np.float64):
+        self.n_dmus = n_dmus
+        self.n_inputs = n_inputs
+        self.n_outputs = n_outputs
+
+        widths = [1, n_inputs, n_outputs, n_pairs(n_inputs), n_pairs(n_outputs), 1]
+        bounds = np.concatenate([[0], np.cumsum(widths)])
+        self._slices = [slice(bounds[k], bounds[k + 1]) for k in range(len(widths))]
+
+        self.data = np.zeros((n_dmus, int(bounds[-1])), dtype=dtype)
+
+    # Column views (no copies)
+    @property
+    def efficiency(self) -> np.ndarray:
+        return self.data[:, self._slices[0].start]
+
+    @property
+    def weights_input(self) -> np.ndarray:
+        return self.data[:, self._slices[1]]
+
+    @property
+    def weights_output(self) -> np.ndarray:
+        return self.data[:, self._slices[2]]
+
+    @property
+    def interactions_input(self) -> np.ndarray:
+        return self.data[:, self._slices[3]]
+
+    @property
+    def interactions_output(self) -> np.ndarray:
+        return self.data[:, self._slices[4]]
+
+    @property
+    def satisfaction(self) -> np.ndarray:
+        return self.data[:, self._slices[5].start]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def record(self, i: int, efficiency: float, weights_input, weights_output,
+               interactions_input=None, interactions_output=None):
+        """Store the solution of DMU i. Interaction weights may be dense matrices or packed vectors."""
+        row = self.data[i]
+        row[self._slices[0]] = efficiency
+        row[self._slices[1]] = weights_input
+        row[self._slices[2]] = weights_output
+        if interactions_input is not None:
+            row[self._slices[3]] = _as_packed(interactions_input)
+        if interactions_output is not None:
+            row[self._slices[4]] = _as_packed(interactions_output)
+
+    def dense_interactions(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense (upper-triangular) interaction matrices of DMU i, as returned by `solve_2chccr_model`."""
+        return (unpack_upper(self.interactions_input[i], self.n_inputs, self.data.dtype),
+                unpack_upper(self.interactions_output[i], self.n_outputs, self.data.dtype))
+
+    @classmethod
+    def from_dmus(cls, dmus: List, dtype=np.float64) -> "ResultStore":
+        """Collect the weights already attached to `choquet.DMU` objects."""
+        n_inputs = len(dmus[0].inputs) if dmus else 0
+        n_outputs = len(dmus[0].outputs) if dmus else 0
+        store = cls(len(dmus), n_inputs, n_outputs, dtype=dtype)
+        for i, d in enumerate(dmus):
+            store.record(
+                i,
+                d.efficiency_ccr if d.efficiency_ccr is not None else 0.0,
+                d.weights_input if d.weights_input is not None else 0.0,
+                d.weights_output if d.weights_output is not None else 0.0,
+                d.weights_interactions_input,
+                d.weights_interactions_output,
+            )
+            if d.satisfaction is not None:
+                store.satisfaction[i] = d.satisfaction
+        return store
+
+
+def _as_packed(weights: Optional[np.ndarray]) -> np.ndarray:
+    weights = np.asarray(weights)
+    if weights.ndim == 2:
+        return pack_upper(weights)
+    return weights
@@ -0,0 +1,108 @@
+
+import numpy as np
+import polars as pl
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .choquet import DMU, iter_choquet_evaluation, normalize_data
+
+SINK_FORMATS = ('parquet', 'ipc')
+
+_COLUMNS = {
+    'ccr_efficiency': pl.Float64,
+    'cross_efficiency': pl.Float64,
+    'satisfaction': pl.Float64,
+    'weights_input': pl.List(pl.Float64),
+    'weights_output': pl.List(pl.Float64),
+    'interactions_input': pl.List(pl.Float64),
+    'interactions_output': pl.List(pl.Float64),
+}
+
+
+def _floats(values) -> Optional[List[float]]:
+    return None if values is None else [float(v) for v in np.ravel(values)]
+
+
+def iter_records(dmu_ids: Sequence[Any], inputs: np.ndarray, outputs: np.ndarray, rho: float = 0.5,
+                 **options) -> Iterator[Dict[str, Any]]:
+    """
+    One result record per DMU, each yielded as soon as it is final (see
+    `choquet.iter_choquet_evaluation`, which takes the extra `options`): the id, self
+    efficiency, input and output weights with their packed pair interactions (None for
+    k != 2), satisfaction and cross-efficiency. Data are normalized as in
+    `BoundedRationalityEvaluator.evaluate`. Ranks need every score and are not included.
+    Data and options are checked on the call.
+    """
+    X = np.asarray(inputs, dtype=float)
+    Y = np.asarray(outputs, dtype=float)
+    if len(dmu_ids) != len(X) or len(dmu_ids) != len(Y):
+        raise ValueError("Size mismatch between DMU IDs and Data matrices")
+    dmus = normalize_data([DMU(str(d_id), X[i].copy(), Y[i].copy()) for i, d_id in enumerate(dmu_ids)])
+    return _records(dmu_ids, dmus, iter_choquet_evaluation(dmus, rho=rho, **options))
+
+
+def _records(dmu_ids: Sequence[Any], dmus: List[DMU], scores: Iterator) -> Iterator[Dict[str, Any]]:
+    for i, score in scores:
+        d = dmus[i]
+        yield {
+            'id': dmu_ids[i],
+            'ccr_efficiency': float(d.efficiency_ccr) if d.efficiency_ccr else 0.0,
+            'cross_efficiency': score,
+            'satisfaction': float(d.satisfaction) if d.satisfaction else 0.0,
+            'weights_input': _floats(d.weights_input),
+            'weights_output': _floats(d.weights_output),
+            'interactions_input': _floats(d.weights_interactions_input),
+            'interactions_output': _floats(d.weights_interactions_output),
+        }
+
+
+def write_records(records: Iterable[Dict[str, Any]], path: str, fmt: str = 'parquet',
+                  batch_size: int = 1024) -> int:
+    """
+    Stream records (as from `iter_records`) to a Parquet file or an Arrow IPC file and
+    return how many were written.
+
+    Records are gathered into DataFrames of `batch_size` rows that feed a polars
+    streaming sink, so at most one batch is held at a time and each Parquet row group
+    holds one batch; records are written while the pipeline is still producing the
+    next ones. The id column takes the dtype of the first record's id.
+    """
+    if fmt not in SINK_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {SINK_FORMATS}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    records = iter(records)
+    first = next(records, None)
+    id_dtype = pl.String if first is None else pl.Series([first['id']]).dtype
+    schema = {'id': id_dtype, **_COLUMNS}
+    written = 0
+
+    def batches() -> Iterator[pl.DataFrame]:
+        nonlocal written
+        if first is None:
+            return
+        chunk = [first]
+        for record in records:
+            if len(chunk) == batch_size:
+                written += len(chunk)
+                yield pl.DataFrame(chunk, schema=schema)
+                chunk = []
+            chunk.append(record)
+        written += len(chunk)
+        yield pl.DataFrame(chunk, schema=schema)
+
+    def source(with_columns, predicate, n_rows, _batch_size) -> Iterator[pl.DataFrame]:
+        for frame in batches():
+            if with_columns is not None:
+                frame = frame.select(with_columns)
+            if predicate is not None:
+                frame = frame.filter(predicate)
+            yield frame
+
+    from polars.io.plugins import register_io_source
+
+    frame = register_io_source(source, schema=schema)
+    if fmt == 'parquet':
+        frame.sink_parquet(path, row_group_size=batch_size)
+    else:
+        frame.sink_ipc(path)
+    return written
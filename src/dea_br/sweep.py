@@ -0,0 +1,55 @@
+
+import numpy as np
+import polars as pl
+from typing import Any, Iterable, List, Optional
+
+from .choquet import DMU, normalize_data, run_choquet_evaluation
+from .lp import ChoquetLP, SolveStats, WarmStart
+
+
+def rho_sweep(
+    dmu_ids: List[Any],
+    inputs: np.ndarray,
+    outputs: np.ndarray,
+    rhos: Iterable[float],
+    backend: str = 'highs',
+    stats: Optional[SolveStats] = None,
+) -> pl.DataFrame:
+    """
+    Evaluate the Choquet pipeline for a grid of weight balance parameters in one call.
+
+    Data normalization and the LP constraint templates are built once. Values of rho
+    are processed in increasing order so that each LP is a restriction of the same LP
+    at the previous rho; optimal weights that remain feasible are reused instead of
+    re-solving (see `lp.WarmStart`). Reuse needs the matrix backend, with
+    backend='pulp' every rho is a cold run.
+
+    Returns:
+        Stacked frame with one row per (rho, DMU): rho, id, ccr_efficiency,
+        cross_efficiency, satisfaction and rank (within its rho).
+    """
+    if len(dmu_ids) != inputs.shape[0] or len(dmu_ids) != outputs.shape[0]:
+        raise ValueError("Size mismatch between DMU IDs and Data matrices")
+
+    base = normalize_data([
+        DMU(name=str(d_id), inputs=inputs[i].astype(float).copy(), outputs=outputs[i].astype(float).copy())
+        for i, d_id in enumerate(dmu_ids)
+    ])
+    model = ChoquetLP.from_dmus(base) if backend == 'highs' else None
+    warm = WarmStart() if backend == 'highs' else None
+
+    frames = []
+    for rho in sorted(set(float(r) for r in rhos)):
+        dmus = [DMU(d.name, d.inputs.copy(), d.outputs.copy()) for d in base]
+        scores, _, _ = run_choquet_evaluation(dmus, rho=rho, backend=backend, stats=stats, model=model, warm=warm)
+        frames.append(pl.DataFrame({
+            'rho': [rho] * len(dmus),
+            'id': list(dmu_ids),
+            'ccr_efficiency': [float(d.efficiency_ccr or 0.0) for d in dmus],
+            'cross_efficiency': scores.astype(float),
+            'satisfaction': [float(d.satisfaction or 0.0) for d in dmus],
+        }))
+
+    return pl.concat(frames).with_columns(
+        pl.col('cross_efficiency').rank('ordinal', descending=True).over('rho').alias('rank')
+    )
@@ -0,0 +1,157 @@
+
+import json
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .capacity import capacity_from_mobius, integral_matrix, mobius_array
+from .choquet import DMU, run_choquet_evaluation
+from .kadditive import interaction_coalitions
+from .storage import ResultStore
+
+FORMAT_VERSION = 1
+
+
+def _scales(values: np.ndarray) -> np.ndarray:
+    # Same divide-by-max rule as `choquet.normalize_data`
+    scale = values.max(axis=0)
+    return np.where(scale < 1e-10, 1.0, scale)
+
+
+def _capacities(singletons: np.ndarray, coalitions: Sequence[Tuple[int, ...]], weights: np.ndarray) -> np.ndarray:
+    """One set-function row (2^m entries) per DMU from its Möbius weights."""
+    return np.array([capacity_from_mobius(mobius_array(v, coalitions, w)) for v, w in zip(singletons, weights)])
+
+
+@dataclass
+class WeightModel:
+    """
+    Frozen self-evaluation weights of a fitted run, for scoring new DMUs without LPs.
+
+    Holds, for each fitted DMU (the raters), its Model 11 efficiency and its input and
+    output aggregation as set functions over the criteria (2^m and 2^s entries, any
+    k-additivity), together with the normalization scales and the normalized frontier
+    data of the fit. `score_new` rates new DMUs with every frozen weight vector through
+    two sparse matrix products (see `capacity.integral_matrix`); `save` and `load` keep
+    the model in one .npz file.
+    """
+    ids: List[str]
+    input_scale: np.ndarray          # (m,) divisor applied to raw inputs
+    output_scale: np.ndarray         # (s,)
+    inputs: np.ndarray               # (n, m) normalized frontier data
+    outputs: np.ndarray              # (n, s)
+    efficiency: np.ndarray           # (n,) self-efficiency of each rater; 0 if its LP failed
+    input_capacity: np.ndarray       # (n, 2^m)
+    output_capacity: np.ndarray      # (n, 2^s)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def fit(cls, dmu_ids: Sequence[Any], inputs: np.ndarray, outputs: np.ndarray, rho: float = 0.5,
+            **options) -> "WeightModel":
+        """
+        Run the pipeline (`run_choquet_evaluation`, extra `options` passed through) and
+        keep the self-evaluation weights it stores in a `ResultStore`.
+        """
+        X = np.asarray(inputs, dtype=float)
+        Y = np.asarray(outputs, dtype=float)
+        if len(dmu_ids) != len(X) or len(dmu_ids) != len(Y):
+            raise ValueError("Size mismatch between DMU IDs and Data matrices")
+        input_scale, output_scale = _scales(X), _scales(Y)
+        dmus = [DMU(str(d_id), X[i] / input_scale, Y[i] / output_scale) for i, d_id in enumerate(dmu_ids)]
+        store = ResultStore(len(dmus), X.shape[1], Y.shape[1])
+        run_choquet_evaluation(dmus, rho=rho, store=store, **options)
+        meta = {'rho': rho, 'source': 'pipeline', **{k: v for k, v in options.items() if isinstance(v, (str, bool))}}
+        return cls.from_store([str(d) for d in dmu_ids], store, input_scale, output_scale,
+                              np.array([d.inputs for d in dmus]), np.array([d.outputs for d in dmus]), meta)
+
+    @classmethod
+    def from_store(cls, ids: Sequence[str], store: ResultStore, input_scale: np.ndarray, output_scale: np.ndarray,
+                   inputs: np.ndarray, outputs: np.ndarray, meta: Optional[Dict[str, Any]] = None) -> "WeightModel":
+        """Model from the 2-additive weights of a `ResultStore` (packed pairs in `interaction_coalitions` order)."""
+        return cls(
+            ids=list(ids),
+            input_scale=np.asarray(input_scale, dtype=float),
+            output_scale=np.asarray(output_scale, dtype=float),
+            inputs=np.asarray(inputs, dtype=float),
+            outputs=np.asarray(outputs, dtype=float),
+            efficiency=np.array(store.efficiency, dtype=float),
+            input_capacity=_capacities(store.weights_input, interaction_coalitions(store.n_inputs, 2),
+                                       store.interactions_input),
+            output_capacity=_capacities(store.weights_output, interaction_coalitions(store.n_outputs, 2),
+                                        store.interactions_output),
+            meta=dict(meta or {}),
+        )
+
+    @classmethod
+    def from_solver(cls, solver, solutions: Optional[List[Optional[Dict[str, Any]]]] = None) -> "WeightModel":
+        """
+        Model from `ChoquetDEASolver` self-evaluations (solved here unless passed in). The
+        solver works on raw data, so the scales are 1; DMUs without a solution get zero
+        weights and efficiency.
+        """
+        if solutions is None:
+            solutions = [solver.solve_self_evaluation(d) for d in range(len(solver.dmus))]
+        sides = []
+        for criteria, coalitions, key in ((solver.inputs, solver.input_pairs, 'v'),
+                                          (solver.outputs, solver.output_pairs, 'u')):
+            names = [c.name for c in criteria]
+            index = {name: t for t, name in enumerate(names)}
+            members = [tuple(index[name] for name in S) for S in coalitions]
+            singletons = np.array([[s[f'{key}_weights'][name] if s else 0.0 for name in names] for s in solutions])
+            weights = np.array([[s[f'{key}_int_weights'][S] if s else 0.0 for S in coalitions] for s in solutions])
+            data = np.array([[getattr(dmu, 'inputs' if key == 'v' else 'outputs')[name] for name in names]
+                             for dmu in solver.dmus])
+            sides.append((data, _capacities(singletons, members, weights.reshape(len(solutions), len(coalitions)))))
+        (X, input_capacity), (Y, output_capacity) = sides
+        return cls(
+            ids=[str(dmu.name) for dmu in solver.dmus],
+            input_scale=np.ones(X.shape[1]),
+            output_scale=np.ones(Y.shape[1]),
+            inputs=X,
+            outputs=Y,
+            efficiency=np.array([s['efficiency_self'] if s else 0.0 for s in solutions], dtype=float),
+            input_capacity=input_capacity,
+            output_capacity=output_capacity,
+            meta={'source': 'solver', 'theta': solver.theta, 'k': solver.k},
+        )
+
+    def cross_matrix(self, inputs: np.ndarray, outputs: np.ndarray) -> np.ndarray:
+        """
+        Efficiency of every new DMU (rows, raw data) under every rater's frozen weights
+        (columns): Cy_d(y) / Cx_d(x). NaN for raters without weights or a zero input
+        aggregate. Values above 1 mean the new DMU beats the frozen frontier there.
+        """
+        X = np.atleast_2d(np.asarray(inputs, dtype=float)) / self.input_scale
+        Y = np.atleast_2d(np.asarray(outputs, dtype=float)) / self.output_scale
+        if X.shape[1] != len(self.input_scale) or Y.shape[1] != len(self.output_scale):
+            raise ValueError("New data must have the model's input and output columns")
+        cx = integral_matrix(X) @ self.input_capacity.T
+        cy = integral_matrix(Y) @ self.output_capacity.T
+        valid = (cx > 1e-12) & (self.efficiency > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(valid, cy / np.where(valid, cx, 1.0), np.nan)
+
+    def score_new(self, inputs: np.ndarray, outputs: np.ndarray) -> np.ndarray:
+        """
+        Cross-efficiency of new DMUs against the frozen frontier: the mean of
+        `cross_matrix` over the raters. This is the peer-appraisal cross-efficiency of
+        the self-evaluation weights; the fairness choice among alternative optima needs
+        the LP pipeline.
+        """
+        return np.nanmean(self.cross_matrix(inputs, outputs), axis=1)
+
+    def save(self, path: str):
+        arrays = {name: getattr(self, name) for name in ('input_scale', 'output_scale', 'inputs', 'outputs',
+                                                          'efficiency', 'input_capacity', 'output_capacity')}
+        header = {'version': FORMAT_VERSION, 'ids': self.ids, 'meta': self.meta}
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, header=np.array(json.dumps(header)), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "WeightModel":
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            if header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported weight model version {header.get('version')}")
+            arrays = {name: data[name] for name in data.files if name != 'header'}
+        return cls(ids=header['ids'], meta=header['meta'], **arrays)
@@ -1,22 +1,57 @@
 
 import pulp
 import polars as pl
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional, Iterable
 from ..models import Dataset, DMU
+from ..dea_br.kadditive import interaction_coalitions
+from ..dea_br.export import LPBatch, from_pulp
+from ..dea_br.peers import peer_matrix
+
+MONOTONICITY = ('exact', 'legacy')
 
 class ChoquetDEASolver:
-    def __init__(self, dataset: Dataset, theta: float = 3.0):
+    """
+    Choquet DEA cross-efficiency for a `Dataset` of salespeople.
+
+    monotonicity='exact' keeps every capacity monotone with the compact negative-part
+    formulation (one auxiliary variable per interaction, see `_add_sparse_monotonicity`);
+    exact for k=2 and sufficient for k > 2. 'legacy' keeps the earlier
+    v_i + sum v_ij >= 0.0001, v_i >= 0 rows (2-additive only), which admit
+    non-monotone capacities.
+
+    If a `recorder` (`export.LPBatch`) is given, every solved self-evaluation LP is
+    added to it in matrix form for offline replay.
+    """
+    def __init__(self, dataset: Dataset, theta: float = 3.0, k: int = 2, monotonicity: str = 'exact',
+                 recorder: Optional[LPBatch] = None):
+        if k < 2:
+            raise ValueError(f"k must be at least 2, got {k}")
+        if monotonicity not in MONOTONICITY:
+            raise ValueError(f"Unknown monotonicity '{monotonicity}', expected one of {MONOTONICITY}")
+        if monotonicity == 'legacy' and k != 2:
+            raise ValueError("Legacy monotonicity rows are only defined for k=2")
         self.dataset = dataset
         self.theta = theta
+        self.k = k
+        self.monotonicity = monotonicity
+        self.recorder = recorder
         self.dmus = dataset.get_dmu_data(dmu_id_col="Salesperson") # parameterized ID col? We'll assume 'Salesperson' for now or make it dynamic later.
         
         # We need to access variables to know which are inputs and outputs
         self.inputs = [v for v in self.dataset.variables if v.type == 'input']
         self.outputs = [v for v in self.dataset.variables if v.type == 'output']
         
-        # Interaction pairs (for 2-additive measure)
-        self.input_pairs = self._generate_pairs([v.name for v in self.inputs])
-        self.output_pairs = self._generate_pairs([v.name for v in self.outputs])
+        # Interaction pairs (for 2-additive measure); coalitions of up to k criteria for k > 2
+        if k == 2:
+            self.input_pairs = self._generate_pairs([v.name for v in self.inputs])
+            self.output_pairs = self._generate_pairs([v.name for v in self.outputs])
+        else:
+            self.input_pairs = self._generate_coalitions([v.name for v in self.inputs], 'inputs')
+            self.output_pairs = self._generate_coalitions([v.name for v in self.outputs], 'outputs')
+
+        # Interaction terms involving each criterion, shared by the monotonicity and balance rows
+        self.input_members = {inp.name: [p for p in self.input_pairs if inp.name in p] for inp in self.inputs}
+        self.output_members = {out.name: [p for p in self.output_pairs if out.name in p] for out in self.outputs}
 
     def _generate_pairs(self, names: List[str]) -> List[Tuple[str, str]]:
         pairs = []
@@ -25,24 +60,34 @@ class ChoquetDEASolver:
                 pairs.append((names[i], names[j]))
         return pairs
 
+    def _generate_coalitions(self, names: List[str], side: str) -> List[Tuple[str, ...]]:
+        # k-additive: only coalitions whose minimum varies across DMUs get a Mobius weight
+        coalitions = []
+        for S in interaction_coalitions(len(names), self.k):
+            members = [names[t] for t in S]
+            minima = [min(getattr(dmu, side)[name] for name in members) for dmu in self.dmus]
+            if max(minima) - min(minima) > 1e-12:
+                coalitions.append(tuple(members))
+        return coalitions
+
     def _calculate_choquet_value(self, values: Dict[str, float], weights_v: Dict[str, float], weights_I: Dict[Tuple[str,str], float], item_names: List[str], pairs: List[Tuple[str,str]]) -> Any:
         # Choquet Integral (Mobius representation for 2-additive):
-        # f(x) = sum(v_i * x_i) + sum(v_ij * min(x_i, x_j))
+        # f(x) = sum(v_i * x_i) + sum(v_ij * min(x_i, x_j)), and min over each coalition for k > 2
         
         linear_term = pulp.lpSum([weights_v[name] * values[name] for name in item_names])
-        interaction_term = pulp.lpSum([weights_I[pair] * min(values[pair[0]], values[pair[1]]) for pair in pairs])
+        interaction_term = pulp.lpSum([weights_I[pair] * min(values[name] for name in pair) for pair in pairs])
         
         return linear_term + interaction_term
 
     def _calculate_choquet_value_numerical(self, values: Dict[str, float], weights_v: Dict[str, float], weights_I: Dict[Tuple[str,str], float], item_names: List[str], pairs: List[Tuple[str,str]]) -> float:
         # Numerical version for cross-evaluation
         linear_term = sum([weights_v[name] * values[name] for name in item_names])
-        interaction_term = sum([weights_I[pair] * min(values[pair[0]], values[pair[1]]) for pair in pairs])
+        interaction_term = sum([weights_I[pair] * min(values[name] for name in pair) for pair in pairs])
         return linear_term + interaction_term
 
-    def solve_self_evaluation(self, dmu_idx: int) -> Dict[str, Any]:
+    def build_self_evaluation(self, dmu_idx: int) -> Tuple[pulp.LpProblem, Dict, Dict, Dict, Dict]:
         """
-        Solves the LPP for the specific DMU to find optimal weights.
+        Builds the LPP for the specific DMU; returns it with the v, v_int, u, u_int variables.
         """
         target_dmu = self.dmus[dmu_idx]
         prob = pulp.LpProblem(f"DEA_Choquet_{target_dmu.id}", pulp.LpMaximize)
@@ -50,11 +95,11 @@ class ChoquetDEASolver:
         # --- Decision Variables ---
         # Weights for inputs (v_i) and interactions (v_ij)
         v = {inp.name: pulp.LpVariable(f"v_{inp.name}", lowBound=None) for inp in self.inputs} # Mobius weights can be negative, but monotonicity constraints apply
-        v_int = {pair: pulp.LpVariable(f"v_{pair[0]}_{pair[1]}", lowBound=None) for pair in self.input_pairs}
+        v_int = {pair: pulp.LpVariable("v_" + "_".join(pair), lowBound=None) for pair in self.input_pairs}
         
         # Weights for outputs (u_r) and interactions (u_rq)
         u = {out.name: pulp.LpVariable(f"u_{out.name}", lowBound=None) for out in self.outputs}
-        u_int = {pair: pulp.LpVariable(f"u_{pair[0]}_{pair[1]}", lowBound=None) for pair in self.output_pairs}
+        u_int = {pair: pulp.LpVariable("u_" + "_".join(pair), lowBound=None) for pair in self.output_pairs}
 
         # --- Objective Function ---
         # Maximize Efficiency of target_dmu: output_choquet
@@ -74,59 +119,37 @@ class ChoquetDEASolver:
             prob += (out_k - inp_k <= 0, f"FrontierConstraint_{k_idx}")
 
         # 3. Monotonicity Constraints
-        # For Inputs: v_i + sum_{j!=i} v_ij >= 0  (Simplified condition for 2-additive capacity monotonicity)
-        # Actually proper monotonicity condition is:
-        # For every i, and every S subset of M\{i}, Capacity(S U {i}) >= Capacity(S).
-        # In Mobius terms for 2-additive:
-        # v_i + sum_{j \in S} v_ij >= 0 for all S.
-        # Sufficient condition often used: v_i >= 0 and v_i + sum(v_ij for all j) >= 0 ?
-        # Let's stick to the workflow formula: "v_i + sum v_ij >= 0"
-        # I will assume this means: for each i, v_i + sum_{j that interact with i} v_ij >= 0 ??
-        # Or simply v_i >= 0 ?? 
-        # The workflow says: "v_i + sum v_{ij} >= 0". This is ambiguous.
-        # Let's use the standard condition for non-negative marginal contribution in 2-additive measures:
-        # v_i + sum_{j \in A} v_ij >= 0 for all subsets A \subseteq M\{i}.
-        # To avoid exponential constraints, we can enforce:
-        # v_i + sum_{j: v_ij < 0} v_ij >= 0 (Conservative Monotonicity) - Ensures monotonicity everywhere.
-        
-        # Let's implement Conservative Monotonicity for inputs
-        for inp in self.inputs:
-            # We strictly need v_i + sum of minimal interactions >= 0
-            # But pulp cannot handle conditional logic inside sum easily without binaries or tricks.
-            # Simplified approach often accepted in Choquet DEA papers:
-            # v_i >= 0 and v_i + \sum_{j} v_ij >= 0 ??
-            # Wait, Mobius weights v_i usually unconstrained sign, but generally v_i >= 0 is a good base.
-            # Let's apply: v_i >= 0
-            # And v_ij can be negative?
-            # Workflow says: "v_i + sum v_ij >= 0".
-            # I will interpret as: For each i: v_i + sum_{j!=i} min(0, v_ij) >= 0 ? No non-linear.
-            # Let's just sum all interactions involving i.
-            
-            related_pairs = [p for p in self.input_pairs if inp.name in p]
-            prob += (v[inp.name] + pulp.lpSum([v_int[p] for p in related_pairs]) >= 0.0001, f"Monotonicity_Input_{inp.name}") # epsilon for strict positivity?
-            prob += (v[inp.name] >= 0, f"NonNeg_Input_{inp.name}")
+        if self.monotonicity == 'exact':
+            # v_i plus the negative parts of i's interactions >= 0: monotone on every subset
+            self._add_sparse_monotonicity(prob, v, v_int, self.input_members, "Input")
+            self._add_sparse_monotonicity(prob, u, u_int, self.output_members, "Output")
+        else:
+            # Legacy sum rule v_i + sum_j v_ij >= eps, kept for comparison; not monotone in general
+            for inp in self.inputs:
+                related_pairs = self.input_members[inp.name]
+                prob += (v[inp.name] + pulp.lpSum([v_int[p] for p in related_pairs]) >= 0.0001, f"Monotonicity_Input_{inp.name}")
+                prob += (v[inp.name] >= 0, f"NonNeg_Input_{inp.name}")
 
-        # Same for outputs
-        for out in self.outputs:
-            related_pairs_u = [p for p in self.output_pairs if out.name in p]
-            prob += (u[out.name] + pulp.lpSum([u_int[p] for p in related_pairs_u]) >= 0.0001, f"Monotonicity_Output_{out.name}")
-            prob += (u[out.name] >= 0, f"NonNeg_Output_{out.name}")
+            for out in self.outputs:
+                related_pairs_u = self.output_members[out.name]
+                prob += (u[out.name] + pulp.lpSum([u_int[p] for p in related_pairs_u]) >= 0.0001, f"Monotonicity_Output_{out.name}")
+                prob += (u[out.name] >= 0, f"NonNeg_Output_{out.name}")
 
 
         # 4. Weight Balance Constraints (Theta)
         # Max(Imp) / Min(Imp) <= Theta  => Max(Imp) <= Theta * Min(Imp)
         # This implies: Imp_i <= Theta * Imp_j for all pairs i,j.
-        # Importance (Shapley): Phi_i = v_i + 0.5 * sum_{j!=i} v_ij
+        # Importance (Shapley): Phi_i = v_i + 0.5 * sum_{j!=i} v_ij  (v_S / |S| for k-additive coalitions)
         
         imp_inputs = {}
         for inp in self.inputs:
-            related_pairs = [p for p in self.input_pairs if inp.name in p]
-            imp_inputs[inp.name] = v[inp.name] + 0.5 * pulp.lpSum([v_int[p] for p in related_pairs])
+            related_pairs = self.input_members[inp.name]
+            imp_inputs[inp.name] = v[inp.name] + pulp.lpSum([v_int[p] * (1.0 / len(p)) for p in related_pairs])
         
         imp_outputs = {}
         for out in self.outputs:
-            related_pairs_u = [p for p in self.output_pairs if out.name in p]
-            imp_outputs[out.name] = u[out.name] + 0.5 * pulp.lpSum([u_int[p] for p in related_pairs_u])
+            related_pairs_u = self.output_members[out.name]
+            imp_outputs[out.name] = u[out.name] + pulp.lpSum([u_int[p] * (1.0 / len(p)) for p in related_pairs_u])
 
         # Add pairwise constraints for Input Importance
         for name_a in imp_inputs:
@@ -140,9 +163,20 @@ class ChoquetDEASolver:
                 if name_a == name_b: continue
                 prob += (imp_outputs[name_a] <= self.theta * imp_outputs[name_b], f"Balance_Output_{name_a}_{name_b}")
 
+        return prob, v, v_int, u, u_int
+
+    def solve_self_evaluation(self, dmu_idx: int) -> Dict[str, Any]:
+        """
+        Solves the LPP for the specific DMU to find optimal weights.
+        'lambdas' holds the duals of the frontier constraints, one per DMU (see `peers`).
+        """
+        prob, v, v_int, u, u_int = self.build_self_evaluation(dmu_idx)
 
         # Solve
         prob.solve(pulp.PULP_CBC_CMD(msg=False))
+        if self.recorder is not None:
+            optimal = pulp.LpStatus[prob.status] == 'Optimal'
+            self.recorder.add(from_pulp(prob), 'self', pulp.value(prob.objective) if optimal else float('nan'))
         
         if pulp.LpStatus[prob.status] != 'Optimal':
             return None
@@ -158,16 +192,84 @@ class ChoquetDEASolver:
             "v_int_weights": weights_v_int_val,
             "u_weights": weights_u_val,
             "u_int_weights": weights_u_int_val,
-            "efficiency_self": pulp.value(prob.objective)
+            "efficiency_self": pulp.value(prob.objective),
+            "lambdas": [max(prob.constraints[f"FrontierConstraint_{k}"].pi or 0.0, 0.0) for k in range(len(self.dmus))],
         }
 
-    def compute_cross_efficiency(self) -> pl.DataFrame:
+    def peer_matrix(self, solutions: Optional[List[Optional[Dict[str, Any]]]] = None):
+        """
+        CSR peer-weight matrix from the frontier duals of the self-evaluations (see
+        `peers.peer_matrix`); solved here unless the solutions are passed in.
+        """
+        if solutions is None:
+            solutions = [self.solve_self_evaluation(d) for d in range(len(self.dmus))]
+        return peer_matrix([s['lambdas'] if s is not None else None for s in solutions])
+
+    def _add_sparse_monotonicity(self, prob, weights, interactions, members, label):
+        # Monotonicity needs v_i + sum_{j in A} v_ij >= 0 for every subset A; the binding A
+        # collects the negative v_ij, so v_i + sum_j min(0, v_ij) >= 0 is exact for k=2
+        # (sufficient for k > 2). Linearized with n_S >= -v_S, n_S >= 0:
+        # v_i - sum_{S containing i} n_S >= 0. One row per criterion and one per coalition.
+        neg = {S: pulp.LpVariable(f"n_{label}_" + "_".join(S), lowBound=0) for S in interactions}
+        for S in interactions:
+            prob += (neg[S] + interactions[S] >= 0, f"NegPart_{label}_" + "_".join(S))
+        for name, related in members.items():
+            prob += (weights[name] - pulp.lpSum([neg[S] for S in related]) >= 0, f"Monotonicity_{label}_{name}")
+
+    def _importances(self, solution: Dict[str, Any]) -> Tuple[List[float], List[float]]:
+        # Shapley importance Phi_i = v_i + sum_{S containing i} v_S / |S|, numerically
+        imp_in = [solution["v_weights"][inp.name] + sum(solution["v_int_weights"][p] / len(p) for p in self.input_members[inp.name])
+                  for inp in self.inputs]
+        imp_out = [solution["u_weights"][out.name] + sum(solution["u_int_weights"][p] / len(p) for p in self.output_members[out.name])
+                   for out in self.outputs]
+        return imp_in, imp_out
+
+    def satisfies_balance(self, solution: Dict[str, Any], theta: float, tol: float = 1e-7) -> bool:
+        """True if the weights of `solution` satisfy the pairwise balance rows Imp_a <= theta * Imp_b."""
+        for imps in self._importances(solution):
+            for a in range(len(imps)):
+                for b in range(len(imps)):
+                    if a != b and imps[a] > theta * imps[b] + tol:
+                        return False
+        return True
+
+    def sweep_theta(self, thetas: Iterable[float]) -> pl.DataFrame:
+        """
+        Cross-efficiency for several balance parameters in one call.
+
+        Lowering theta only tightens the balance rows (importances are non-negative under
+        the monotonicity rows), so thetas are visited in decreasing order and an optimal
+        solution from the previous theta that still satisfies the tighter rows is reused
+        as-is instead of re-solving the DMU's LP. A reused solution is optimal, but where
+        the LP has alternative optima it may differ from the one a cold solve would pick.
+
+        Returns the `compute_cross_efficiency` frames stacked, with a 'theta' column.
+        """
+        original_theta = self.theta
+        solutions: List[Optional[Dict[str, Any]]] = [None] * len(self.dmus)
+        frames = []
+        try:
+            for theta in sorted(set(float(t) for t in thetas), reverse=True):
+                self.theta = theta
+                for d_idx, previous in enumerate(solutions):
+                    if previous is None or not self.satisfies_balance(previous, theta):
+                        solutions[d_idx] = self.solve_self_evaluation(d_idx)
+                frames.append(self.compute_cross_efficiency(solutions).with_columns(pl.lit(theta).alias("theta")))
+        finally:
+            self.theta = original_theta
+        return pl.concat(frames)
+
+    def compute_cross_efficiency(self, solutions: Optional[List[Optional[Dict[str, Any]]]] = None) -> pl.DataFrame:
+        """
+        Average cross-efficiency of every DMU. Self-evaluation solutions are computed
+        here unless already available (one per DMU, as returned by `solve_self_evaluation`).
+        """
         n = len(self.dmus)
         cross_eff_matrix = [[0.0] * n for _ in range(n)] # rows: rating DMU (d), cols: rated DMU (k)
         
         for d_idx in range(n):
             # 1. Self-Evaluation for DMU d
-            solution = self.solve_self_evaluation(d_idx)
+            solution = solutions[d_idx] if solutions is not None else self.solve_self_evaluation(d_idx)
             if solution is None:
                 print(f"Warning: Solution not found for DMU {self.dmus[d_idx].id}")
                 continue
@@ -0,0 +1,58 @@
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.choquet import DMU, normalize_data
+from src.models import Dataset
+
+# Four salespeople with three inputs and two outputs, the default pipeline example
+SALES_X = np.array([[4, 7, 8], [5, 9, 7], [4, 6, 5], [5, 9, 8]], dtype=float)
+SALES_Y = np.array([[6, 4], [7, 7], [5, 7], [6, 2]], dtype=float)
+
+
+def build_dmus(X=SALES_X, Y=SALES_Y, names=None):
+    """Fresh normalized DMUs for the rows of X and Y (named A, B, ... unless given)."""
+    names = names or [chr(ord("A") + i) for i in range(len(X))]
+    return normalize_data([
+        DMU(name, np.array(x, dtype=float), np.array(y, dtype=float)) for name, x, y in zip(names, X, Y)
+    ])
+
+
+@pytest.fixture
+def make_dmus():
+    """Factory fixture: `make_dmus()` for the sales example, `make_dmus(X, Y)` for other data."""
+    return build_dmus
+
+
+# Raw sales records for the ChoquetDEASolver tests; every test takes the columns and rows it needs
+SALES = pl.DataFrame({
+    "Salesperson": ["A", "B", "C", "D", "E"],
+    "Hours": [160, 180, 150, 160, 120],
+    "Visits": [40, 50, 30, 45, 35],
+    "Calls": [90, 70, 80, 60, 95],
+    "Orders": [10, 12, 5, 11, 9],
+    "Units": [500, 600, 250, 550, 480],
+    "Revenue": [50000, 60000, 25000, 55000, 47000],
+})
+
+
+def build_dataset(inputs, outputs, n=len(SALES)):
+    """A Dataset over the first n sales records, with Revenue as the efficacy variable."""
+    dataset = Dataset()
+    for k, name in enumerate(inputs, 1):
+        dataset.define_variable(name, f"x{k}", "input")
+    for k, name in enumerate(outputs, 1):
+        dataset.define_variable(name, f"y{k}", "output")
+    dataset.define_variable("Revenue", "Z", "efficacy")
+    dataset.load_from_dataframe(SALES.head(n).select(["Salesperson", *inputs, *outputs, "Revenue"]))
+    return dataset
+
+
+@pytest.fixture
+def sales_dataset():
+    """Factory fixture: `sales_dataset(["Hours", "Visits"], ["Orders"], n=3)`."""
+    return build_dataset
@@ -0,0 +1,37 @@
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.bootstrap import _pseudo_efficiencies, bootstrap_scores
+
+X = np.array([[7, 7, 7], [5, 9, 7], [4, 6, 5], [5, 9, 8]], dtype=float)
+Y = np.array([[4, 4], [7, 7], [5, 7], [6, 2]], dtype=float)
+IDS = ["A", "B", "C", "D"]
+
+
+def test_intervals_and_rank_stability():
+    result = bootstrap_scores(IDS, X, Y, n_replicates=6, seed=1)
+
+    frame = result.to_frame()
+    assert frame.height == 4
+    assert np.all(result.lower <= result.upper)
+    assert np.all((result.rank_stability >= 0) & (result.rank_stability <= 1))
+    assert np.all((result.replicates >= 0) & (result.replicates <= 1.0001))
+
+
+def test_smoothed_bootstrap_is_reproducible_across_workers():
+    serial = bootstrap_scores(IDS, X, Y, n_replicates=4, smoothed=True, seed=7)
+    parallel = bootstrap_scores(IDS, X, Y, n_replicates=4, smoothed=True, seed=7, n_jobs=2)
+
+    np.testing.assert_allclose(serial.replicates, parallel.replicates)
+
+
+def test_pseudo_efficiencies_skip_zero_scores():
+    theta = np.array([0.0, 0.6, 0.8, 1.0])
+    for smoothed in (False, True):
+        draws = _pseudo_efficiencies(theta, np.random.default_rng(0), smoothed, bandwidth=0.3)
+        assert np.all((draws > 0) & (draws <= 1.0))
+    plain = _pseudo_efficiencies(theta, np.random.default_rng(0), False, bandwidth=0.3)
+    assert set(plain) <= {0.6, 0.8, 1.0}
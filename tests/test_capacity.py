@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import sys
+import os
+from itertools import permutations
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.capacity import capacity_from_mobius, choquet_integral, integral_matrix, mobius_array, mobius_from_capacity
+from dea_br.kadditive import interaction_coalitions, mobius_features
+
+
+def test_transforms_round_trip():
+    rng = np.random.default_rng(0)
+    mobius = rng.normal(size=1 << 5)
+    mobius[0] = 0.0
+    capacity = capacity_from_mobius(mobius)
+
+    np.testing.assert_allclose(mobius_from_capacity(capacity), mobius, atol=1e-12)
+    # mu({0, 2}) = m({0}) + m({2}) + m({0, 2})
+    assert capacity[0b101] == pytest.approx(mobius[0b001] + mobius[0b100] + mobius[0b101])
+
+
+@pytest.mark.parametrize('k', [2, 3])
+def test_kernel_matches_k_additive_features(k):
+    rng = np.random.default_rng(k)
+    values = rng.uniform(0, 1, (500, 4))
+    coalitions = interaction_coalitions(4, k)
+    weights = rng.normal(size=4 + len(coalitions))
+    features, _ = mobius_features(values, coalitions=coalitions, prune=False)
+
+    capacity = capacity_from_mobius(mobius_array(weights[:4], coalitions, weights[4:]))
+    np.testing.assert_allclose(choquet_integral(values, capacity, chunk_size=64), features @ weights, atol=1e-12)
+
+
+def test_integral_matrix_scores_many_capacities():
+    rng = np.random.default_rng(2)
+    values = rng.uniform(0, 1, (50, 3))
+    capacities = rng.uniform(0, 1, (8, 6))
+
+    np.testing.assert_allclose(integral_matrix(values) @ capacities,
+                               np.column_stack([choquet_integral(values, c) for c in capacities.T]), atol=1e-12)
+    assert integral_matrix(values).nnz == values.size
+
+
+def test_kernel_matches_permutation_definition():
+    rng = np.random.default_rng(1)
+    capacity = np.concatenate([[0.0], np.sort(rng.uniform(0, 1, 7))])
+    values = rng.uniform(-1, 1, (20, 3))
+
+    def brute(x):
+        best = None
+        for order in permutations(range(3)):
+            if all(x[a] <= x[b] for a, b in zip(order, order[1:])):
+                mask, total, prev = 0b111, 0.0, 0.0
+                for t in order:
+                    total += (x[t] - prev) * capacity[mask]
+                    prev, mask = x[t], mask & ~(1 << t)
+                best = total
+        return best
+
+    np.testing.assert_allclose(choquet_integral(values, capacity), [brute(x) for x in values], atol=1e-12)
+
+    with pytest.raises(ValueError):
+        choquet_integral(values, capacity[:4])
+    with pytest.raises(ValueError):
+        mobius_array([0.1, 0.2], [(0, 2)], [0.3])
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.ccr_model import solve_ccr, solve_bcc, solve_envelopment, solve_multiplier
+from dea_br.lp import SolveStats
+
+# Two inputs, unit output (Cooper, Seiford & Tone, Example 3.2)
+X = np.array([[4, 3], [7, 3], [8, 1], [4, 2], [2, 4], [10, 1]], dtype=float)
+Y = np.ones((6, 1))
+
+
+def test_envelopment_scores_and_slacks():
+    res = solve_envelopment(X, Y, batch_size=4)
+
+    np.testing.assert_allclose(res.efficiency, [6 / 7, 0.6316, 1, 1, 1, 1], atol=1e-4)
+    # F is radially efficient but dominated by C on the first input
+    assert res.slack_input[5, 0] == pytest.approx(2.0, abs=1e-6)
+    np.testing.assert_allclose(res.lambdas @ X + res.slack_input, res.efficiency[:, None] * X, atol=1e-8)
+
+
+def test_multiplier_matches_envelopment_with_dual_lambdas():
+    stats = SolveStats()
+    for rts in ('crs', 'vrs'):
+        env = solve_envelopment(X, Y, rts=rts, slacks=False)
+        mult = solve_multiplier(X, Y, rts=rts, stats=stats)
+        np.testing.assert_allclose(mult.efficiency, env.efficiency, atol=1e-7)
+        np.testing.assert_allclose(mult.lambdas @ Y, Y + mult.slack_output, atol=1e-7)
+    assert stats.solved['multiplier'] == 12
+
+
+def test_single_dmu_helpers_and_output_orientation():
+    X1 = np.array([[2.0], [4.0], [8.0]])
+    Y1 = np.array([[1.0], [3.0], [4.0]])
+
+    theta, lambdas = solve_ccr(X1, Y1, 0)
+    assert theta == pytest.approx(2 / 3)
+    assert lambdas.shape == (3,)
+    assert solve_bcc(X1, Y1, 0)[0] == pytest.approx(1.0)
+    np.testing.assert_allclose(solve_envelopment(X1, Y1, orientation='output').efficiency,
+                               solve_envelopment(X1, Y1).efficiency)
+    with pytest.raises(ValueError):
+        solve_envelopment(X1, Y1, rts='drs')
+
+
+def test_balanced_weights_bound_the_free_scores():
+    Xn, Yn = X / X.max(axis=0), Y / Y.max(axis=0)
+    free = solve_multiplier(Xn, Yn)
+    balanced = solve_multiplier(Xn, Yn, balance=0.5)
+
+    assert np.all(balanced.efficiency <= free.efficiency + 1e-9)
+    v = balanced.weights_input
+    assert np.all(v.min(axis=1) >= 0.5 * v.max(axis=1) - 1e-9)
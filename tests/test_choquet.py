@@ -68,5 +68,174 @@ def test_numerical_example_choquet():
     assert 'cross_efficiency' in results['A']
     assert results['A']['rank'] > 0
 
+def test_highs_backend_matches_pulp(make_dmus):
+    X = np.array([[7, 7, 7], [5, 9, 7], [4, 6, 5], [5, 9, 8]], dtype=float)
+    Y = np.array([[4, 4], [7, 7], [5, 7], [6, 2]], dtype=float)
+
+    reference = make_dmus(X, Y)
+    scores_ref, E_max_ref, E_min_ref = run_choquet_evaluation(reference, rho=0.5)
+    fast = make_dmus(X, Y)
+    scores, E_max, E_min = run_choquet_evaluation(fast, rho=0.5, backend='highs')
+
+    np.testing.assert_allclose(scores, scores_ref, atol=1e-6)
+    np.testing.assert_allclose(E_max, E_max_ref, atol=1e-6)
+    np.testing.assert_allclose(E_min, E_min_ref, atol=1e-6)
+    assert [d.satisfaction for d in fast] == [d.satisfaction for d in reference]
+
+    with pytest.raises(ValueError):
+        run_choquet_evaluation(make_dmus(X, Y), backend='glpk')
+
+def test_screening_skips_efficient_self_lps(make_dmus):
+    from dea_br.lp import SolveStats
+
+    cold = make_dmus()
+    run_choquet_evaluation(cold, rho=0.5, backend='highs')
+    stats = SolveStats()
+    screened = make_dmus()
+    run_choquet_evaluation(screened, rho=0.5, backend='highs', stats=stats, screening=True)
+
+    np.testing.assert_allclose([d.efficiency_ccr for d in screened], [d.efficiency_ccr for d in cold], atol=1e-6)
+    assert stats.solved['screening'] == len(screened)
+    assert stats.avoided.get('self', 0) >= 1
+    assert stats.solved.get('self', 0) + stats.avoided['self'] == len(screened)
+
+def test_single_lp_principles_share_the_target_sweep(make_dmus):
+    from dea_br.lp import SolveStats
+
+    fair = make_dmus()
+    run_choquet_evaluation(fair, backend='highs')
+    for principle in ('utilitarianism', 'equity'):
+        stats = SolveStats()
+        dmus = make_dmus()
+        scores, E_max, E_min = run_choquet_evaluation(dmus, backend='highs', stats=stats, principle=principle)
+
+        assert stats.solved['satisfaction'] + stats.avoided.get('satisfaction', 0) == len(dmus)
+        assert all(0.0 <= d.satisfaction <= 1.0 for d in dmus)
+        assert np.all(scores > 0.0) and np.all(scores <= 1.0 + 1e-6)
+
+    # The linearized max-min cannot beat the exact common level found by bisection
+    equity = make_dmus()
+    run_choquet_evaluation(equity, backend='highs', principle='equity')
+    assert all(e.satisfaction <= f.satisfaction + 1e-3 for e, f in zip(equity, fair))
+
+    with pytest.raises(ValueError):
+        run_choquet_evaluation(make_dmus(), principle='egalitarian')
+
+def test_single_lp_principles_agree_across_backends(make_dmus):
+    # Seed 3 gives a DMU whose CBC-rounded E_d makes the equity LP infeasible unless relaxed
+    rng = np.random.default_rng(3)
+    X, Y = rng.uniform(1, 10, (8, 3)), rng.uniform(1, 10, (8, 2))
+    for principle in ('utilitarianism', 'equity'):
+        highs = make_dmus(X, Y)
+        scores_highs, _, _ = run_choquet_evaluation(highs, backend='highs', principle=principle)
+        cbc = make_dmus(X, Y)
+        scores_cbc, _, _ = run_choquet_evaluation(cbc, principle=principle)
+
+        # The optimum is unique, the weights reaching it need not be: rows may differ slightly
+        np.testing.assert_allclose([d.satisfaction for d in cbc], [d.satisfaction for d in highs], atol=1e-4)
+        np.testing.assert_allclose(scores_cbc, scores_highs, atol=1e-2)
+
+    # Nobody to satisfy: no LP, full satisfaction on both backends
+    for backend in ('pulp', 'highs'):
+        single = make_dmus(X[:1], Y[:1])
+        run_choquet_evaluation(single, backend=backend, principle='equity')
+        assert single[0].satisfaction == 1.0
+
+def test_target_pruning_matches_full_sweep(make_dmus):
+    from dea_br.lp import SolveStats
+
+    rng = np.random.default_rng(0)
+    X, Y = rng.uniform(1, 10, (8, 3)), rng.uniform(1, 10, (8, 2))
+
+    full = run_choquet_evaluation(make_dmus(X, Y), backend='highs')
+    stats = SolveStats()
+    pruned = run_choquet_evaluation(make_dmus(X, Y), backend='highs', stats=stats, prune_targets=True)
+
+    for a, b in zip(full, pruned):
+        np.testing.assert_allclose(a, b, atol=1e-6)
+    n = len(X)
+    assert stats.solved['targets'] + stats.avoided['targets'] == 2 * n * n
+    # Diagonals alone remove 1/n of the sweep; the self-efficiency bound removes more
+    assert stats.avoided_fraction('targets') > 1 / n
+
+    pulp_stats = SolveStats()
+    run_choquet_evaluation(make_dmus(X[:4], Y[:4]), stats=pulp_stats, prune_targets=True)
+    assert pulp_stats.avoided['targets'] == 2 * 4
+
 if __name__ == "__main__":
     test_numerical_example_choquet()
+
+@pytest.mark.parametrize('backend', ['pulp', 'highs'])
+def test_precision_tiers_agree_and_count_resolves(make_dmus, backend, monkeypatch):
+    from dea_br import choquet, lp
+    from dea_br.lp import SolveStats
+
+    reference, _, _ = run_choquet_evaluation(make_dmus(), backend=backend)
+    fast, _, _ = run_choquet_evaluation(make_dmus(), backend=backend, precision='fast')
+    stats = SolveStats()
+    verified, _, _ = run_choquet_evaluation(make_dmus(), backend=backend, stats=stats, precision='verified')
+
+    # Loose CBC feasibility checks are not monotone in alpha near the optimum, so the
+    # fairness level found in fast mode depends on which levels get probed
+    np.testing.assert_allclose(fast, reference, atol=1e-4 if backend == 'highs' else 1e-3)
+    np.testing.assert_allclose(verified, reference, atol=1e-6)
+    assert sum(stats.unverified.values()) == 0
+
+    # No solution passes a negative tolerance: every optimal LP is re-solved and reported
+    monkeypatch.setattr(lp, 'VERIFY_TOL', -1.0)
+    monkeypatch.setattr(choquet, 'VERIFY_TOL', -1.0)
+    stats = SolveStats()
+    rechecked, _, _ = run_choquet_evaluation(make_dmus(), backend=backend, stats=stats, precision='verified')
+    np.testing.assert_allclose(rechecked, reference, atol=1e-6)
+    assert stats.resolved['self'] == stats.unverified['self'] == 4
+    assert stats.as_dict()['resolved'] == stats.resolved
+
+    with pytest.raises(ValueError):
+        run_choquet_evaluation(make_dmus(), precision='exact')
+
+@pytest.mark.parametrize('backend', ['pulp', 'highs'])
+def test_fairness_search_lands_on_the_bisection_grid(make_dmus, backend):
+    from dea_br.choquet import SATISFACTION_STEPS, check_satisfaction_feasibility
+    from dea_br.lp import ChoquetLP, SolveStats, solve_lp
+
+    rng = np.random.default_rng(1)
+    X, Y = rng.uniform(1, 10, (8, 3)), rng.uniform(1, 10, (8, 2))
+    dmus = make_dmus(X, Y)
+    stats = SolveStats()
+    _, E_max, E_min = run_choquet_evaluation(dmus, backend=backend, stats=stats)
+
+    grid = 1 << SATISFACTION_STEPS
+    model = ChoquetLP.from_dmus(dmus)
+    for i, d in enumerate(dmus):
+        def passes(level):
+            if backend == 'pulp':
+                return check_satisfaction_feasibility(i, dmus, level / grid, E_max, E_min, 0.5)
+            return solve_lp(model.feasibility(i, level / grid, E_max, E_min, d.efficiency_ccr, 0.5)).optimal
+
+        # Where a 12-step bisection ends: the level passes and the next one up fails
+        level = d.satisfaction * grid
+        assert level == int(level)
+        assert level == 0 or passes(level)
+        assert level == grid - 1 or not passes(level + 1)
+    assert stats.solved['satisfaction'] < SATISFACTION_STEPS * len(dmus)
+
+
+@pytest.mark.parametrize('backend', ['pulp', 'highs'])
+def test_row_subsets_match_the_full_run(make_dmus, backend):
+    from dea_br.choquet import iter_choquet_evaluation
+
+    rng = np.random.default_rng(4)
+    X, Y = rng.uniform(1, 10, (7, 3)), rng.uniform(1, 10, (7, 2))
+    scores, _, _ = run_choquet_evaluation(make_dmus(X, Y), backend=backend)
+
+    for rows in ([0, 1, 2], [6, 4], [3, 5]):
+        dmus = make_dmus(X, Y)
+        found = dict(iter_choquet_evaluation(dmus, backend=backend, rows=rows))
+        assert list(found) == rows
+        np.testing.assert_allclose([found[i] for i in rows], scores[rows], atol=1e-9)
+        assert all(d.satisfaction is None for i, d in enumerate(dmus) if i not in rows)
+
+    with pytest.raises(ValueError):
+        iter_choquet_evaluation(make_dmus(X, Y), rows=[0, 0])
+    with pytest.raises(ValueError):
+        iter_choquet_evaluation(make_dmus(X, Y), rows=[0], stop_at_rank=True)
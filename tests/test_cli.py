@@ -0,0 +1,67 @@
+import json
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.cli import main
+from dea_br.evaluator import BoundedRationalityEvaluator
+
+FRAME = pl.DataFrame({
+    'rep': ['A', 'B', 'C', 'D'],
+    'hours': [4.0, 5.0, 4.0, 5.0],
+    'visits': [7.0, 9.0, 6.0, 9.0],
+    'orders': [6.0, 7.0, 5.0, 6.0],
+    'units': [4.0, 7.0, 7.0, 2.0],
+})
+
+
+@pytest.fixture
+def files(tmp_path):
+    spec = tmp_path / 'spec.json'
+    spec.write_text(json.dumps({'id': 'rep', 'inputs': ['hours', 'visits'], 'outputs': ['orders', 'units']}))
+    data = tmp_path / 'data'
+    data.mkdir()
+    FRAME.write_csv(data / 'march.csv')
+    FRAME.with_columns(pl.col('units') * 1.5).write_parquet(data / 'april.parquet')
+    return tmp_path, str(spec), str(data)
+
+
+def test_batch_run_writes_one_report_per_file(files):
+    tmp_path, spec, data = files
+    out, cache = str(tmp_path / 'out'), str(tmp_path / 'cache')
+    args = [spec, os.path.join(data, '*'), '-o', out, '--backend', 'highs', '-j', '2', '--cache-dir', cache, '--profile']
+    assert main(args) == 0
+
+    march = pl.read_parquet(os.path.join(out, 'march.parquet'))
+    expected = BoundedRationalityEvaluator(backend='highs').evaluate(
+        FRAME['rep'].to_list(), FRAME.select(['hours', 'visits']).to_numpy(),
+        FRAME.select(['orders', 'units']).to_numpy(), output='polars')
+    np.testing.assert_allclose(march['cross_efficiency'].to_numpy(), expected['cross_efficiency'].to_numpy())
+    assert march['source'].unique().to_list() == ['march.csv']
+    assert os.path.exists(os.path.join(out, 'april.parquet'))
+
+    profiles = json.load(open(os.path.join(out, 'profile.json')))
+    assert len(profiles) == 2 and not any(p['cached'] for p in profiles)
+    assert {'self', 'targets', 'satisfaction'} <= set(profiles[0]['stages'])
+
+    # Unchanged files come from the cache; CSV reports match the Parquet ones
+    assert main([spec, os.path.join(data, 'march.csv'), '-o', out, '--backend', 'highs',
+                 '--cache-dir', cache, '--format', 'csv', '--profile']) == 0
+    profiles = json.load(open(os.path.join(out, 'profile.json')))
+    assert profiles[0]['cached']
+    np.testing.assert_allclose(pl.read_csv(os.path.join(out, 'march.csv'))['cross_efficiency'].to_numpy(),
+                               march['cross_efficiency'].to_numpy())
+
+
+def test_bad_arguments_exit_with_usage_error(files):
+    tmp_path, spec, data = files
+    with pytest.raises(SystemExit):
+        main([spec, os.path.join(data, '*.xls'), '-o', str(tmp_path / 'out')])
+    bad = tmp_path / 'bad.json'
+    bad.write_text(json.dumps({'id': 'rep', 'inputs': [], 'outputs': ['orders']}))
+    with pytest.raises(SystemExit):
+        main([str(bad), os.path.join(data, 'march.csv'), '-o', str(tmp_path / 'out')])
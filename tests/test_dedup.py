@@ -0,0 +1,67 @@
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.choquet import run_choquet_evaluation
+from dea_br.dedup import unique_rows
+from dea_br.lp import ChoquetLP, LPCache, SolveStats
+from dea_br.storage import ResultStore
+
+X = np.array([[4, 7, 8], [5, 9, 7], [4, 7, 8], [4, 6, 5], [5, 9, 8], [4, 6, 5]], dtype=float)
+Y = np.array([[6, 4], [7, 7], [6, 4], [5, 7], [6, 2], [5, 7]], dtype=float)
+
+
+def test_unique_rows_keep_first_occurrence_order():
+    index, inverse, counts = unique_rows(np.hstack([X, Y]))
+
+    np.testing.assert_array_equal(index, [0, 1, 3, 4])
+    np.testing.assert_array_equal(inverse, [0, 1, 0, 2, 3, 2])
+    np.testing.assert_array_equal(counts, [2, 1, 2, 1])
+
+
+def test_dedup_matches_full_run_with_fewer_lps(make_dmus):
+    full_stats, dedup_stats = SolveStats(), SolveStats()
+    full = make_dmus(X, Y)
+    full_store = ResultStore(6, 3, 2)
+    scores_ref, E_max_ref, E_min_ref = run_choquet_evaluation(full, backend='highs', stats=full_stats, store=full_store)
+    reduced = make_dmus(X, Y)
+    store = ResultStore(6, 3, 2)
+    scores, E_max, E_min = run_choquet_evaluation(reduced, backend='highs', stats=dedup_stats, store=store, dedup=True)
+
+    np.testing.assert_allclose(scores, scores_ref, atol=1e-6)
+    np.testing.assert_allclose(E_max, E_max_ref, atol=1e-6)
+    np.testing.assert_allclose(E_min, E_min_ref, atol=1e-6)
+    np.testing.assert_allclose(store.efficiency, full_store.efficiency, atol=1e-6)
+    assert [d.satisfaction for d in reduced] == [d.satisfaction for d in full]
+    assert dedup_stats.avoided['dedup'] == 2
+    assert dedup_stats.solved['targets'] == 2 * 4 * 4
+    assert dedup_stats.total_solved < full_stats.total_solved
+
+
+def test_cache_answers_repeated_instances(make_dmus):
+    model = ChoquetLP.from_dmus(make_dmus(X, Y))
+    cache, stats = LPCache(), SolveStats()
+
+    first = cache.solve(model.self_efficiency(1, 0.5), stats, 'self')
+    again = cache.solve(model.self_efficiency(1, 0.5), stats, 'self')
+    cache.solve(model.self_efficiency(1, 0.6), stats, 'self')
+
+    assert again is first
+    assert stats.solved['self'] == 2 and stats.avoided['self'] == 1
+    assert len(cache) == 2
+
+
+def test_dedup_weights_single_lp_principles(make_dmus):
+    rng = np.random.default_rng(3)
+    X8, Y8 = rng.uniform(1, 10, (8, 3)), rng.uniform(1, 10, (8, 2))
+    X8[5], Y8[5], X8[7], Y8[7] = X8[1], Y8[1], X8[2], Y8[2]
+    for principle in ('utilitarianism', 'equity'):
+        full = make_dmus(X8, Y8)
+        scores_ref, _, _ = run_choquet_evaluation(full, backend='highs', principle=principle)
+        reduced = make_dmus(X8, Y8)
+        scores, _, _ = run_choquet_evaluation(reduced, backend='highs', principle=principle, dedup=True)
+
+        np.testing.assert_allclose(scores, scores_ref, atol=1e-6)
+        np.testing.assert_allclose([d.satisfaction for d in reduced], [d.satisfaction for d in full], atol=1e-6)
@@ -62,3 +62,40 @@ class TestEvaluator:
         assert 'category' in results['E2']
         
 
+
+    def test_columnar_output_matches_dict(self):
+        """Test that columnar output carries the same ranking as the dict output."""
+        evaluator = BoundedRationalityEvaluator()
+
+        X = np.array([[10.0], [10.0], [10.0], [10.0]])
+        Y = np.array([[50.0], [100.0], [80.0], [100.0]])
+        ids = ['E1', 'E2', 'E3', 'E4']
+
+        records = evaluator.evaluate(ids, X, Y)
+        columns = evaluator.evaluate(ids, X, Y, output='columns', include_targets=True)
+        frame = evaluator.evaluate(ids, X, Y, output='polars')
+
+        assert [r['rank'] for r in records.values()] == [1, 2, 3, 4]
+        for i, dmu_id in enumerate(ids):
+            assert columns['rank'][i] == records[dmu_id]['rank']
+            assert columns['category'][i] == records[dmu_id]['category']
+            assert columns['cross_efficiency'][i] == pytest.approx(records[dmu_id]['cross_efficiency'])
+        assert columns['E_max'].shape == (4, 4)
+        assert frame['rank'].to_list() == list(columns['rank'])
+
+    def test_stop_at_rank_keeps_ranks_and_categories(self):
+        """Stopping the fairness search at settled ranks needs fewer LPs."""
+        from dea_br.lp import SolveStats
+
+        rng = np.random.default_rng(4)
+        X, Y = rng.uniform(1, 10, (12, 3)), rng.uniform(1, 10, (12, 2))
+        ids = [f"S{i}" for i in range(12)]
+        full_stats, quick_stats = SolveStats(), SolveStats()
+        full = BoundedRationalityEvaluator(backend='highs').evaluate(ids, X, Y, output='columns', stats=full_stats)
+        quick = BoundedRationalityEvaluator(backend='highs', stop_at_rank=True).evaluate(
+            ids, X, Y, output='columns', stats=quick_stats)
+
+        np.testing.assert_array_equal(quick['rank'], full['rank'])
+        np.testing.assert_array_equal(quick['category'], full['category'])
+        assert np.all(quick['satisfaction'] <= full['satisfaction'])
+        assert quick_stats.solved['satisfaction'] < full_stats.solved['satisfaction']
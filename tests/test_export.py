@@ -0,0 +1,51 @@
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.choquet import run_choquet_evaluation
+from dea_br.export import LPBatch, replay
+from dea_br.lp import SolveStats
+from src.solver.choquet_dea import ChoquetDEASolver
+
+
+X = np.array([[4, 7, 8], [5, 9, 7], [4, 6, 5]], dtype=float)
+Y = np.array([[6, 4], [7, 7], [5, 7]], dtype=float)
+
+
+def test_recorded_run_round_trips_and_replays(tmp_path, make_dmus):
+    batch, stats = LPBatch(), SolveStats()
+    run_choquet_evaluation(make_dmus(X, Y), backend='highs', recorder=batch, stats=stats)
+
+    assert len(batch) == 3 + 2 * 9 + stats.solved['satisfaction']
+    # Frontier rows are shared by every LP and pooled once
+    assert batch.n_pool_rows < sum(lp.A_ub.shape[0] + lp.A_eq.shape[0] for lp, _, _ in batch)
+
+    path = str(tmp_path / "run.npz")
+    batch.save(path, mps_dir=str(tmp_path / "mps"))
+    loaded = LPBatch.load(path)
+    assert len(loaded) == len(batch)
+    assert len(os.listdir(tmp_path / "mps")) == len(batch)
+
+    highs = replay(path)
+    assert highs['match'].all()
+    assert set(highs['stage'].unique().to_list()) == {'self', 'targets', 'satisfaction'}
+
+    cbc = replay(path, backend='pulp', tol=1e-5)
+    assert cbc.filter(pl.col('stage') != 'satisfaction')['match'].all()
+
+    with pytest.raises(ValueError):
+        run_choquet_evaluation(make_dmus(X, Y), recorder=LPBatch())
+
+
+def test_solver_lps_convert_from_pulp(sales_dataset):
+    dataset = sales_dataset(["Hours", "Visits"], ["Orders"], n=3)
+    batch = LPBatch()
+    solver = ChoquetDEASolver(dataset, recorder=batch)
+    solver.compute_cross_efficiency()
+
+    assert len(batch) == 3
+    assert replay(batch, tol=1e-5)['match'].all()
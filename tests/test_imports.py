@@ -0,0 +1,45 @@
+import os
+import re
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+HEAVY = ('pandas', 'pulp', 'scipy.optimize', 'polars')
+
+
+def import_profile(statement: str):
+    """
+    Run `statement` in a fresh interpreter under -X importtime.
+
+    Returns {module: cumulative microseconds} for every module it imported. Startup cost
+    is guarded by which modules get imported, not by wall time, which depends on load.
+    """
+    env = dict(os.environ, PYTHONPATH=SRC)
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                         capture_output=True, text=True, env=env, check=True)
+    modules = {}
+    for line in out.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            modules[match.group(2)] = int(match.group(1))
+    return modules
+
+
+def heavy(modules) -> list:
+    return [m for m in HEAVY if m in modules]
+
+
+def test_package_import_is_lazy():
+    assert heavy(import_profile("import dea_br")) == []
+
+    # Public names still resolve on first access
+    modules = import_profile("from dea_br import run_choquet_evaluation, ResultStore")
+    assert 'pulp' not in modules and 'pandas' not in modules
+
+
+def test_pipeline_module_defers_solvers():
+    modules = import_profile("import dea_br.evaluator")
+    # numpy + scipy.sparse only; pandas, PuLP and scipy.optimize used to add ~0.5 s
+    assert heavy(modules) == []
+    assert 'dea_br.choquet' in modules and 'dea_br.lp' in modules
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+import sys
+import os
+from itertools import combinations
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.choquet import run_choquet_evaluation
+from dea_br.kadditive import capacity, interaction_coalitions, mobius_features, shapley_matrix
+from dea_br.lp import ChoquetLP, choquet_features, importance_matrix, solve_lp
+from src.solver.choquet_dea import ChoquetDEASolver
+
+X = np.array([[4, 7, 8, 3], [5, 9, 7, 6], [4, 6, 5, 2], [5, 9, 8, 5], [6, 8, 5, 4]], dtype=float)
+Y = np.array([[6, 4], [7, 7], [5, 7], [6, 2], [3, 6]], dtype=float)
+
+
+def test_two_additive_case_matches_pair_layout():
+    F, coalitions = mobius_features(X, k=2, prune=False)
+
+    np.testing.assert_allclose(F.toarray(), choquet_features(X))
+    np.testing.assert_allclose(shapley_matrix(4, coalitions).toarray(), importance_matrix(4))
+
+
+def test_constant_coalitions_are_pruned():
+    values = np.array([[1.0, 0.0, 0.3], [0.5, 0.0, 0.9], [0.2, 0.0, 0.4]])
+    F, coalitions = mobius_features(values, k=3)
+
+    # Every coalition containing the all-zero criterion has a constant minimum
+    assert coalitions == [(0, 2)]
+    assert F.shape == (3, 4)
+    assert len(interaction_coalitions(20, 3)) == 190 + 1140
+
+
+def test_monotone_three_additive_model():
+    model = ChoquetLP(X / X.max(axis=0), Y / Y.max(axis=0), k=3, monotone=True)
+    res = solve_lp(model.self_efficiency(0, 0.3))
+    assert res.optimal
+
+    v, u, v_int, u_int = model.split(res.x)
+    w = np.concatenate([v, v_int])
+    # Marginal contributions of every criterion are non-negative on every subset
+    for t in range(4):
+        others = [p for p in range(4) if p != t]
+        for r in range(4):
+            for T in combinations(others, r):
+                gain = capacity(w, 4, model.input_coalitions, T + (t,)) - capacity(w, 4, model.input_coalitions, T)
+                assert gain >= -1e-8
+
+
+def test_three_additive_evaluation_relaxes_two_additive(make_dmus):
+    two = make_dmus(X, Y)
+    run_choquet_evaluation(two, rho=0.5, backend='highs')
+    three = make_dmus(X, Y)
+    scores, _, _ = run_choquet_evaluation(three, rho=0.5, backend='highs', k=3)
+
+    assert np.all(np.array([d.efficiency_ccr for d in three]) >= np.array([d.efficiency_ccr for d in two]) - 1e-7)
+    assert scores.shape == (5,)
+
+    with pytest.raises(ValueError):
+        run_choquet_evaluation(make_dmus(X, Y), k=3)
+
+
+def test_solver_accepts_k(sales_dataset):
+    dataset = sales_dataset(["Hours", "Visits", "Calls"], ["Orders"], n=4)
+    solver = ChoquetDEASolver(dataset, theta=3.0, k=3)
+
+    assert ("Hours", "Visits", "Calls") in solver.input_pairs
+    solution = solver.solve_self_evaluation(0)
+    assert solution is not None
+    assert 0.0 <= solution["efficiency_self"] <= 1.0 + 1e-6
+
+
+def test_exact_monotonicity_is_default_and_monotone(sales_dataset):
+    dataset = sales_dataset(["Hours", "Visits", "Calls"], ["Orders", "Units"])
+    solver = ChoquetDEASolver(dataset, theta=3.0)
+    assert solver.monotonicity == 'exact'
+
+    names = [i.name for i in solver.inputs]
+    for d in range(len(solver.dmus)):
+        solution = solver.solve_self_evaluation(d)
+        for name in names:
+            others = [p for p in names if p != name]
+            for r in range(len(others) + 1):
+                for A in combinations(others, r):
+                    gain = solution["v_weights"][name] + sum(
+                        w for pair, w in solution["v_int_weights"].items()
+                        if name in pair and (set(pair) - {name}) <= set(A))
+                    assert gain >= -1e-7
+
+    with pytest.raises(ValueError):
+        ChoquetDEASolver(dataset, k=3, monotonicity='legacy')
@@ -0,0 +1,34 @@
+import polars as pl
+
+from src.analysis.matrix import PerformanceMatrix
+
+
+def _results():
+    return pl.DataFrame({
+        "Team": ["N", "N", "N", "S", "S", "S"],
+        "DMU": ["a", "b", "c", "d", "e", "f"],
+        "Score": [0.9, 0.5, 0.7, 0.4, 0.8, 0.6],
+        "Revenue": [100.0, 300.0, 200.0, 50.0, 10.0, 90.0],
+    })
+
+
+def test_analyze_classifies_against_means():
+    report = PerformanceMatrix().analyze(_results())
+
+    assert report["Score"].to_list() == sorted(_results()["Score"].to_list(), reverse=True)
+    codes = dict(zip(report["DMU"], report["Quadrant_Code"]))
+    assert codes == {"a": "Q2", "b": "Q3", "c": "Q1", "d": "Q4", "e": "Q2", "f": "Q4"}
+    assert report.filter(pl.col("DMU") == "c")["Quadrant_Name"].item() == "Benchmark"
+
+
+def test_grouped_median_plan_and_parquet_sink(tmp_path):
+    matrix = PerformanceMatrix()
+    plan = matrix.plan(_results().lazy(), by="Team", threshold="median", keep_thresholds=True)
+    report = plan.collect()
+
+    assert report.filter(pl.col("Team") == "S")["Threshold_Score"].unique().to_list() == [0.6]
+    assert dict(zip(report["DMU"], report["Quadrant_Code"]))["f"] == "Q1"
+
+    path = tmp_path / "report.parquet"
+    matrix.sink_parquet(_results(), str(path), by="Team", threshold=0.25)
+    assert pl.read_parquet(path).height == 6
@@ -0,0 +1,75 @@
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.evaluator import BoundedRationalityEvaluator
+from dea_br.panel import panel_evaluation
+
+X = np.array([[4, 7], [5, 9], [4, 6], [5, 9], [6, 8]], dtype=float)
+Y = np.array([[6, 4], [7, 7], [5, 7], [6, 2], [3, 6]], dtype=float)
+
+
+def make_panel(growth: float, drop_e: bool = False) -> pl.DataFrame:
+    frames = []
+    for period, factor in ((1, 1.0), (2, growth)):
+        frames.append(pl.DataFrame({
+            'rep': ['A', 'B', 'C', 'D', 'E'],
+            'month': [period] * 5,
+            'hours': X[:, 0], 'visits': X[:, 1],
+            'orders': Y[:, 0] * factor, 'units': Y[:, 1] * factor,
+        }))
+    panel = pl.concat(frames)
+    if drop_e:
+        # E leaves after the first month
+        panel = panel.filter(~((pl.col('month') == 2) & (pl.col('rep') == 'E')))
+    return panel
+
+
+def test_uniform_output_growth_is_pure_technical_change():
+    frame = panel_evaluation(make_panel(1.1), 'rep', 'month', ['hours', 'visits'], ['orders', 'units'])
+
+    assert frame.height == 10
+    later = frame.filter(pl.col('period') == 2)
+    np.testing.assert_allclose(later['malmquist'].to_numpy(), 1.1, atol=1e-6)
+    np.testing.assert_allclose(later['technical_change'].to_numpy(), 1.1, atol=1e-6)
+    np.testing.assert_allclose(later['efficiency_change'].to_numpy(), 1.0, atol=1e-6)
+    # The Choquet model is not homogeneous (importance scale z <= 1), but growth must show
+    assert np.all(later['choquet_malmquist'].to_numpy() > 1.0)
+    # No index in the first period
+    assert frame.filter(pl.col('period') == 1)['malmquist'].null_count() == 5
+
+
+def test_parallel_periods_match_serial():
+    panel = make_panel(0.9, drop_e=True)
+    serial = panel_evaluation(panel, 'rep', 'month', ['hours', 'visits'], ['orders', 'units'])
+    parallel = panel_evaluation(panel, 'rep', 'month', ['hours', 'visits'], ['orders', 'units'], n_jobs=2)
+
+    assert serial.equals(parallel)
+    assert serial.height == 9
+    assert serial.filter(pl.col('period') == 2)['malmquist'].null_count() == 0
+    with pytest.raises(ValueError):
+        panel_evaluation(panel, 'rep', 'quarter', ['hours'], ['orders'])
+
+
+def test_period_reports_match_monthly_evaluations():
+    panel = make_panel(1.2, drop_e=True)
+    frame = panel_evaluation(panel, 'rep', 'month', ['hours', 'visits'], ['orders', 'units'],
+                             principle='utilitarianism', backend='highs')
+
+    evaluator = BoundedRationalityEvaluator(ethical_principle='utilitarianism', backend='highs')
+    for month in (1, 2):
+        rows = panel.filter(pl.col('month') == month)
+        expected = evaluator.evaluate(rows['rep'].to_list(), rows.select(['hours', 'visits']).to_numpy(),
+                                      rows.select(['orders', 'units']).to_numpy(), output='columns')
+        got = frame.filter(pl.col('period') == month)
+        np.testing.assert_allclose(got['cross_efficiency'].to_numpy(), expected['cross_efficiency'])
+        np.testing.assert_allclose(got['satisfaction'].to_numpy(), expected['satisfaction'])
+        assert got['rank'].to_list() == expected['rank'].tolist()
+        assert got['category'].to_list() == expected['category'].tolist()
+
+    with pytest.raises(ValueError):
+        panel_evaluation(pl.concat([panel, panel.head(1)]), 'rep', 'month', ['hours'], ['orders'])
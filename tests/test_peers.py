@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.choquet import run_choquet_evaluation
+from dea_br.lp import ChoquetLP, SolveStats, solve_lp
+from dea_br.peers import from_dmus, peer_counts, peer_matrix, projections, reference_sets
+from src.solver.choquet_dea import ChoquetDEASolver
+
+
+def test_peer_matrix_layout():
+    peers = peer_matrix([np.array([0.0, 0.5, 1e-12]), None, np.array([0.2, 0.7, 0.0])])
+
+    assert peers.format == 'csr' and peers.shape == (3, 3) and peers.nnz == 3
+    assert reference_sets(peers, ['A', 'B', 'C']) == [['B'], [], ['B', 'A']]
+    assert peer_counts(peers).tolist() == [1, 2, 0]
+    targets_x, targets_y = projections(peers, np.eye(3), np.ones((3, 1)))
+    np.testing.assert_allclose(targets_x[2], [0.2, 0.7, 0.0])
+    np.testing.assert_allclose(targets_y[:, 0], [0.5, 0.0, 0.9])
+
+    with pytest.raises(ValueError):
+        peer_matrix([np.ones(2), None, None])
+
+
+@pytest.mark.parametrize('backend', ['pulp', 'highs'])
+def test_peers_come_with_the_self_evaluation(make_dmus, backend):
+    dmus = make_dmus()
+    stats = SolveStats()
+    run_choquet_evaluation(dmus, backend=backend, stats=stats)
+    peers = from_dmus(dmus)
+
+    assert stats.solved['self'] == len(dmus)
+    # Complementary slackness: a peer's frontier row binds under d's optimal weights
+    model = ChoquetLP.from_dmus(dmus)
+    for d, members in enumerate(reference_sets(peers)):
+        assert members
+        res = solve_lp(model.self_efficiency(d, 0.5))
+        np.testing.assert_allclose((model.frontier @ res.x)[members], 0.0, atol=1e-6)
+        if dmus[d].efficiency_ccr < 1 - 1e-6:
+            assert d not in members
+
+
+def test_dedup_hands_duplicate_peers_to_the_first_copy(make_dmus):
+    X = np.array([[4, 7, 8], [5, 9, 7], [4, 6, 5], [4, 6, 5], [5, 9, 8]], dtype=float)
+    Y = np.array([[6, 4], [7, 7], [5, 7], [5, 7], [6, 2]], dtype=float)
+    dmus = make_dmus(X, Y)
+    run_choquet_evaluation(dmus, backend='highs', dedup=True)
+    peers = from_dmus(dmus).toarray()
+
+    # C and its copy share one set of peers, and only the first copy is referenced
+    np.testing.assert_array_equal(peers[2], peers[3])
+    assert not peers[:, 3].any()
+    assert all(len(members) for members in reference_sets(from_dmus(dmus)))
+
+
+def test_solver_peers_from_frontier_duals(sales_dataset):
+    solver = ChoquetDEASolver(sales_dataset(["Hours", "Visits"], ["Orders"]))
+    solutions = [solver.solve_self_evaluation(d) for d in range(len(solver.dmus))]
+    peers = solver.peer_matrix(solutions)
+
+    assert peers.shape == (5, 5)
+    for d, members in enumerate(reference_sets(peers)):
+        assert members
+        if solutions[d]['efficiency_self'] < 1 - 1e-6:
+            assert d not in members
@@ -0,0 +1,180 @@
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+from time import perf_counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br import cli
+from dea_br.choquet import run_choquet_evaluation
+from dea_br.export import LPBatch
+from dea_br.lp import ChoquetLP, LPCache, SolveStats, WarmStart
+from src.models import Dataset
+from src.solver.choquet_dea import ChoquetDEASolver
+
+# Sizes above 20 take minutes on the pulp backend; run them with DEA_BR_PERF_LARGE=1
+large = pytest.mark.skipif(os.environ.get('DEA_BR_PERF_LARGE') != '1', reason="set DEA_BR_PERF_LARGE=1")
+SIZES = [20, pytest.param(50, marks=large), pytest.param(100, marks=large)]
+
+# Wall-time budgets in seconds, about 10x the times of a plain laptop run: they catch a
+# change in complexity (an extra LP sweep, a per-LP rebuild), not noise
+RUN_BUDGET = {
+    'highs': {20: 30.0, 50: 180.0, 100: 650.0},
+    'pulp': {20: 90.0, 50: 600.0, 100: 2400.0},
+}
+SOLVER_BUDGET = {20: 5.0, 50: 15.0, 100: 40.0}
+BUILD_BUDGET = {20: 1.0, 50: 5.0, 100: 15.0}
+
+
+def synthetic(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(1, 10, (n, 3)), rng.uniform(1, 10, (n, 2))
+
+
+def lp_budget(n):
+    """
+    LPs of one fairness run: Model 11 per DMU, two Model 12 targets per pair and 12
+    bisection steps per DMU, plus one bounding LP per DMU when screening.
+    """
+    return {'screening': n, 'self': n, 'targets': 2 * n * n, 'satisfaction': 12 * n}
+
+
+def synthetic_solver(n, recorder=None):
+    X, Y = synthetic(n)
+    dataset = Dataset()
+    for k in range(X.shape[1]):
+        dataset.define_variable(f"In{k + 1}", f"x{k + 1}", "input")
+    for k in range(Y.shape[1]):
+        dataset.define_variable(f"Out{k + 1}", f"y{k + 1}", "output")
+    dataset.define_variable("Revenue", "Z", "efficacy")
+    dataset.load_from_dataframe(pl.DataFrame({
+        "Salesperson": [f"S{i}" for i in range(n)],
+        **{f"In{k + 1}": X[:, k] for k in range(X.shape[1])},
+        **{f"Out{k + 1}": Y[:, k] for k in range(Y.shape[1])},
+        "Revenue": 1000 * Y[:, 0],
+    }))
+    return ChoquetDEASolver(dataset, recorder=recorder)
+
+
+@pytest.mark.parametrize('backend', ['highs', 'pulp'])
+@pytest.mark.parametrize('n', SIZES)
+def test_pipeline_lp_and_runtime_budget(make_dmus, n, backend):
+    X, Y = synthetic(n)
+    stats = SolveStats()
+    start = perf_counter()
+    run_choquet_evaluation(make_dmus(X, Y), backend=backend, stats=stats)
+    elapsed = perf_counter() - start
+
+    for stage, limit in lp_budget(n).items():
+        assert stats.solved.get(stage, 0) <= limit, stage
+    assert elapsed <= RUN_BUDGET[backend][n]
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_model_build_budget(make_dmus, n):
+    X, Y = synthetic(n)
+    dmus = make_dmus(X, Y)
+    start = perf_counter()
+    model = ChoquetLP.from_dmus(dmus)
+    for i in range(n):
+        model.self_efficiency(i, 0.5)
+    assert perf_counter() - start <= BUILD_BUDGET[n]
+
+    solver = synthetic_solver(n)
+    start = perf_counter()
+    for i in range(n):
+        solver.build_self_evaluation(i)
+    assert perf_counter() - start <= BUILD_BUDGET[n]
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_solver_lp_and_runtime_budget(n):
+    recorder = LPBatch()
+    solver = synthetic_solver(n, recorder)
+    start = perf_counter()
+    scores = solver.compute_cross_efficiency()
+    elapsed = perf_counter() - start
+
+    assert len(recorder) <= n
+    assert scores.height == n
+    assert elapsed <= SOLVER_BUDGET[n]
+
+
+# Equivalence harness: every optimized mode against the plain run of its backend.
+# Twelve DMUs, two of them duplicates so that dedup has something to merge.
+EQ_X, EQ_Y = synthetic(10, seed=7)
+EQ_X, EQ_Y = np.vstack([EQ_X, EQ_X[[2, 5]]]), np.vstack([EQ_Y, EQ_Y[[2, 5]]])
+
+# mode: (options, tolerance on scores, E_max/E_min, satisfaction)
+EXACT = (1e-6, 1e-6, 1e-6)
+MODES = {
+    'warm': ({'backend': 'highs', 'warm': 'sweep'}, EXACT),
+    'screening': ({'backend': 'highs', 'screening': True}, EXACT),
+    'dedup': ({'backend': 'highs', 'dedup': True}, EXACT),
+    'dedup-pulp': ({'dedup': True}, EXACT),
+    'prune_targets': ({'backend': 'highs', 'prune_targets': True}, EXACT),
+    'cache': ({'backend': 'highs', 'cache': LPCache}, EXACT),
+    'all': ({'backend': 'highs', 'screening': True, 'dedup': True, 'prune_targets': True, 'cache': LPCache}, EXACT),
+    # Looser LP tolerances move the bisection by a few grid steps
+    'fast': ({'backend': 'highs', 'precision': 'fast'}, (2e-3, 1e-6, 4e-3)),
+    # CBC and HiGHS reach the same optima, the weights chosen among alternative optima may differ
+    'pulp': ({'backend': 'pulp'}, (1e-2, 1e-6, 1e-2)),
+}
+
+
+def _evaluate(make_dmus, **options):
+    dmus = make_dmus(EQ_X, EQ_Y)
+    scores, E_max, E_min = run_choquet_evaluation(dmus, rho=0.5, **options)
+    return scores, E_max, E_min, np.array([d.satisfaction for d in dmus])
+
+
+_REFERENCES = {}
+
+
+def _reference(make_dmus, backend):
+    # Plain run of each backend, shared by the modes
+    if backend not in _REFERENCES:
+        _REFERENCES[backend] = _evaluate(make_dmus, backend=backend)
+    return _REFERENCES[backend]
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_optimized_modes_match_reference(make_dmus, mode):
+    options, tolerances = MODES[mode]
+    options = dict(options)
+    if options.get('cache') is LPCache:
+        options['cache'] = LPCache()
+    stats = options['stats'] = SolveStats()
+    if options.get('warm') == 'sweep':
+        # Warm starts pay off across a rho sweep: solve at a smaller rho first
+        options['warm'] = WarmStart()
+        run_choquet_evaluation(make_dmus(EQ_X, EQ_Y), rho=0.3, backend='highs', warm=options['warm'])
+    result = _evaluate(make_dmus, **options)
+
+    reference = _reference(make_dmus, 'highs' if mode == 'pulp' else options.get('backend', 'pulp'))
+    for value, expected, tol in zip(result, reference, (tolerances[0], tolerances[1], tolerances[1], tolerances[2])):
+        np.testing.assert_allclose(value, expected, atol=tol)
+    budget = lp_budget(len(EQ_X))
+    assert all(count <= budget[stage] for stage, count in stats.solved.items())
+
+
+def test_parallel_batch_matches_serial(tmp_path):
+    X, Y = synthetic(8, seed=3)
+    spec = {'id': 'rep', 'inputs': ['x1', 'x2', 'x3'], 'outputs': ['y1', 'y2']}
+    paths = []
+    for k in range(2):
+        frame = pl.DataFrame({'rep': [f"R{i}" for i in range(8)], **{f"x{t + 1}": X[:, t] * (k + 1) for t in range(3)},
+                              **{f"y{t + 1}": Y[:, t] for t in range(2)}})
+        paths.append(str(tmp_path / f"part{k}.csv"))
+        frame.write_csv(paths[-1])
+
+    options = {'backend': 'highs'}
+    cli.run(paths, spec, str(tmp_path / 'serial'), fmt='csv', options=options)
+    cli.run(paths, spec, str(tmp_path / 'parallel'), fmt='csv', options=options, workers=2)
+    for k in range(2):
+        serial = pl.read_csv(tmp_path / 'serial' / f"part{k}.csv")
+        parallel = pl.read_csv(tmp_path / 'parallel' / f"part{k}.csv")
+        np.testing.assert_allclose(parallel['cross_efficiency'].to_numpy(), serial['cross_efficiency'].to_numpy())
+        assert parallel['rank'].to_list() == serial['rank'].to_list()
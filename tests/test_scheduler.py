@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.evaluator import BoundedRationalityEvaluator
+from dea_br.lp import SolveStats
+from dea_br.scheduler import COUNTED_STAGES, CostModel, Job, Task, lp_size, plan, run
+
+
+def make_job(name, n, seed=0, m=3, s=2):
+    rng = np.random.default_rng(seed)
+    return Job(name, [f"{name}-{i}" for i in range(n)], rng.uniform(1, 10, (n, m)), rng.uniform(1, 10, (n, s)))
+
+
+def test_plan_splits_large_jobs_longest_first():
+    jobs = [make_job(f"small{k}", 5, k) for k in range(3)] + [make_job('large', 60)]
+    model = CostModel()
+    tasks = plan(jobs, workers=3, model=model)
+
+    costs = [t.predicted for t in tasks]
+    assert costs == sorted(costs, reverse=True)
+    assert [t.job for t in tasks if t.whole] == ['small0', 'small1', 'small2']
+    chunks = sorted((t.start, t.stop) for t in tasks if t.job == 'large')
+    assert len(chunks) > 1 and chunks[0][0] == 0 and chunks[-1][1] == 60
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    split = sum(model.predict(*job.shape) for job in jobs) / 6
+    assert all(t.predicted <= split for t in tasks if not t.whole)
+
+    # One worker has nobody to balance against
+    assert all(t.whole for t in plan(jobs, workers=1))
+    with pytest.raises(ValueError):
+        plan(jobs, workers=0)
+    with pytest.raises(ValueError):
+        plan([make_job('a', 4), make_job('a', 5)])
+    with pytest.raises(ValueError):
+        Job('bad', ['x'], np.ones((2, 3)), np.ones((2, 2)))
+
+
+def test_cost_model_fit_recovers_timings():
+    truth = CostModel(counts={'self': 1.0, 'targets': 2.0, 'satisfaction': 5.0},
+                      per_lp={'self': 1e-3, 'targets': 2e-3, 'satisfaction': 4e-3},
+                      per_size={'self': 1e-5, 'targets': 3e-6, 'satisfaction': 0.0}, overhead=0.05)
+    tasks = []
+    for n, m, rows in [(10, 2, 10), (30, 3, 30), (50, 4, 20), (80, 3, 40)]:
+        stats = SolveStats()
+        for stage, count in truth.lps(n, rows).items():
+            stats.record(stage, n=int(count))
+            stats.seconds[stage] = count * (truth.per_lp[stage] + truth.per_size[stage] * lp_size(n, m, 2))
+        tasks.append(Task('job', 0, rows, n, m, 2, seconds=sum(stats.seconds.values()) + truth.overhead, stats=stats))
+
+    fitted = CostModel.fit(tasks)
+    for stage in COUNTED_STAGES:
+        assert fitted.counts[stage] == pytest.approx(truth.counts[stage])
+    assert fitted.overhead == pytest.approx(truth.overhead)
+    for n, m, rows in [(20, 3, None), (200, 5, 50)]:
+        assert fitted.predict(n, m, 2, rows) == pytest.approx(truth.predict(n, m, 2, rows), rel=1e-6)
+    with pytest.raises(ValueError):
+        CostModel.fit([Task('job', 0, 5, 5, 2, 2)])
+
+
+def test_run_matches_evaluate_per_job():
+    jobs = [make_job('a', 4, 1), make_job('b', 5, 2), make_job('c', 9, 3)]
+    # A split threshold below the largest job forces its per-DMU chunks
+    report = run(jobs, workers=2, options={'backend': 'highs'}, split=CostModel().predict(9, 3, 2) / 2)
+
+    assert sorted({t.job for t in report.tasks if not t.whole}) == ['c']
+    evaluator = BoundedRationalityEvaluator(backend='highs')
+    for job in jobs:
+        expected = evaluator.evaluate(job.dmu_ids, job.inputs, job.outputs, output='columns')
+        result = report.results[job.name]
+        for key in ('cross_efficiency', 'ccr_efficiency', 'satisfaction'):
+            np.testing.assert_allclose(result[key], expected[key], atol=1e-9)
+        assert result['rank'].tolist() == expected['rank'].tolist()
+        assert result['id'].tolist() == job.dmu_ids
+    assert sum(t.stats.solved['targets'] for t in report.tasks if t.job == 'c') == 2 * 9 * 9
+
+    assert report.workers == 2 and report.makespan > 0 and report.predicted_makespan > 0
+    assert 0 < report.utilization <= 1 + 1e-9
+    assert 'makespan' in report.summary()
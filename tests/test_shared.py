@@ -0,0 +1,48 @@
+import multiprocessing
+import numpy as np
+import pytest
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.lp import choquet_features
+from dea_br.shared import SharedDataset
+
+X = np.array([[4, 7, 8], [5, 9, 7], [4, 6, 5], [5, 9, 8]], dtype=float)
+Y = np.array([[6, 4], [7, 7], [5, 7], [6, 2]], dtype=float)
+
+
+def _row_sums(handle, start, stop):
+    data = SharedDataset.attach(handle)
+    try:
+        data['sums'][start:stop] = data['inputs'][start:stop].sum(axis=1) * data.meta['factor']
+    finally:
+        data.close()
+
+
+def test_workers_write_results_in_place():
+    with SharedDataset.create(X, Y, buffers={'sums': (4,)}, meta={'factor': 2.0}, labels=np.arange(4)) as data:
+        np.testing.assert_array_equal(data['input_features'], choquet_features(X))
+        np.testing.assert_array_equal(data['output_features'], choquet_features(Y))
+        assert data['labels'].dtype == np.arange(4).dtype and len(data) == 4
+
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as pool:
+            for f in [pool.submit(_row_sums, data.handle, k, k + 2) for k in (0, 2)]:
+                f.result()
+        np.testing.assert_allclose(data['sums'], 2 * X.sum(axis=1))
+        handle = data.handle
+
+    # The owner frees the block on exit
+    with pytest.raises(FileNotFoundError):
+        SharedDataset.attach(handle)
+
+
+def test_create_rejects_bad_layouts():
+    with pytest.raises(ValueError):
+        SharedDataset.create(X, Y[:3])
+    with pytest.raises(ValueError):
+        SharedDataset.create(X, Y, buffers={'inputs': (4,)})
+    with pytest.raises(ValueError):
+        SharedDataset.create(X, Y, names=np.array(['a', None], dtype=object))
@@ -0,0 +1,41 @@
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.choquet import DMU, run_choquet_evaluation, normalize_data
+from dea_br.storage import ResultStore, pack_upper, unpack_upper
+
+
+def test_pack_roundtrip():
+    dense = np.triu(np.arange(16, dtype=float).reshape(4, 4), 1)
+    packed = pack_upper(dense)
+    assert packed.shape == (6,)
+    np.testing.assert_array_equal(unpack_upper(packed, 4), dense)
+
+
+def test_store_is_compact():
+    n, m, s = 200, 12, 10
+    dense_bytes = n * 8 * (m + s + m * m + s * s)
+    store = ResultStore(n, m, s, dtype=np.float32)
+    assert store.data.flags['C_CONTIGUOUS']
+    assert store.nbytes < dense_bytes / 2
+
+
+def test_store_filled_by_pipeline():
+    dmus = normalize_data([
+        DMU("A", np.array([7, 7, 7], dtype=float), np.array([4, 4], dtype=float)),
+        DMU("B", np.array([5, 9, 7], dtype=float), np.array([7, 7], dtype=float)),
+        DMU("C", np.array([4, 6, 5], dtype=float), np.array([5, 7], dtype=float)),
+    ])
+    store = ResultStore(3, 3, 2)
+    run_choquet_evaluation(dmus, rho=0.5, store=store)
+
+    for i, d in enumerate(dmus):
+        assert store.efficiency[i] == d.efficiency_ccr
+        assert store.satisfaction[i] == d.satisfaction
+        np.testing.assert_array_equal(store.weights_input[i], d.weights_input)
+    w_in, w_out = store.dense_interactions(0)
+    assert w_in.shape == (3, 3) and w_out.shape == (2, 2)
+    assert np.all(np.tril(w_in) == 0)
@@ -0,0 +1,62 @@
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.evaluator import BoundedRationalityEvaluator
+from dea_br.lp import SolveStats
+from dea_br.stream import iter_records, write_records
+
+IDS = [f"D{i}" for i in range(7)]
+X = np.random.default_rng(5).uniform(1, 10, (7, 3))
+Y = np.random.default_rng(6).uniform(1, 10, (7, 2))
+
+
+def test_records_match_evaluate_and_arrive_early():
+    evaluator = BoundedRationalityEvaluator(backend='highs')
+    columns = evaluator.evaluate(IDS, X, Y, output='columns')
+
+    stats = SolveStats()
+    records = evaluator.iter_records(IDS, X, Y, stats=stats)
+    first = next(records)
+    # Only the first DMU's target row is done when its record comes out
+    assert first['id'] == 'D0'
+    assert stats.solved['targets'] <= 2 * len(IDS)
+    records = [first, *records]
+
+    assert [r['id'] for r in records] == IDS
+    np.testing.assert_allclose([r['cross_efficiency'] for r in records], columns['cross_efficiency'], atol=1e-9)
+    np.testing.assert_allclose([r['satisfaction'] for r in records], columns['satisfaction'], atol=1e-9)
+    np.testing.assert_allclose([r['ccr_efficiency'] for r in records], columns['ccr_efficiency'], atol=1e-9)
+    assert len(first['weights_input']) == 3 and len(first['interactions_input']) == 3
+    assert len(first['weights_output']) == 2 and len(first['interactions_output']) == 1
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'ipc'])
+def test_write_records_round_trip(tmp_path, fmt):
+    records = list(iter_records(IDS, X, Y, backend='highs'))
+    path = str(tmp_path / f"scores.{fmt}")
+    assert write_records(iter(records), path, fmt=fmt, batch_size=3) == len(IDS)
+
+    frame = pl.read_parquet(path) if fmt == 'parquet' else pl.read_ipc(path)
+    assert frame['id'].to_list() == IDS
+    np.testing.assert_array_equal(frame['cross_efficiency'].to_numpy(), [r['cross_efficiency'] for r in records])
+    assert frame['weights_input'].to_list() == [r['weights_input'] for r in records]
+
+
+def test_write_records_empty_and_bad_options(tmp_path):
+    path = str(tmp_path / 'empty.parquet')
+    assert write_records([], path) == 0
+    assert pl.read_parquet(path).height == 0
+
+    with pytest.raises(ValueError):
+        write_records([], str(tmp_path / 'x.csv'), fmt='csv')
+    with pytest.raises(ValueError):
+        write_records([], path, batch_size=0)
+    with pytest.raises(ValueError):
+        next(iter_records(IDS[:3], X, Y))
+    with pytest.raises(ValueError):
+        BoundedRationalityEvaluator(backend='glpk').iter_records(IDS, X, Y)
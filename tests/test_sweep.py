@@ -0,0 +1,44 @@
+import numpy as np
+import polars as pl
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.evaluator import BoundedRationalityEvaluator
+from dea_br.lp import SolveStats
+from dea_br.sweep import rho_sweep
+from src.solver.choquet_dea import ChoquetDEASolver
+
+X = np.array([[7, 7, 7], [5, 9, 7], [4, 6, 5], [5, 9, 8], [6, 8, 5]], dtype=float)
+Y = np.array([[4, 4], [7, 7], [5, 7], [6, 2], [3, 6]], dtype=float)
+IDS = ["A", "B", "C", "D", "E"]
+
+
+def test_rho_sweep_matches_cold_runs():
+    stats = SolveStats()
+    frame = rho_sweep(IDS, X, Y, [0.7, 0.2, 0.5], stats=stats)
+
+    assert frame.height == 15
+    assert frame["rho"].unique().sort().to_list() == [0.2, 0.5, 0.7]
+    assert stats.total_avoided > 0
+
+    for rho in (0.2, 0.7):
+        cold = BoundedRationalityEvaluator(rho=rho).evaluate(IDS, X, Y)
+        swept = frame.filter(pl.col("rho") == rho)
+        for row in swept.iter_rows(named=True):
+            assert row["cross_efficiency"] == pytest.approx(cold[row["id"]]["cross_efficiency"], abs=1e-6)
+            assert row["rank"] == cold[row["id"]]["rank"]
+
+
+def test_theta_sweep_stacks_frames(sales_dataset):
+    dataset = sales_dataset(["Hours", "Visits"], ["Orders", "Units"], n=4)
+    solver = ChoquetDEASolver(dataset, theta=3.0)
+
+    frame = solver.sweep_theta([2.0, 3.0])
+
+    assert frame.height == 8
+    assert sorted(frame["theta"].unique().to_list()) == [2.0, 3.0]
+    assert solver.theta == 3.0
+    assert all(0.0 <= score <= 1.0001 for score in frame["Score"].to_list())
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from dea_br.capacity import mobius_from_capacity
+from dea_br.lp import choquet_features
+from dea_br.weight_model import WeightModel
+from src.solver.choquet_dea import ChoquetDEASolver
+
+SALES_X = np.array([[4, 7, 8], [5, 9, 7], [4, 6, 5], [5, 9, 8]], dtype=float)
+SALES_Y = np.array([[6, 4], [7, 7], [5, 7], [6, 2]], dtype=float)
+NEW_X = np.array([[3, 8, 6], [6, 5, 9]], dtype=float)
+NEW_Y = np.array([[7, 5], [4, 6]], dtype=float)
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    return WeightModel.fit(list('ABCD'), SALES_X, SALES_Y, rho=0.5, backend='highs')
+
+
+def test_score_new_matches_direct_ratios(fitted):
+    # Reference: 2-additive features of the scaled data times each rater's Möbius weights
+    def direct(X, Y):
+        w_in = np.array([mobius_from_capacity(c)[[1, 2, 4, 3, 5, 6]] for c in fitted.input_capacity])
+        w_out = np.array([mobius_from_capacity(c)[[1, 2, 3]] for c in fitted.output_capacity])
+        return (choquet_features(Y / fitted.output_scale) @ w_out.T) / (choquet_features(X / fitted.input_scale) @ w_in.T)
+
+    assert fitted.meta['backend'] == 'highs'
+    np.testing.assert_allclose(np.diag(fitted.cross_matrix(SALES_X, SALES_Y)), fitted.efficiency, atol=1e-7)
+    assert np.all(fitted.cross_matrix(SALES_X, SALES_Y) <= 1 + 1e-7)
+
+    np.testing.assert_allclose(fitted.cross_matrix(NEW_X, NEW_Y), direct(NEW_X, NEW_Y), atol=1e-12)
+    np.testing.assert_allclose(fitted.score_new(NEW_X, NEW_Y), direct(NEW_X, NEW_Y).mean(axis=1), atol=1e-12)
+    assert fitted.score_new(NEW_X[0], NEW_Y[0]).shape == (1,)
+
+
+def test_save_load_round_trip(fitted, tmp_path):
+    path = tmp_path / 'model.npz'
+    fitted.save(str(path))
+    loaded = WeightModel.load(str(path))
+
+    assert loaded.ids == fitted.ids and loaded.meta == fitted.meta
+    np.testing.assert_array_equal(loaded.input_capacity, fitted.input_capacity)
+    np.testing.assert_array_equal(loaded.score_new(NEW_X, NEW_Y), fitted.score_new(NEW_X, NEW_Y))
+
+
+def test_from_solver_reproduces_cross_efficiency(sales_dataset):
+    solver = ChoquetDEASolver(sales_dataset(["Hours", "Visits"], ["Orders", "Units"]))
+    solutions = [solver.solve_self_evaluation(d) for d in range(len(solver.dmus))]
+    model = WeightModel.from_solver(solver, solutions)
+
+    np.testing.assert_allclose(model.efficiency, [s['efficiency_self'] for s in solutions])
+    reference = solver.compute_cross_efficiency(solutions)['Score'].to_numpy()
+    np.testing.assert_allclose(model.score_new(model.inputs, model.outputs), reference, atol=5e-3)
+
+
+def test_rejects_bad_data(fitted, tmp_path):
+    with pytest.raises(ValueError):
+        WeightModel.fit(list('ABC'), SALES_X, SALES_Y)
+    with pytest.raises(ValueError):
+        fitted.score_new(NEW_X[:, :2], NEW_Y)
+
+    path = tmp_path / 'model.npz'
+    fitted.save(str(path))
+    data = dict(np.load(str(path)))
+    data['header'] = np.array('{"version": 0, "ids": [], "meta": {}}')
+    np.savez(str(path), **data)
+    with pytest.raises(ValueError):
+        WeightModel.load(str(path))